@@ -0,0 +1,8 @@
+"""
+Benchmarks of the DataHandler and the UI
+refresh path over synthetic ledgers.
+
+@usage
+    python -m benchmarks --sizes 10k 100k --output results.json
+    python -m benchmarks --sizes 10k --baseline results.json
+"""
@@ -0,0 +1,115 @@
+"""
+This module generates deterministic synthetic
+ledgers. Categories and titles are skewed like
+a real ledger, a few of them (food, transport)
+cover most of the expenses.
+"""
+from random import Random
+from datetime import datetime
+from datetime import timedelta
+from typing import Generator
+from bson.json_util import dumps
+from lib.storage import MONEY_UNIT
+
+SIZES = {
+    "10k": 10_000,
+    "100k": 100_000,
+    "1m": 1_000_000,
+    "10m": 10_000_000,
+}
+
+# category → (titles, (min price, max price)), the prices are saved in cents
+CATEGORIES = {
+    "Food": (["Meat", "Vegtables", "Bread", "Milk", "Chicken", "Grilled chicken",
+              "Rice", "Cheese", "Fruits", "Eggs", "Coffee", "Pizza"], (1, 40)),
+    "Transport": (["Bus", "Taxi", "Metro", "Fuel", "Parking", "Train"], (1, 60)),
+    "General": (["Gift", "Haircut", "Stationery", "Cleaning", "Laundry"], (2, 80)),
+    "Cloth": (["Shirt", "Shoes", "Jacket", "Pants", "Socks", "Hat"], (10, 200)),
+    "Bills": (["Electricity", "Water", "Internet", "Phone", "Gas"], (20, 150)),
+    "Health": (["Pharmacy", "Doctor", "Dentist", "Vitamins"], (5, 300)),
+    "Video Game": (["GTA", "FarCry6", "Death Stranding", "Elden Ring", "FIFA"], (20, 70)),
+    "Technology": (["Headphones", "Mouse", "Keyboard", "Monitor", "Laptop"], (20, 1500)),
+    "Accessories": (["Watch", "Belt", "Wallet", "Sunglasses"], (10, 250)),
+    "Jewel": (["Ring", "Necklace", "Bracelet"], (100, 2000)),
+}
+
+
+def parse_size(size: str) -> int:
+    """
+    Convert a size name like 100k or a number
+    to number of rows.
+    """
+    size = size.lower()
+    if size in SIZES:
+        return SIZES[size]
+    return int(size.replace("_", ""))
+
+
+def zipf_weights(count: int, exponent: float = 1.1) -> list:
+    """
+    Returns the weights of the ranks based on
+    the zipf distribution.
+    """
+    return [1 / rank ** exponent for rank in range(1, count + 1)]
+
+
+def generate_expenses(count: int,
+                      seed: int = 0,
+                      end_date: datetime = datetime(2024, 2, 18),
+                      days: int = 3650) -> Generator:
+    """
+    Generate expenses sorted by date from the
+    newest one like the data file.
+    ----------------------------------------
+    -> Params
+        count: int
+        seed: int
+        end_date: datetime
+        days: int → timeframe of the ledger
+    <- Return
+        Generator of expenses
+    """
+    random = Random(seed)
+    categories = list(CATEGORIES)
+    category_weights = zipf_weights(len(categories))
+    title_weights = {category: zipf_weights(len(titles))
+                     for category, (titles, _) in CATEGORIES.items()}
+    days = min(days, count) or 1
+    rows_per_day = count / days
+    generated = 0
+    for day in range(days):
+        date = end_date - timedelta(days=day)
+        day_count = round(rows_per_day * (day + 1)) - generated
+        if day == days - 1:
+            day_count = count - generated
+        day_categories = random.choices(categories, category_weights, k=day_count)
+        for category in day_categories:
+            titles, (min_price, max_price) = CATEGORIES[category]
+            title = random.choices(titles, title_weights[category])[0]
+            price = round(random.uniform(min_price, max_price) * 100)
+            quantity = random.choices((1, 2, 3, 4), (70, 20, 7, 3))[0]
+            yield {
+                "title": title,
+                "price": price,
+                "quantity": quantity,
+                "overall_price": price * quantity,
+                "category": category,
+                "date": date,
+            }
+        generated += day_count
+
+
+def write_ledger(path: str, count: int, seed: int = 0) -> None:
+    """
+    Write a synthetic ledger into a json file
+    with the format of the data file. It is
+    written expense by expense with constant
+    memory.
+    """
+    with open(path, "w") as file:
+        file.write(f'{{"money": "{MONEY_UNIT}", "expenses": [\n')
+        for index, expense in enumerate(generate_expenses(count, seed)):
+            if index:
+                file.write(",\n")
+            file.write(dumps(expense))
+        file.write("\n]}")
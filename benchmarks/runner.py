@@ -0,0 +1,160 @@
+"""
+This module runs the scenarios over the
+synthetic ledgers, saves the results as json
+and compares them with a baseline results
+file to find the regressions.
+"""
+import os
+import sys
+import json
+import platform
+from time import perf_counter
+from datetime import datetime
+from statistics import median
+from argparse import ArgumentParser
+from tempfile import TemporaryDirectory
+from .generator import parse_size
+from .generator import write_ledger
+from .scenarios import SCENARIOS
+from .scenarios import Context
+
+DEFAULT_SIZES = ["10k", "100k"]
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(__file__), "data")
+
+
+def get_ledger(cache_dir: str, size: str, seed: int) -> str:
+    """
+    Returns the path of the ledger and create
+    it if doesn't exist in the cache directory.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, f"ledger_{size}_{seed}.json")
+    if not os.path.exists(path):
+        print(f"generating {size} ledger → {path}", file=sys.stderr)
+        write_ledger(path, parse_size(size), seed)
+    return path
+
+
+def time_scenario(function: object,
+                  context: Context,
+                  repeat: int) -> dict:
+    """
+    Run the scenario repeat times and returns
+    the timings in seconds.
+    """
+    timings = list()
+    context.metrics = dict()
+    for _ in range(repeat):
+        run = function(context)
+        start = perf_counter()
+        run()
+        timings.append(perf_counter() - start)
+    return {"median": median(timings),
+            "min": min(timings),
+            "runs": timings,
+            **context.metrics}
+
+
+def run_benchmarks(sizes: list,
+                   scenarios: list,
+                   repeat: int,
+                   seed: int,
+                   cache_dir: str) -> dict:
+    """
+    Run the scenarios for each ledger size.
+    <- Return
+        dict → {size: {scenario: timings}}
+    """
+    results = dict()
+    for size in sizes:
+        rows_count = parse_size(size)
+        data_path = get_ledger(cache_dir, size, seed)
+        results[size] = dict()
+        with TemporaryDirectory() as work_dir:
+            context = Context(data_path, rows_count, work_dir)
+            try:
+                for name in scenarios:
+                    function, max_rows = SCENARIOS[name]
+                    if max_rows and rows_count > max_rows:
+                        continue
+                    try:
+                        result = time_scenario(function, context, repeat)
+                    except ImportError as error:
+                        print(f"{size} {name}: skipped → {error}", file=sys.stderr)
+                        continue
+                    results[size][name] = result
+                    metrics = "".join(f"  {key}={value}" for key, value in result.items()
+                                      if key not in ("median", "min", "runs"))
+                    print(f"{size:>6} {name:<26} {result['median'] * 1000:>12.3f} ms{metrics}",
+                          file=sys.stderr)
+            finally:
+                context.close()
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """
+    Compare the median of the scenarios with
+    the baseline and returns the regressions.
+    ----------------------------------------
+    -> Params
+        results: dict
+        baseline: dict
+        threshold: float → 0.2 means 20% slower
+    <- Return
+        list of (size, scenario, ratio)
+    """
+    regressions = list()
+    for size, scenarios in results.items():
+        for name, result in scenarios.items():
+            base = baseline.get(size, {}).get(name)
+            if not base or not base["median"]:
+                continue
+            ratio = result["median"] / base["median"]
+            marker = ""
+            if ratio > 1 + threshold:
+                regressions.append((size, name, ratio))
+                marker = "  REGRESSION"
+            print(f"{size:>6} {name:<26} {ratio:>8.2f}x{marker}")
+    return regressions
+
+
+def main(argv: list = None) -> int:
+    """
+    Parse the arguments, run the benchmarks and
+    compare them with the baseline.
+    """
+    parser = ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("--sizes", nargs="+", default=DEFAULT_SIZES,
+                        help="ledger sizes: 10k 100k 1m 10m or number of rows")
+    parser.add_argument("--scenarios", nargs="+", default=list(SCENARIOS),
+                        choices=list(SCENARIOS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                        help="directory of the generated ledgers")
+    parser.add_argument("--output", help="save the results as json")
+    parser.add_argument("--baseline", help="results json to compare with")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="allowed slowdown compared to the baseline")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.sizes,
+                             args.scenarios,
+                             args.repeat,
+                             args.seed,
+                             args.cache_dir)
+    if args.output:
+        report = {"created": datetime.now().isoformat(),
+                  "python": platform.python_version(),
+                  "platform": platform.platform(),
+                  "seed": args.seed,
+                  "results": results}
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=4)
+    if not args.baseline:
+        return 0
+    with open(args.baseline) as file:
+        baseline = json.load(file)["results"]
+    regressions = compare(results, baseline, args.threshold)
+    return 1 if regressions else 0
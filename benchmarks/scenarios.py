@@ -0,0 +1,379 @@
+"""
+This module contains the timed scenarios.
+Each scenario gets the benchmark context,
+does its setup and returns the function that
+is timed by the runner. Scenarios can return
+extra metrics by updating context.metrics.
+"""
+import os
+import shutil
+from sys import getsizeof
+from datetime import datetime
+from datetime import timedelta
+from typing import Callable
+from lib.data_handler import DataHandler
+from lib.storage import PartitionedStore
+from lib.money import format_money
+from lib.interface.utils import write_csv
+from lib.interface.utils import write_json
+from lib.interface.utils import load_json
+from lib.compression import get_available_codecs
+from lib.compression import get_extension
+from lib.tools.xlsx_handler import XlsxWriter
+from lib.tools.excel_handler import ExcelHandler
+from lib.tools.fake_excel import FakeExcelApplication
+
+SCENARIOS = dict()
+
+
+class Context:
+    """
+    Shared state of the scenarios of a ledger.
+    """
+
+    def __init__(self, data_path: str, rows_count: int, work_dir: str) -> None:
+        self.data_path = data_path
+        self.rows_count = rows_count
+        self.work_dir = work_dir
+        self.metrics = dict()
+        self.parallel_handlers = dict()
+        self._data_handler = None
+
+    @property
+    def data_handler(self) -> DataHandler:
+        """
+        Loaded data handler which is shared by
+        the read only scenarios.
+        """
+        if self._data_handler is None:
+            self._data_handler = DataHandler(self.data_path, None)
+        return self._data_handler
+
+    def close(self) -> None:
+        """
+        Stop the processes of the parallel scans.
+        """
+        for data_handler in self.parallel_handlers.values():
+            data_handler.close()
+        self.parallel_handlers = dict()
+        if self._data_handler is not None:
+            self._data_handler.close()
+
+    def get_partitions_path(self) -> str:
+        """
+        Returns the monthly partitions directory of
+        the ledger, it's created on the first use.
+        """
+        path = self.get_path("partitions")
+        if not os.path.exists(os.path.join(path, "manifest.json")):
+            PartitionedStore(path).create(self.data_handler.expenses)
+        return path
+
+    def get_writable_handler(self, name: str) -> DataHandler:
+        """
+        Returns a data handler of a copy of the
+        ledger, so the writes of a scenario don't
+        change the ledger of the others and its
+        store is loaded(sync doesn't reload).
+        """
+        path = self.get_path(f"{name}.json")
+        shutil.copyfile(self.data_path, path)
+        # journal of the previous run
+        if os.path.exists(f"{path}.journal"):
+            os.remove(f"{path}.journal")
+        return DataHandler(path, None)
+
+    def get_path(self, name: str) -> str:
+        """
+        Returns a path in the work directory.
+        """
+        return os.path.join(self.work_dir, name)
+
+    def get_filters(self, **filters) -> dict:
+        """
+        Returns the filters of the last year of
+        the ledger. filter_data pops the dates,
+        so each call needs new filters.
+        """
+        to_date = self.data_handler.expenses[0]["date"]
+        return {"from_date": to_date - timedelta(days=365),
+                "to_date": to_date,
+                **filters}
+
+
+def scenario(name: str, max_rows: int = None) -> Callable:
+    """
+    Register a scenario. Ledgers bigger than
+    max_rows skip the scenario.
+    """
+    def decorator(function: Callable) -> Callable:
+        SCENARIOS[name] = (function, max_rows)
+        return function
+    return decorator
+
+
+@scenario("load")
+def load(context: Context) -> Callable:
+    return lambda: DataHandler(context.data_path, None)
+
+
+@scenario("load_partitioned_latest")
+def load_partitioned_latest(context: Context) -> Callable:
+    """
+    Load the latest 1000 expenses(whole months)
+    of the partitions.
+    """
+    path = context.get_partitions_path()
+    return lambda: DataHandler(path, 1000)
+
+
+@scenario("load_interned")
+def load_interned(context: Context) -> Callable:
+    """
+    Load the ledger and report the memory of the
+    title and category strings with and without
+    the symbol tables.
+    """
+    def function():
+        data_handler = DataHandler(context.data_path, None)
+        saved = sum(symbols.saved_bytes for symbols in data_handler.symbols.values())
+        interned = sum(getsizeof(value) for symbols in data_handler.symbols.values()
+                       for value in symbols.values)
+        context.metrics.update(strings_mb=round((saved + interned) / 2 ** 20, 2),
+                               interned_strings_mb=round(interned / 2 ** 20, 3),
+                               symbols={key: len(symbols) for key, symbols
+                                        in data_handler.symbols.items()})
+    return function
+
+
+def filter_scenario(name: str, **filters) -> None:
+    """
+    Register a filter_data scenario with the
+    given title and category filters.
+    """
+    def run(context: Context) -> Callable:
+        data_handler = context.data_handler
+        def function():
+            data_handler.filter_data(filters=context.get_filters(**filters))
+        return function
+    scenario(name)(run)
+
+
+filter_scenario("filter_dates")
+filter_scenario("filter_title", title="chi")
+filter_scenario("filter_category", category="foo")
+filter_scenario("filter_title_category", title="m", category="foo")
+filter_scenario("filter_title_substring", title="chicken")
+filter_scenario("filter_title_fuzzy", title="chiken")
+
+
+@scenario("search_keystrokes")
+def search_keystrokes(context: Context) -> Callable:
+    data_handler = context.data_handler
+    query = "grilled chicken"
+    def function():
+        for index in range(1, len(query) + 1):
+            data_handler.search_titles(query[:index])
+    return function
+
+
+@scenario("total_price")
+def total_price(context: Context) -> Callable:
+    data_handler = context.data_handler
+    expenses = data_handler.get_all()
+    return lambda: data_handler.get_total_price(expenses)
+
+
+@scenario("range_summary_partitioned")
+def range_summary_partitioned(context: Context) -> Callable:
+    """
+    Total of the last year without loading the
+    expenses, the whole months are summed from
+    the manifest.
+    """
+    path = context.get_partitions_path()
+
+    def function():
+        data_handler = DataHandler(path, 0)
+        data_handler.get_range_summary(context.get_filters())
+    return function
+
+
+@scenario("range_summary")
+def range_summary(context: Context) -> Callable:
+    data_handler = context.data_handler
+    data_handler.get_daily_totals()
+    return lambda: data_handler.get_range_summary(context.get_filters(category="foo"))
+
+
+@scenario("group_by_date")
+def group_by_date(context: Context) -> Callable:
+    data_handler = context.data_handler
+    expenses = data_handler.get_all()
+    return lambda: data_handler.group_expenses_by_date(expenses)
+
+
+@scenario("spend_report")
+def spend_report(context: Context) -> Callable:
+    data_handler = context.data_handler
+    filters = context.get_filters()
+    data_handler.get_analytics()
+    return lambda: data_handler.get_spend_report(filters["from_date"],
+                                                 filters["to_date"])
+
+
+@scenario("budget_status")
+def budget_status(context: Context) -> Callable:
+    data_handler = context.data_handler
+    data_handler.set_budgets([{"period": "monthly", "limit": 2000},
+                              {"period": "weekly", "category": "Food", "limit": 150}])
+    day = data_handler.expenses[0]["date"]
+    return lambda: data_handler.get_budget_statuses(day)
+
+
+@scenario("add_expense")
+def add_expense(context: Context) -> Callable:
+    data_handler = context.get_writable_handler("add_expense")
+    expense = {"title": "Bread",
+               "price": 250,
+               "quantity": 2,
+               "overall_price": 500,
+               "category": "Food",
+               "date": datetime(2024, 2, 18)}
+    return lambda: data_handler.add_expense(dict(expense))
+
+
+@scenario("edit_expense")
+def edit_expense(context: Context) -> Callable:
+    data_handler = context.get_writable_handler("edit_expense")
+    expense = data_handler.expenses[len(data_handler.expenses) // 2]
+    prices = [expense["price"], expense["price"] + 100]
+
+    def run() -> None:
+        prices.reverse()
+        data_handler.update_expense(
+            expense, data_handler.convert_cell(expense, "price", format_money(prices[0])))
+    return run
+
+
+@scenario("undo_redo")
+def undo_redo(context: Context) -> Callable:
+    data_handler = context.get_writable_handler("undo_redo")
+    expense = data_handler.expenses[len(data_handler.expenses) // 2]
+    data_handler.delete_expense(expense)
+
+    def run() -> None:
+        data_handler.undo()
+        data_handler.redo()
+    return run
+
+
+def add_codec_scenarios(codec: str) -> None:
+    """
+    Register the write and load scenarios of the
+    json file with the compression codec, they
+    report the size of the file.
+    """
+    name = codec or "none"
+
+    def get_path(context: Context) -> str:
+        return context.get_path(f"codec.json{get_extension(codec)}")
+
+    def report_size(context: Context, path: str) -> None:
+        size = os.path.getsize(path)
+        context.metrics["size_mb"] = round(size / 2 ** 20, 2)
+        context.metrics["ratio"] = round(size / os.path.getsize(context.data_path), 3)
+
+    @scenario(f"write_json_{name}")
+    def write(context: Context) -> Callable:
+        expenses = context.data_handler.expenses
+        path = get_path(context)
+
+        def function():
+            write_json(path, expenses, codec)
+            report_size(context, path)
+        return function
+
+    @scenario(f"load_json_{name}")
+    def load(context: Context) -> Callable:
+        path = get_path(context)
+        write_json(path, context.data_handler.expenses, codec)
+        report_size(context, path)
+        return lambda: load_json(path)
+
+
+for codec in (None, *get_available_codecs()):
+    add_codec_scenarios(codec)
+
+
+@scenario("export_csv")
+def export_csv(context: Context) -> Callable:
+    data_handler = context.data_handler
+    path = context.get_path("export.csv")
+    return lambda: write_csv(path=path, data=list(data_handler.get_all_as_table()))
+
+
+@scenario("export_xlsx")
+def export_xlsx(context: Context) -> Callable:
+    data_handler = context.data_handler
+    path = context.get_path("export.xlsx")
+    def function():
+        with XlsxWriter() as handler:
+            handler.create_new()
+            handler.add_data(data_handler.get_all_as_table(format_date=False))
+            handler.save_as(path)
+    return function
+
+
+@scenario("export_excel_com", max_rows=1_000_000)
+def export_excel_com(context: Context) -> Callable:
+    data_handler = context.data_handler
+    def function():
+        app = FakeExcelApplication()
+        with ExcelHandler(dispatch=app.dispatch) as handler:
+            handler.create_new()
+            handler.add_data(data_handler.get_all_as_table(format_date=False))
+        context.metrics["round_trips"] = app.round_trips
+    return function
+
+
+@scenario("ui_refresh", max_rows=100_000)
+def ui_refresh(context: Context) -> Callable:
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from lib.interface.widgets import QApplication
+    from lib.interface.illustration_frame import IllustrationFrame
+    app = QApplication.instance() or QApplication([])
+    frame = getattr(context, "illustration_frame", None)
+    if frame is None:
+        configs = {"default_from_date": context.get_filters()["from_date"]}
+        frame = IllustrationFrame(context.data_handler, configs)
+        context.illustration_frame = frame
+    def function():
+        frame.illustration_filters_callback()
+        app.processEvents()
+    return function
+
+
+def parallel_filter_scenario(workers: int) -> None:
+    """
+    Register a parallel filter_data scenario
+    with the given number of processes, the
+    threshold is removed so the scaling shows
+    on the small ledgers too.
+    """
+    def run(context: Context) -> Callable:
+        data_handler = context.parallel_handlers.get(workers)
+        if data_handler is None:
+            data_handler = DataHandler(context.data_path, None, workers)
+            data_handler.parallel_threshold = 0
+            # first scan builds the shared columns and starts the pool
+            data_handler.filter_data(filters=context.get_filters(title="chi"))
+            context.parallel_handlers[workers] = data_handler
+        def function():
+            data_handler.filter_data(filters=context.get_filters(title="chi"))
+        return function
+    scenario(f"parallel_filter_{workers}")(run)
+
+
+for workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+    parallel_filter_scenario(workers)
@@ -6,6 +6,7 @@ DEVELOPER: SINA KARIMI ALIABAD
 Main module of the program that shows
 the GUI.
 """
+from datetime import datetime
 from lib import QApplication
 from lib import QMainWindow
 from lib import DataHandler
@@ -15,6 +16,11 @@ from lib import CSS_FILE_PATH
 from lib import CSS_COLORS_FILE_PATH
 from lib import DOLLAR_ICON_PATH
 from lib import QIcon
+from lib import QShortcut
+from lib import QKeySequence
+from lib import CWD
+from lib.tracing import tracer
+from lib.interface.utils import log
 
 class MainWindow(QMainWindow):
     """
@@ -28,6 +34,7 @@ class MainWindow(QMainWindow):
         super().__init__()
         self.setup_window()
         self.init_ui()
+        self.setup_shortcuts()
     
     def init_ui(self) -> None:
         """
@@ -48,6 +55,43 @@ class MainWindow(QMainWindow):
         self.setMinimumHeight(700)
         self.setStyleSheet(self.theme)
 
+    def setup_shortcuts(self) -> None:
+        """
+        Setup the keyboard shortcuts of the window.
+        """
+        self.trace_shortcut = QShortcut(QKeySequence("Ctrl+Shift+T"), self)
+        self.trace_shortcut.activated.connect(self.trace_callback)
+        self.undo_shortcut = QShortcut(QKeySequence("Ctrl+Z"), self)
+        self.undo_shortcut.activated.connect(self.main_frame.undo_callback)
+        self.redo_shortcuts = list()
+        for sequence in ("Ctrl+Y", "Ctrl+Shift+Z"):
+            shortcut = QShortcut(QKeySequence(sequence), self)
+            shortcut.activated.connect(self.main_frame.redo_callback)
+            self.redo_shortcuts.append(shortcut)
+
+    def trace_callback(self) -> None:
+        """
+        Start tracing if it's disabled, otherwise
+        save the recorded spans as chrome trace json
+        in the current directory.
+        """
+        if not tracer.enabled:
+            tracer.enable()
+            log("Tracing started.", color="cyan")
+            return
+        path = f"{CWD}/trace_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        tracer.dump(path)
+        tracer.clear()
+        log(f"Trace saved → {path}", color="cyan")
+
+    def closeEvent(self, event: object) -> None:
+        """
+        Release the resources of the data handler
+        before closing the window.
+        """
+        self.main_frame.data_handler.close()
+        super().closeEvent(event)
+
 def run_app() -> None:
     """
     Create an qt application and instance
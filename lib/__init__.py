@@ -1,6 +1,25 @@
+from .constants import *
 
-from .interface.main_frame import MainFrame
-from .interface.utils import load_css
-from .interface.widgets import *
-from .data_handler import DataHandler
-from .constants import *
\ No newline at end of file
+
+def __getattr__(name: str) -> object:
+    """
+    The data handler and the qt widgets are
+    imported on the first access, so importing
+    lib(e.g. by the cli) doesn't load PyQt5.
+    """
+    if name.startswith("__"):
+        raise AttributeError(f"module 'lib' has no attribute '{name}'")
+    if name == "DataHandler":
+        from .data_handler import DataHandler
+        return DataHandler
+    if name == "MainFrame":
+        from .interface.main_frame import MainFrame
+        return MainFrame
+    if name == "load_css":
+        from .interface.utils import load_css
+        return load_css
+    from .interface import widgets
+    try:
+        return getattr(widgets, name)
+    except AttributeError:
+        raise AttributeError(f"module 'lib' has no attribute '{name}'") from None
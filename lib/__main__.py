@@ -0,0 +1,8 @@
+"""
+Run the command line interface:
+    python -m lib --help
+"""
+import sys
+from .cli import main
+
+sys.exit(main())
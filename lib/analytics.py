@@ -0,0 +1,258 @@
+"""
+This module contains the time series analytics
+of the expenses. The dates, overall prices and
+categories are kept as numpy columns, a date
+range is answered by one bincount over the day
+ordinals(per category and day), then the rolling
+sums, moving averages and monthly deltas are
+computed from that dense matrix. The prices are int
+cents, so the sums are exact.
+
+@usage
+    analytics = SpendAnalytics(expenses)
+    report = analytics.report(from_date, to_date)
+    report["rolling"][7][-1] → spend of the last 7 days
+"""
+from datetime import date
+from datetime import datetime
+from typing import Iterable
+import numpy as np
+from .symbols import SymbolTable
+
+__all__ = ["SpendAnalytics", "rolling_sum"]
+
+WINDOWS = (7, 30)
+INITIAL_CAPACITY = 1024
+# numpy day of the ordinal 1(0001-01-01)
+FIRST_DAY = np.datetime64("0001-01-01", "D")
+
+
+def rolling_sum(daily: np.ndarray, window: int) -> np.ndarray:
+    """
+    Sum of the last window days for each day,
+    the last axis is the days.
+    """
+    cumulative = np.cumsum(daily, axis=-1)
+    result = cumulative.copy()
+    result[..., window:] -= cumulative[..., :-window]
+    return result
+
+
+def to_days(ordinals: np.ndarray) -> np.ndarray:
+    """
+    Convert the day ordinals to datetime64[D].
+    """
+    return FIRST_DAY + (ordinals - 1).astype("timedelta64[D]")
+
+
+def get_previous_month(ordinal: int) -> int:
+    """
+    Returns the ordinal of the first day of the
+    month before the month of the given day.
+    """
+    month = to_days(np.int64(ordinal)).astype("datetime64[M]") - 1
+    return int((month.astype("datetime64[D]") - FIRST_DAY).astype(np.int64)) + 1
+
+
+class SpendAnalytics:
+    """
+    Columns of the expenses which grow by the
+    added expenses without copying the others
+    (the capacity is doubled when it's full).
+    The order of the rows doesn't change the
+    sums, so a removed row is replaced by the
+    last one.
+    --------------------------------------------
+    @methods
+        extend
+        add
+        remove
+        get_daily
+        report
+    """
+
+    def __init__(self,
+                 expenses: Iterable = (),
+                 categories: SymbolTable = None) -> None:
+        """
+        ---------------------------------
+        -> Params
+            expenses: Iterable of dicts
+            categories: SymbolTable
+                codes of the categories, it can be
+                shared with the data handler
+        """
+        self.size = 0
+        self.ordinals = np.empty(INITIAL_CAPACITY, dtype=np.int32)
+        self.prices = np.empty(INITIAL_CAPACITY, dtype=np.int64)
+        self.codes = np.empty(INITIAL_CAPACITY, dtype=np.int32)
+        if categories is None:
+            categories = SymbolTable()
+        self.categories = categories
+        self.extend(expenses)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _reserve(self, count: int) -> None:
+        """
+        Grow the columns to have space for count
+        new rows.
+        """
+        required = self.size + count
+        capacity = len(self.ordinals)
+        if required <= capacity:
+            return
+        while capacity < required:
+            capacity *= 2
+        for name in ("ordinals", "prices", "codes"):
+            column = getattr(self, name)
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[:self.size] = column[:self.size]
+            setattr(self, name, grown)
+
+    def extend(self, expenses: Iterable) -> None:
+        """
+        Add the expenses to the columns.
+        """
+        expenses = list(expenses)
+        count = len(expenses)
+        if not count:
+            return
+        self._reserve(count)
+        end = self.size + count
+        self.ordinals[self.size:end] = np.fromiter(
+            (expense["date"].toordinal() for expense in expenses),
+            dtype=np.int32, count=count)
+        self.prices[self.size:end] = np.fromiter(
+            (expense["overall_price"] for expense in expenses),
+            dtype=np.int64, count=count)
+        self.codes[self.size:end] = np.fromiter(
+            (self.categories.code(expense["category"]) for expense in expenses),
+            dtype=np.int32, count=count)
+        self.size = end
+
+    def add(self, expense: dict) -> None:
+        """
+        Add an expense to the columns.
+        """
+        self.extend((expense,))
+
+    def remove(self, expense: dict) -> None:
+        """
+        Remove a row of the expense, the last row
+        is moved to its place.
+        """
+        if expense["category"] not in self.categories:
+            return
+        size = self.size
+        code = self.categories.code(expense["category"])
+        rows = np.flatnonzero(
+            (self.ordinals[:size] == expense["date"].toordinal())
+            & (self.prices[:size] == expense["overall_price"])
+            & (self.codes[:size] == code))
+        if not len(rows):
+            return
+        row = rows[0]
+        last = size - 1
+        self.ordinals[row] = self.ordinals[last]
+        self.prices[row] = self.prices[last]
+        self.codes[row] = self.codes[last]
+        self.size = last
+
+    def _clip_range(self, from_date: datetime, to_date: datetime) -> tuple:
+        """
+        Convert the dates to ordinals and clip them
+        to the dates of the expenses, so the open
+        ranges(datetime.min, datetime.max) don't
+        create huge arrays.
+        """
+        ordinals = self.ordinals[:self.size]
+        first = int(ordinals.min())
+        last = max(int(ordinals.max()), date.today().toordinal())
+        return (max(from_date.toordinal(), first),
+                min(to_date.toordinal(), last))
+
+    def get_daily(self, start: int, end: int) -> np.ndarray:
+        """
+        Spend of each category in each day of the
+        range in one bincount.
+        ---------------------------------------
+        -> Params
+            start: int → day ordinal
+            end: int → day ordinal
+        <- Return
+            np.ndarray → shape(categories, days) of cents
+        """
+        days = end - start + 1
+        ordinals = self.ordinals[:self.size]
+        mask = (ordinals >= start) & (ordinals <= end)
+        index = self.codes[:self.size][mask].astype(np.int64) * days
+        index += ordinals[mask] - start
+        daily = np.bincount(index,
+                            weights=self.prices[:self.size][mask],
+                            minlength=len(self.categories) * days)
+        # the weights are summed as float64, the sums of the
+        # cents are exact integers below 2 ** 53
+        return daily.astype(np.int64).reshape(len(self.categories), days)
+
+    def report(self,
+               from_date: datetime,
+               to_date: datetime,
+               windows: tuple = WINDOWS) -> dict:
+        """
+        Compute the time series of the date range.
+        The rolling sums of the first days of the
+        range include the days before it and the
+        months are whole calendar months, the first
+        one is compared with its previous month.
+        ---------------------------------------
+        -> Params
+            from_date: datetime
+            to_date: datetime
+            windows: tuple → days of the rolling sums
+        <- Return
+            dict
+                days: datetime64[D] array
+                daily: total spend per day
+                rolling: {window: sum of the last window days}
+                moving_average: {window: average spend per day}
+                categories: list of str
+                months: datetime64[M] array
+                monthly: spend per category and month
+                monthly_delta: change from the previous month
+                monthly_change: relative change(nan for no previous spend)
+        """
+        if not self.size:
+            return None
+        start, end = self._clip_range(from_date, to_date)
+        if start > end:
+            return None
+        previous_month = get_previous_month(start)
+        origin = min(start - max(windows) + 1, previous_month)
+        matrix = self.get_daily(origin, end)
+        daily = matrix.sum(axis=0)
+        offset = start - origin
+        rolling = {window: rolling_sum(daily, window)[offset:]
+                   for window in windows}
+        offset = previous_month - origin
+        months, boundaries = np.unique(
+            to_days(np.arange(previous_month, end + 1)).astype("datetime64[M]"),
+            return_index=True)
+        monthly = np.add.reduceat(matrix[:, offset:], boundaries, axis=1)
+        monthly_delta = np.diff(monthly, axis=1)
+        previous = monthly[:, :-1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            monthly_change = np.where(previous > 0,
+                                      monthly_delta / previous,
+                                      np.nan)
+        return {"days": to_days(np.arange(start, end + 1)),
+                "daily": daily[start - origin:],
+                "rolling": rolling,
+                "moving_average": {window: values / window
+                                   for window, values in rolling.items()},
+                "categories": list(self.categories.values),
+                "months": months[1:],
+                "monthly": monthly[:, 1:],
+                "monthly_delta": monthly_delta,
+                "monthly_change": monthly_change}
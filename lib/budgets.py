@@ -0,0 +1,235 @@
+"""
+This module contains the budgets of the expenses.
+The spend of each week and month is kept in running
+counters(overall and per category), adding an expense
+updates four counters, so the status of a budget in
+any period is a dictionary lookup.
+
+@usage
+    budgets in the config file:
+    "budgets": [
+        {"period": "monthly", "limit": 2000},
+        {"period": "weekly", "category": "Food", "limit": 150,
+         "alert_at": [0.8, 1.0]}
+    ]
+    the limits are amounts, the tracker keeps them and
+    the spends in cents like the prices.
+"""
+from datetime import datetime
+from datetime import timedelta
+from collections import defaultdict
+from typing import Iterable
+from .errors import InvalidBudgetError
+from .money import to_cents
+
+__all__ = ["BudgetTracker", "PERIODS", "BUDGET_MONEY_KEYS", "get_periods_range"]
+
+PERIODS = ("weekly", "monthly")
+# parts of the limit which show an alert when the
+# spend of the period passes them
+DEFAULT_ALERT_AT = (0.8, 1.0)
+# money values of the statuses
+BUDGET_MONEY_KEYS = ("limit", "spent", "remaining")
+
+
+def get_period_index(period: str, day: datetime) -> int:
+    """
+    Returns the number of the week or month of
+    the day. Weeks start on monday(ordinal 1 is
+    a monday).
+    """
+    if period == "weekly":
+        return (day.toordinal() - 1) // 7
+    return day.year * 12 + day.month - 1
+
+
+def get_period_range(period: str, index: int) -> tuple:
+    """
+    Returns the first and last day of the week
+    or month.
+    """
+    if period == "weekly":
+        start = datetime.fromordinal(index * 7 + 1)
+        return start, start + timedelta(days=6)
+    year, month = divmod(index, 12)
+    start = datetime(year, month + 1, 1)
+    year, month = divmod(index + 1, 12)
+    return start, datetime(year, month + 1, 1) - timedelta(days=1)
+
+
+def get_periods_range(day: datetime) -> tuple:
+    """
+    Returns the first and last day of the week and
+    month of the day together, the expenses which
+    the budgets of the day count.
+    """
+    ranges = [get_period_range(period, get_period_index(period, day))
+              for period in PERIODS]
+    return min(start for start, _ in ranges), max(end for _, end in ranges)
+
+
+def validate_budget(budget: dict) -> dict:
+    """
+    Checks the budget of the config and fill
+    its optional values.
+    @raises
+        InvalidBudgetError
+    """
+    if budget.get("period") not in PERIODS:
+        raise InvalidBudgetError(
+            f"Budget period must be one of {', '.join(PERIODS)} → {budget}")
+    try:
+        limit = to_cents(budget["limit"])
+        alert_at = sorted(float(value)
+                          for value in budget.get("alert_at", DEFAULT_ALERT_AT))
+    except (KeyError, TypeError, ValueError) as error:
+        raise InvalidBudgetError(f"Invalid budget limit → {budget}") from error
+    if limit <= 0:
+        raise InvalidBudgetError(f"Budget limit must be positive → {budget}")
+    return {"period": budget["period"],
+            "category": budget.get("category") or None,
+            "limit": limit,
+            "alert_at": alert_at}
+
+
+class BudgetTracker:
+    """
+    Running counters of the spend per period
+    and the budgets which are checked by them.
+    The counters only have the given expenses, the
+    caller has to give all the expenses of a week
+    or month before reading its spend.
+    --------------------------------------------
+    @methods
+        set_budgets
+        build
+        add
+        remove
+        get_spent
+        get_status
+        get_statuses
+    """
+
+    def __init__(self, budgets: Iterable = ()) -> None:
+        """
+        ---------------------------------
+        -> Params
+            budgets: Iterable of dicts
+                budgets of the config file
+        """
+        # period → {(period index, category or None): spent}
+        self.counters = {period: defaultdict(int) for period in PERIODS}
+        self.set_budgets(budgets)
+
+    def set_budgets(self, budgets: Iterable) -> None:
+        """
+        Replace the budgets, the counters don't
+        depend on them.
+        @raises
+            InvalidBudgetError
+        """
+        self.budgets = [validate_budget(budget) for budget in budgets]
+
+    def build(self, expenses: Iterable) -> None:
+        """
+        Create the counters from the expenses.
+        """
+        for counters in self.counters.values():
+            counters.clear()
+        for expense in expenses:
+            self._count(expense)
+
+    def _count(self, expense: dict, sign: int = 1) -> None:
+        """
+        Add the overall price of the expense to
+        the counters of its week and month.
+        """
+        price = sign * expense["overall_price"]
+        category = expense["category"]
+        for period, counters in self.counters.items():
+            index = get_period_index(period, expense["date"])
+            counters[index, None] += price
+            counters[index, category] += price
+
+    def add(self, expense: dict) -> list:
+        """
+        Add the expense to the counters and returns
+        the statuses of the budgets which passed
+        one of their alert levels by this expense.
+        ---------------------------------------
+        -> Params
+            expense: dict
+        <- Return
+            list of dicts → see get_status
+        """
+        before = [self.get_spent(budget["period"],
+                                 expense["date"],
+                                 budget["category"])
+                  for budget in self.budgets]
+        self._count(expense)
+        alerts = list()
+        for budget, spent in zip(self.budgets, before):
+            if budget["category"] not in (None, expense["category"]):
+                continue
+            status = self.get_status(budget, expense["date"])
+            crossed = [level for level in budget["alert_at"]
+                       if spent < budget["limit"] * level <= status["spent"]]
+            if crossed:
+                status["level"] = crossed[-1]
+                alerts.append(status)
+        return alerts
+
+    def remove(self, expense: dict) -> None:
+        """
+        Remove the expense from the counters.
+        """
+        self._count(expense, -1)
+
+    def get_spent(self,
+                  period: str,
+                  day: datetime,
+                  category: str = None) -> int:
+        """
+        Returns the spend of the week or month of
+        the day.
+        ---------------------------------------
+        -> Params
+            period: str → weekly, monthly
+            day: datetime
+            category: str → None for all categories
+        <- Return
+            int → cents
+        """
+        key = (get_period_index(period, day), category)
+        return self.counters[period].get(key, 0)
+
+    def get_status(self, budget: dict, day: datetime) -> dict:
+        """
+        Returns the status of the budget in the
+        week or month of the day.
+        ---------------------------------------
+        -> Params
+            budget: dict
+            day: datetime
+        <- Return
+            dict → period, category, limit, spent,
+                   remaining(cents), ratio, start, end
+        """
+        period = budget["period"]
+        spent = self.get_spent(period, day, budget["category"])
+        start, end = get_period_range(period, get_period_index(period, day))
+        return {"period": period,
+                "category": budget["category"],
+                "limit": budget["limit"],
+                "spent": spent,
+                "remaining": budget["limit"] - spent,
+                "ratio": spent / budget["limit"],
+                "start": start,
+                "end": end}
+
+    def get_statuses(self, day: datetime) -> list:
+        """
+        Returns the status of all the budgets in
+        the period of the day.
+        """
+        return [self.get_status(budget, day) for budget in self.budgets]
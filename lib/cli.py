@@ -0,0 +1,396 @@
+"""
+Command line interface of the program to
+query, report, import and export expenses
+without the GUI. This module must not import
+the qt widgets, so it runs on servers without
+display and starts fast.
+
+@usage
+    python -m lib total --from 01-01-2024 --category food
+    python -m lib group --by category
+    python -m lib list --title meat --format csv
+    python -m lib search chiken
+    python -m lib budgets --date 15-02-2024
+    python -m lib import 21-02-2024.csv
+    python -m lib export expenses.xlsx --split-by-month
+    python -m lib export expenses.csv.gz
+    python -m lib compress zstd
+    python -m lib serve --port 8765
+"""
+import csv
+import sys
+import json
+from argparse import ArgumentParser
+from argparse import ArgumentTypeError
+from argparse import Namespace
+from datetime import datetime
+from os.path import splitext
+from typing import Iterable
+from .constants import DATE_FORMAT
+from .constants import EXPENSES_DIR_PATH
+from .constants import CONFIGS_FILE_PATH
+from .constants import TABLE_HEADERS
+from .constants import SERVER_HOST
+from .constants import SERVER_PORT
+from .data_handler import DataHandler
+from .money import to_amount
+from .money import to_amounts
+from .dates import format_date
+from .dates import get_codec
+from .errors import GUIBaseException
+from .interface.utils import write_csv
+from .compression import CODECS
+from .compression import open_file
+from .compression import strip_extension
+from .tools.xlsx_handler import XlsxReader
+from .tools.xlsx_handler import XlsxWriter
+from .tools.xlsx_handler import XlsxHandlerBaseException
+from .settings import Settings
+from .tracing import tracer
+
+GROUP_KEYS = {
+    "date": lambda expense: format_date(expense["date"]),
+    "month": lambda expense: format_date(expense["date"], "%Y-%m"),
+    "year": lambda expense: format_date(expense["date"], "%Y"),
+    "category": lambda expense: expense["category"],
+    "title": lambda expense: expense["title"],
+}
+
+
+def parse_date(value: str) -> datetime:
+    """
+    Convert the date argument to datetime.
+    """
+    try:
+        return get_codec().parse(value)
+    except ValueError:
+        raise ArgumentTypeError(f"date must be in {DATE_FORMAT} format → {value}")
+
+
+def get_filters(args: Namespace) -> dict:
+    """
+    Create the filters of the DataHandler.filter_data
+    from the arguments.
+    """
+    filters = {
+        "from_date": args.from_date or datetime.min,
+        "to_date": args.to_date or datetime.max,
+    }
+    if args.title:
+        filters["title"] = args.title
+    if args.category:
+        filters["category"] = args.category
+    return filters
+
+
+def get_expenses(data_handler: DataHandler, args: Namespace) -> list:
+    """
+    Returns the filtered expenses based on
+    the arguments.
+    """
+    return data_handler.filter_data(filters=get_filters(args))
+
+
+def format_value(value: object) -> str:
+    """
+    Convert a table value to string.
+    """
+    if isinstance(value, datetime):
+        return format_date(value)
+    if isinstance(value, float):
+        return f"{value:,.2f}"
+    return str(value)
+
+
+def print_rows(headers: list,
+               rows: Iterable,
+               output_format: str) -> None:
+    """
+    Print the rows in the given format.
+    ----------------------------------
+    -> Params
+        headers: list
+        rows: Iterable of list
+        output_format: str → table, csv, json
+    """
+    if output_format == "csv":
+        writer = csv.writer(sys.stdout, quoting=csv.QUOTE_MINIMAL)
+        writer.writerow(headers)
+        for row in rows:
+            writer.writerow([format_date(value)
+                             if isinstance(value, datetime) else value
+                             for value in row])
+        return
+    if output_format == "json":
+        for row in rows:
+            print(json.dumps(dict(zip(headers, row)),
+                             default=format_value))
+        return
+    rows = [[format_value(value) for value in row] for row in rows]
+    widths = [max([len(header)] + [len(row[index]) for row in rows])
+              for index, header in enumerate(headers)]
+    print("  ".join(header.ljust(width) for header, width in zip(headers, widths)))
+    for row in rows:
+        print("  ".join(value.ljust(width) for value, width in zip(row, widths)))
+
+
+def list_command(data_handler: DataHandler, args: Namespace) -> None:
+    """
+    Print the filtered expenses.
+    """
+    expenses = get_expenses(data_handler, args)
+    if args.limit:
+        expenses = expenses[:args.limit]
+    rows = (list(to_amounts(expense).values()) for expense in expenses)
+    print_rows(TABLE_HEADERS, rows, args.format)
+
+
+def total_command(data_handler: DataHandler, args: Namespace) -> None:
+    """
+    Print the total price and number of the
+    filtered expenses.
+    """
+    summary = data_handler.get_range_summary(get_filters(args))
+    if summary is None:
+        expenses = get_expenses(data_handler, args)
+        summary = (data_handler.get_total_price(expenses), len(expenses))
+    print_rows(["Total Price", "Total Items"],
+               [[to_amount(summary[0]), summary[1]]],
+               args.format)
+
+
+def get_group_totals(expenses: Iterable, by: str) -> list:
+    """
+    Returns the total price and number of the
+    expenses for each group.
+    ----------------------------------
+    -> Params
+        expenses: Iterable of dicts
+        by: str → one of GROUP_KEYS
+    <- Return
+        list of [name, total(cents), count] sorted
+        by the total
+    """
+    key = GROUP_KEYS[by]
+    groups = dict()
+    for expense in expenses:
+        group = groups.setdefault(key(expense), [0, 0])
+        group[0] += expense["overall_price"]
+        group[1] += 1
+    return sorted(([name, total, count] for name, (total, count) in groups.items()),
+                  key=lambda row: row[1],
+                  reverse=True)
+
+
+def group_command(data_handler: DataHandler, args: Namespace) -> None:
+    """
+    Print the total price and number of the
+    filtered expenses for each group.
+    """
+    rows = data_handler.get_group_summary(get_filters(args), args.by)
+    if rows is None:
+        rows = get_group_totals(get_expenses(data_handler, args), args.by)
+    print_rows([args.by.capitalize(), "Total Price", "Total Items"],
+               ([name, to_amount(total), count] for name, total, count in rows),
+               args.format)
+
+
+def search_command(data_handler: DataHandler, args: Namespace) -> None:
+    """
+    Print the titles which are similar to the
+    query ranked by their relevance.
+    """
+    rows = data_handler.search_titles(args.query, args.limit)
+    print_rows(["Title", "Score", "Total Items"], rows, args.format)
+
+
+def budgets_command(data_handler: DataHandler, args: Namespace) -> None:
+    """
+    Print the status of the budgets of the
+    config file in the week or month of the date.
+    """
+    data_handler.set_budgets(Settings(args.config).get("budgets", []))
+    statuses = data_handler.get_budget_statuses(args.date)
+    rows = [[status["category"] or "Overall",
+             status["period"],
+             status["start"],
+             status["end"],
+             to_amount(status["limit"]),
+             to_amount(status["spent"]),
+             f"{status['ratio']:.0%}"]
+            for status in statuses]
+    print_rows(["Budget", "Period", "From", "To", "Limit", "Spent", "Used"],
+               rows,
+               args.format)
+
+
+def read_table(path: str) -> Iterable:
+    """
+    Read an xlsx or csv file and yield its rows
+    as dicts, the first row(of each sheet) is the
+    headers.
+    """
+    if splitext(strip_extension(path))[1].lower() == ".csv":
+        with open_file(path, newline="") as file:
+            yield from csv.DictReader(file)
+        return
+    with XlsxReader() as handler:
+        handler.open_excel(path)
+        yield from handler.fetch_all_sheets()
+
+
+def import_command(data_handler: DataHandler, args: Namespace) -> None:
+    """
+    Import the expenses of an xlsx or csv file.
+    """
+    count = data_handler.import_expenses(read_table(args.path))
+    print(f"{count} expenses imported.")
+
+
+def export_command(data_handler: DataHandler, args: Namespace) -> None:
+    """
+    Export the expenses to an xlsx or csv file,
+    csv is compressed by the extension of the
+    path(.csv.gz, .csv.xz, .csv.zst).
+    """
+    if splitext(strip_extension(args.path))[1].lower() == ".csv":
+        write_csv(path=args.path, data=data_handler.get_all_as_table())
+    else:
+        with XlsxWriter(split_by_month=args.split_by_month) as handler:
+            handler.create_new()
+            handler.add_data(data_handler.get_all_as_table(format_date=False))
+            handler.save_as(args.path)
+    print(f"Expenses exported to {args.path}")
+
+
+def compress_command(data_handler: DataHandler, args: Namespace) -> None:
+    """
+    Rewrite the data files with the compression
+    codec.
+    """
+    codec = None if args.codec == "none" else args.codec
+    data_handler.set_compression(codec)
+    if codec is None:
+        print("Expenses are saved without compression.")
+    else:
+        print(f"Expenses are saved with {codec} compression.")
+
+
+def serve_command(data_handler: DataHandler, args: Namespace) -> None:
+    """
+    Run the local query server on the loaded
+    expenses, the budgets of the config file
+    are checked for the added expenses.
+    """
+    # the server module imports this module
+    from .server import serve
+    data_handler.set_budgets(Settings(args.config).get("budgets", []))
+    serve(data_handler, args.host, args.port, args.unix)
+
+
+def add_filter_arguments(parser: ArgumentParser) -> None:
+    """
+    Add the arguments which are used for
+    filtering the expenses.
+    """
+    parser.add_argument("--from", dest="from_date", type=parse_date,
+                        help=f"from date in {DATE_FORMAT} format")
+    parser.add_argument("--to", dest="to_date", type=parse_date,
+                        help=f"to date in {DATE_FORMAT} format")
+    parser.add_argument("--title", help="title contains(typos are tolerated)")
+    parser.add_argument("--category", help="category starts with")
+    parser.add_argument("--format", choices=("table", "csv", "json"),
+                        default="table")
+
+
+def create_parser() -> ArgumentParser:
+    """
+    Create the argument parser of the commands.
+    """
+    parser = ArgumentParser(prog="python -m lib",
+                            description="Expense Tracker command line.")
+    parser.add_argument("--data", default=EXPENSES_DIR_PATH,
+                        help="json file or partitions directory of the expenses")
+    parser.add_argument("--config", default=CONFIGS_FILE_PATH,
+                        help="json file that contains the configs")
+    parser.add_argument("--count", type=int, default=None,
+                        help="number of latest expenses to load(default all)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="processes which filter the big ledgers(default cpu count)")
+    parser.add_argument("--trace", default=None,
+                        help="save the spans as chrome trace json in this path")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = commands.add_parser("list", help="print the expenses")
+    add_filter_arguments(list_parser)
+    list_parser.add_argument("--limit", type=int, default=None)
+    list_parser.set_defaults(function=list_command)
+
+    total_parser = commands.add_parser("total", help="print the total price")
+    add_filter_arguments(total_parser)
+    total_parser.set_defaults(function=total_command)
+
+    group_parser = commands.add_parser("group", help="print totals per group")
+    add_filter_arguments(group_parser)
+    group_parser.add_argument("--by", choices=tuple(GROUP_KEYS), default="category")
+    group_parser.set_defaults(function=group_command)
+
+    search_parser = commands.add_parser("search", help="search the titles")
+    search_parser.add_argument("query")
+    search_parser.add_argument("--limit", type=int, default=10)
+    search_parser.add_argument("--format", choices=("table", "csv", "json"),
+                               default="table")
+    search_parser.set_defaults(function=search_command)
+
+    budgets_parser = commands.add_parser("budgets", help="print the budgets status")
+    budgets_parser.add_argument("--date", type=parse_date, default=None,
+                                help=f"day of the period in {DATE_FORMAT} format(default today)")
+    budgets_parser.add_argument("--format", choices=("table", "csv", "json"),
+                                default="table")
+    budgets_parser.set_defaults(function=budgets_command)
+
+    import_parser = commands.add_parser("import", help="import xlsx or csv file")
+    import_parser.add_argument("path")
+    import_parser.set_defaults(function=import_command)
+
+    export_parser = commands.add_parser("export", help="export to xlsx or csv file")
+    export_parser.add_argument("path")
+    export_parser.add_argument("--split-by-month", action="store_true",
+                               help="one sheet per month(xlsx)")
+    export_parser.set_defaults(function=export_command)
+
+    compress_parser = commands.add_parser("compress",
+                                          help="compress the data files")
+    compress_parser.add_argument("codec", choices=("none", *CODECS))
+    compress_parser.set_defaults(function=compress_command)
+
+    serve_parser = commands.add_parser("serve", help="run the local query server")
+    serve_parser.add_argument("--host", default=SERVER_HOST,
+                              help="address of the server(default localhost)")
+    serve_parser.add_argument("--port", type=int, default=SERVER_PORT)
+    serve_parser.add_argument("--unix", default=None,
+                              help="listen on this unix socket instead of the port")
+    serve_parser.set_defaults(function=serve_command)
+    return parser
+
+
+def main(argv: list = None) -> int:
+    """
+    Parse the arguments and run the command.
+    """
+    args = create_parser().parse_args(argv)
+    if args.trace:
+        tracer.enable()
+    data_handler = None
+    try:
+        data_handler = DataHandler(args.data, args.count, args.workers)
+        args.function(data_handler, args)
+    except (GUIBaseException, XlsxHandlerBaseException) as error:
+        print(f"Error: {error}", file=sys.stderr)
+        return 1
+    finally:
+        if data_handler is not None:
+            data_handler.close()
+        if args.trace:
+            tracer.dump(args.trace)
+    return 0
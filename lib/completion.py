@@ -0,0 +1,173 @@
+"""
+This module contains the autocomplete index of the
+titles and categories. Each distinct value has a score
+of its uses, a use counts less the older its expense
+is, so the frequent and recent values come first. The
+top values of the short prefixes are cached and kept
+up to date on each added expense, the longer prefixes
+only have a few values to rank.
+
+@note
+    the weight of a use grows with its date instead of
+    decaying the older ones(2 ** (days / half life)),
+    the order is the same and the scores don't have to
+    be updated when the time passes.
+"""
+from bisect import bisect_left
+from bisect import insort
+from datetime import datetime
+from heapq import nlargest
+from typing import Iterable
+
+__all__ = ["CompletionIndex"]
+
+COMPLETION_LIMIT = 10
+# prefixes up to this length keep their top values
+CACHED_PREFIX_LENGTH = 3
+# a use loses half of its weight after these days
+HALF_LIFE_DAYS = 30
+EPOCH_ORDINAL = datetime(2020, 1, 1).toordinal()
+
+
+def get_weight(date: datetime) -> float:
+    """
+    Returns the weight of a use of the date.
+    """
+    return 2.0 ** ((date.toordinal() - EPOCH_ORDINAL) / HALF_LIFE_DAYS)
+
+
+class CompletionIndex:
+    """
+    Ranked prefix completions of distinct values.
+    --------------------------------------------
+    @methods
+        build
+        add
+        remove
+        complete
+    """
+
+    def __init__(self, limit: int = COMPLETION_LIMIT) -> None:
+        """
+        ---------------------------------
+        -> Params
+            limit: int → number of the cached top values
+                         of each prefix
+        """
+        self.limit = limit
+        # lower cased value → score
+        self.scores = dict()
+        # lower cased value → number of uses
+        self.counts = dict()
+        # lower cased value → value of the last use
+        self.values = dict()
+        # sorted lower cased values for the prefix ranges
+        self.keys = list()
+        # prefix → top keys, highest score first
+        self.top = dict()
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def build(self, uses: Iterable) -> None:
+        """
+        Create the index from all the uses at once.
+        ---------------------------------------
+        -> Params
+            uses: Iterable of (value, date)
+        """
+        self.__init__(self.limit)
+        scores = self.scores
+        counts = self.counts
+        values = self.values
+        for value, date in uses:
+            key = value.lower()
+            scores[key] = scores.get(key, 0.0) + get_weight(date)
+            counts[key] = counts.get(key, 0) + 1
+            values.setdefault(key, value)
+        self.keys = sorted(scores)
+        # the shortest prefixes have the most values to
+        # rank, so they are ranked once here
+        for prefix in {""} | {key[:1] for key in self.keys}:
+            self.top[prefix] = self._rank(prefix, self.limit)
+
+    def add(self, value: str, date: datetime) -> None:
+        """
+        Add a use of the value, the cached top values
+        of its prefixes are updated.
+        """
+        key = value.lower()
+        if key not in self.scores:
+            insort(self.keys, key)
+            self.scores[key] = 0.0
+            self.counts[key] = 0
+        self.scores[key] += get_weight(date)
+        self.counts[key] += 1
+        self.values[key] = value
+        score = self.scores[key]
+        for length in range(min(len(key), CACHED_PREFIX_LENGTH) + 1):
+            top = self.top.get(key[:length])
+            if top is None:
+                continue
+            if key in top:
+                top.sort(key=self.scores.__getitem__, reverse=True)
+            elif len(top) < self.limit:
+                # the list has all the values of the prefix
+                top.append(key)
+                top.sort(key=self.scores.__getitem__, reverse=True)
+            elif score > self.scores[top[-1]]:
+                top[-1] = key
+                top.sort(key=self.scores.__getitem__, reverse=True)
+
+    def remove(self, value: str, date: datetime) -> None:
+        """
+        Remove a use of the value, the prefixes which
+        had it in their top values are ranked again on
+        their next completion.
+        """
+        key = value.lower()
+        if key not in self.scores:
+            return
+        self.counts[key] -= 1
+        if self.counts[key]:
+            self.scores[key] -= get_weight(date)
+        else:
+            del self.scores[key]
+            del self.counts[key]
+            del self.values[key]
+            del self.keys[bisect_left(self.keys, key)]
+        for length in range(min(len(key), CACHED_PREFIX_LENGTH) + 1):
+            prefix = key[:length]
+            if key in self.top.get(prefix, ()):
+                del self.top[prefix]
+
+    def _rank(self, prefix: str, limit: int) -> list:
+        """
+        Returns the top keys of the values which
+        start with the prefix.
+        """
+        start = bisect_left(self.keys, prefix)
+        end = bisect_left(self.keys, prefix + "\uffff", start)
+        return nlargest(limit, self.keys[start:end], key=self.scores.__getitem__)
+
+    def complete(self, prefix: str, limit: int = None) -> list:
+        """
+        Returns the values which start with the
+        prefix(case insensitive), the most used and
+        recent ones first.
+        ---------------------------------------
+        -> Params
+            prefix: str
+            limit: int → default is the limit of the index
+        <- Return
+            list of str
+        """
+        prefix = prefix.lower()
+        limit = min(limit or self.limit, self.limit)
+        if len(prefix) > CACHED_PREFIX_LENGTH:
+            keys = self._rank(prefix, limit)
+        else:
+            keys = self.top.get(prefix)
+            if keys is None:
+                keys = self.top[prefix] = self._rank(prefix, self.limit)
+        return [self.values[key] for key in keys[:limit]]
@@ -0,0 +1,171 @@
+"""
+This module contains the compression codecs of the
+data and exported files. The codec of a file is
+detected by its first bytes(magic number) when it's
+read and by its extension when it's written, so the
+callers open the compressed and plain files the same
+way. The files are compressed and decompressed as a
+stream, the whole file isn't kept in the memory.
+
+@note
+    gzip is always available, lzma needs python to be
+    built with liblzma and zstd needs the zstandard
+    package. They are imported on the first use.
+"""
+import os
+from typing import Callable
+from .errors import UnsupportedCompressionError
+
+__all__ = ["CODECS",
+           "open_file",
+           "detect_codec",
+           "get_codec",
+           "get_extension",
+           "strip_extension",
+           "get_available_codecs",
+           "check_codec"]
+
+
+def _open_gzip(path: str, mode: str, **kwargs) -> object:
+    import gzip
+    # level 6 is much faster than the default(9) and
+    # the files are only a few percent bigger
+    return gzip.open(path, f"{mode}t", compresslevel=6, **kwargs)
+
+
+def _open_lzma(path: str, mode: str, **kwargs) -> object:
+    import lzma
+    return lzma.open(path, f"{mode}t", **kwargs)
+
+
+def _open_zstd(path: str, mode: str, **kwargs) -> object:
+    import zstandard
+    return zstandard.open(path, f"{mode}t", **kwargs)
+
+
+# name → (magic bytes, extension, open function, module)
+CODECS = {"gzip": (b"\x1f\x8b", ".gz", _open_gzip, "gzip"),
+          "lzma": (b"\xfd7zXZ\x00", ".xz", _open_lzma, "lzma"),
+          "zstd": (b"\x28\xb5\x2f\xfd", ".zst", _open_zstd, "zstandard")}
+MAGIC_LENGTH = max(len(magic) for magic, *_ in CODECS.values())
+
+
+def detect_codec(path: str) -> str:
+    """
+    Returns the codec of the file by its first
+    bytes, None for the plain files.
+    @raises
+        FileNotFoundError
+    """
+    with open(path, "rb") as file:
+        header = file.read(MAGIC_LENGTH)
+    for codec, (magic, *_) in CODECS.items():
+        if header.startswith(magic):
+            return codec
+    return None
+
+
+def get_codec(path: str) -> str:
+    """
+    Returns the codec of the extension of the
+    path, None for the other extensions.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    for codec, (_, codec_extension, *_) in CODECS.items():
+        if extension == codec_extension:
+            return codec
+    return None
+
+
+def get_extension(codec: str) -> str:
+    """
+    Returns the file extension of the codec,
+    empty string for no codec.
+    """
+    if codec is None:
+        return ""
+    return CODECS[codec][1]
+
+
+def strip_extension(path: str) -> str:
+    """
+    Returns the path without the extension of
+    its codec(expenses.csv.gz → expenses.csv).
+    """
+    if get_codec(path) is None:
+        return path
+    return os.path.splitext(path)[0]
+
+
+def get_available_codecs() -> list:
+    """
+    Returns the codecs which their module can
+    be imported.
+    """
+    codecs = list()
+    for codec, (*_, module) in CODECS.items():
+        try:
+            __import__(module)
+        except ImportError:
+            continue
+        codecs.append(codec)
+    return codecs
+
+
+def check_codec(codec: str) -> None:
+    """
+    Checks the codec is known and available, None
+    is for no compression.
+    @raises
+        UnsupportedCompressionError
+    """
+    if codec is not None:
+        _get_opener(codec)
+
+
+def _get_opener(codec: str) -> Callable:
+    """
+    Returns the open function of the codec.
+    @raises
+        UnsupportedCompressionError
+    """
+    if codec not in CODECS:
+        raise UnsupportedCompressionError(
+            f"Compression must be one of {', '.join(CODECS)} → {codec}")
+    if codec not in get_available_codecs():
+        raise UnsupportedCompressionError(
+            f"{codec} compression isn't available, "
+            f"{CODECS[codec][3]} module is required.")
+    return CODECS[codec][2]
+
+
+def open_file(path: str,
+              mode: str = "r",
+              codec: str = None,
+              **kwargs) -> object:
+    """
+    Open the file in text mode, compressed files
+    are decompressed or compressed while they are
+    read or written.
+    ---------------------------------------
+    -> Params
+        path: str
+        mode: str → r, w or a
+        codec: str → codec of the written file, default
+                     is the codec of the extension.
+                     read files use their magic bytes.
+        kwargs: arguments of the open function
+                (encoding, newline, ...)
+    <- Return
+        text file object
+    @raises
+        FileNotFoundError
+        UnsupportedCompressionError
+    """
+    if mode == "r":
+        codec = detect_codec(path)
+    elif codec is None:
+        codec = get_codec(path)
+    if codec is None:
+        return open(path, mode, **kwargs)
+    return _get_opener(codec)(path, mode, **kwargs)
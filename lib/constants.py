@@ -7,9 +7,24 @@ DATE_FORMAT = "%d-%m-%Y"
 TABLE_HEADERS = ["Title", "Price", "Quantity",
                 "Overall Price", "Categoty",
                 "Date"]
+EXPENSE_KEYS = ["title", "price", "quantity",
+                "overall_price", "category",
+                "date"]
+# ledgers smaller than this are filtered in a single thread
+PARALLEL_THRESHOLD = 500000
+# number of the changes which can be undone
+HISTORY_LIMIT = 100
+# milliseconds which the changes of the data files are collected
+# before the window reads them
+SYNC_DELAY = 300
+# address of the local query server(python -m lib serve)
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8765
 
 CONFIGS_FILE_PATH = f"{CWD}/lib/configs/config.json"
 EXPENSES_FILE_PATH = f"{CWD}/lib/data/data.json"
+# monthly partitions, created from EXPENSES_FILE_PATH on the first run
+EXPENSES_DIR_PATH = f"{CWD}/lib/data/data"
 CSS_COLORS_FILE_PATH = f"{CWD}/lib/css/colors.css"
 CSS_FILE_PATH = f"{CWD}/lib/css/style.css"
 
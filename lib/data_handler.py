@@ -1,12 +1,33 @@
 
 
 from typing import Generator
+from typing import Iterable
 from datetime import datetime
+from datetime import timedelta
 from collections import defaultdict
-from .interface.utils import load_json
-from .interface.utils import write_json
+from operator import itemgetter
 from .constants import TABLE_HEADERS
-from .constants import DATE_FORMAT
+from .constants import EXPENSE_KEYS
+from .constants import PARALLEL_THRESHOLD
+from .constants import HISTORY_LIMIT
+from .errors import InvalidFileContentError
+from .errors import DataValidationFailed
+from .search_index import TitleIndex
+from .budgets import BudgetTracker
+from .budgets import get_periods_range
+from .fenwick import DailyTotals
+from .symbols import SymbolTable
+from .completion import CompletionIndex
+from .sort_index import ColumnOrders
+from .money import to_cents
+from .money import to_amounts
+from .dates import get_codec
+from .dates import parse_date
+from .storage import open_store
+from .storage import sort_expenses
+from .history import Command
+from .history import CommandHistory
+from .tracing import tracer
 
 class DataHandler:
     """
@@ -17,31 +38,246 @@ class DataHandler:
     """
     def __init__(self,
                  data_path: str,
-                 expenses_count: int) -> None:
+                 expenses_count: int,
+                 parallel_workers: int = None) -> None:
         """
         ---------------------------------
         -> Params
             data_path: str
-                json file that contains the epenses
+                json file that contains the epenses or
+                directory of the monthly partitions
+            expenses_count: int
+            parallel_workers: int
+                number of processes which scan the
+                big ledgers, default is cpu count
         """
         self.data_path = data_path
         self.expenses_count = expenses_count
+        self.parallel_threshold = PARALLEL_THRESHOLD
+        self.parallel_workers = parallel_workers
+        self.history = CommandHistory(HISTORY_LIMIT)
+        self.scanner = None
+        self.last_scan = (None, 0)
+        # grows on each change of the loaded expenses, the
+        # views compare it to find out their data is old
+        self.changes_count = 0
+        self.title_index = TitleIndex()
+        self.analytics = None
+        self.budget_tracker = None
+        self.daily_totals = None
+        self.column_orders = None
+        self.symbols = {"title": SymbolTable(),
+                        "category": SymbolTable()}
+        self.completions = {"title": CompletionIndex(),
+                            "category": CompletionIndex()}
         self.expenses = self.load_expenses(self.data_path)
+        self.build_indexes()
     
+    @tracer.traced()
     def load_expenses(self, data_path: str) -> list:
         """
-        Load data from the json file
+        Load data from the json file and its journal
+        or the latest partitions of the directory.
         ---------------------------------
         -> Params
             data_path: str
         <- Return
             list of dicts
         """
-        try:
-            data = load_json(data_path)
-            return data[:self.expenses_count]
-        except FileNotFoundError:
-            return list()
+        self.store = open_store(data_path)
+        data = self.store.load(self.expenses_count)
+        for expense in data:
+            self.intern_expense(expense)
+        return data
+
+    @tracer.traced()
+    def load_range(self,
+                   from_date: datetime,
+                   to_date: datetime,
+                   exclude: Iterable = ()) -> int:
+        """
+        Load the partitions(or the expenses after the
+        count of a json file) of the date range which
+        aren't loaded yet and add them to the indexes.
+        ---------------------------------------
+        -> Params
+            from_date: datetime
+            to_date: datetime
+            exclude: Iterable → names of the partitions
+                                which aren't needed
+        <- Return
+            int: number of the loaded expenses
+        """
+        expenses = self.store.load_range(from_date, to_date, exclude)
+        if expenses is None:
+            # the older expenses are changed by another instance
+            self.reload()
+            expenses = self.store.load_range(from_date, to_date, exclude)
+        return self._add_loaded(expenses)
+
+    def _add_loaded(self, expenses: list, older: bool = False) -> int:
+        """
+        Add the expenses of the newly loaded partitions
+        to the current expenses and the indexes. The
+        older expenses(load_more) are after the loaded
+        ones of the same day.
+        """
+        if not expenses:
+            return 0
+        # sorting all the expenses again is faster than
+        # inserting a whole partition one by one
+        self.column_orders = None
+        for expense in expenses:
+            self._index_expense(expense)
+        if older:
+            self.expenses = sort_expenses(self.expenses + expenses)
+        else:
+            self.expenses = sort_expenses(expenses + self.expenses)
+        self.expenses_changed()
+        return len(expenses)
+
+    def load_all(self) -> None:
+        """
+        Load all the partitions.
+        """
+        self.load_range(datetime.min, datetime.max)
+
+    def set_expenses_count(self, expenses_count: int) -> None:
+        """
+        Change the number of the latest expenses.
+        A bigger count loads only the missing
+        expenses, a smaller one keeps the loaded
+        ones and only get_latest returns less.
+        ---------------------------------------
+        -> Params
+            expenses_count: int → None for all
+        """
+        self.expenses_count = expenses_count
+        if expenses_count is None:
+            self.load_all()
+            return
+        missing = expenses_count - len(self.expenses)
+        if missing <= 0:
+            return
+        with self.store.lock:
+            self.sync()
+            expenses = self.store.load_more(missing)
+            if expenses is None:
+                self.reload()
+                return
+            self._add_loaded(expenses, older=True)
+
+    def get_latest(self) -> list:
+        """
+        Returns the latest expenses_count expenses.
+        """
+        return self.expenses[:self.expenses_count]
+
+    @tracer.traced()
+    def sync(self) -> bool:
+        """
+        Apply the changes which the other instances of
+        the program saved after the last read or write
+        of this one. Only the new journal lines or the
+        changed partitions are read and the changed
+        expenses are updated in the indexes.
+        ---------------------------------------
+        <- Return
+            bool: True if the expenses changed
+        """
+        with self.store.lock:
+            operations = self.store.sync()
+            if operations is None:
+                self.reload()
+                return True
+            added = list()
+            for operation in operations:
+                if operation["op"] == "add":
+                    added.append(operation["expense"])
+                    continue
+                if operation["op"] == "manifest":
+                    # the summaries of the unloaded partitions
+                    self.expenses_changed()
+                    continue
+                if added:
+                    self._insert_expenses(added, save=False)
+                    added = list()
+                expense = self._find_expense(operation["expense"])
+                if expense is None:
+                    # it isn't loaded(older than the count)
+                    continue
+                if operation["op"] == "delete":
+                    self._remove_expenses([expense], save=False)
+                else:
+                    self._change_expense(expense, operation["changes"], save=False)
+            if added:
+                self._insert_expenses(added, save=False)
+        return bool(operations)
+
+    def reload(self) -> None:
+        """
+        Load the expenses again when the files are
+        replaced by another instance, the history
+        can't be applied on the new objects.
+        """
+        self.history.clear()
+        self.expenses = self.load_expenses(self.data_path)
+        self.build_indexes()
+        self.analytics = None
+        self.daily_totals = None
+        self.column_orders = None
+        if self.budget_tracker is not None:
+            self.budget_tracker.build(self.expenses)
+        self.expenses_changed()
+
+    def _find_expense(self, values: dict) -> dict:
+        """
+        Returns the expense which is the given object
+        or has the same values, None if it isn't
+        loaded.
+        """
+        index = self._bisect(values["date"])
+        found = None
+        while index < len(self.expenses) and \
+              self.expenses[index]["date"] == values["date"]:
+            expense = self.expenses[index]
+            if expense is values:
+                return expense
+            if found is None and expense == values:
+                found = expense
+            index += 1
+        return found
+
+    def set_compression(self, codec: str) -> None:
+        """
+        Rewrite the data files with the compression
+        codec, the next writes use it too.
+        ---------------------------------------
+        -> Params
+            codec: str → gzip, lzma, zstd or None
+        @raises
+            UnsupportedCompressionError
+        """
+        with self.store.lock:
+            self.sync()
+            self.load_all()
+            self.store.set_codec(codec)
+
+    def get_range(self, from_date: datetime, to_date: datetime) -> list:
+        """
+        Returns the expenses of the date range by
+        binary search, the expenses are sorted newest
+        first.
+        """
+        return self.expenses[self._bisect(to_date):self._bisect(from_date, older=True)]
+
+    def intern_expense(self, expense: dict) -> None:
+        """
+        Replace the title and category of the expense
+        with the shared strings of the symbol tables.
+        """
+        for key, symbols in self.symbols.items():
+            expense[key] = symbols.intern(expense[key])
     
     def _filter_dates(self,
                      expense_date: datetime,
@@ -66,7 +302,7 @@ class DataHandler:
                        expense: dict,
                        from_date: datetime,
                        to_date: datetime,
-                       filters: dict) -> bool:
+                       matchers: dict) -> bool:
         """
         Checks whether the expense meets the desired
         criteria or not.
@@ -75,17 +311,46 @@ class DataHandler:
             expense: dict,
             from_date: datetime object
             to_date: datetime object
-            filters: dict
+            matchers: dict → {key: function(value) -> bool}
         <- Return
             bool
         """
         if not self._filter_dates(expense["date"], from_date, to_date):
             return False
-        for filter_name, value in filters.items():
-            if not expense[filter_name].lower().startswith(value.lower()):
+        for filter_name, matcher in matchers.items():
+            if not matcher(expense[filter_name]):
                 return False
         return True
 
+    def get_matchers(self, filters: dict) -> dict:
+        """
+        Convert the values of the filters to
+        functions which check the value of an
+        expense. Title is searched in the title
+        index(substring or fuzzy), the others
+        match by prefix. The filters are checked
+        once per distinct value of the symbol
+        tables, the expenses are checked by a set
+        lookup.
+        --------------------------------------------
+        -> Params
+            filters: dict → {"title": "chicken"}
+        <- Return
+            dict → {key: function(value) -> bool}
+        """
+        matchers = dict()
+        for filter_name, value in filters.items():
+            if filter_name == "title":
+                matchers[filter_name] = self.title_index.match(value).__contains__
+                continue
+            value = value.lower()
+            function = lambda item, value=value: str(item).lower().startswith(value)
+            if filter_name in self.symbols:
+                function = self.symbols[filter_name].match(function).__contains__
+            matchers[filter_name] = function
+        return matchers
+
+    @tracer.traced()
     def filter_data(self, filters: dict) -> list:
         """
         Filter the data based on the given filters.
@@ -97,21 +362,293 @@ class DataHandler:
         """
         from_date = filters.pop("from_date")                 
         to_date = filters.pop("to_date")                   
+        self.load_range(from_date, to_date)
+        matchers = self.get_matchers(filters)
+        if len(self.expenses) >= self.parallel_threshold:
+            scanner = self.get_scanner()
+            if scanner.supports(matchers):
+                data, total = scanner.filter(self.expenses,
+                                             from_date,
+                                             to_date,
+                                             matchers)
+                self.last_scan = (data, total)
+                return data
         data = filter(
             lambda expense: self._filter_expense(expense,
                                                  from_date,
                                                  to_date,
-                                                 filters),
-            self.expenses)
+                                                 matchers),
+            self.get_range(from_date, to_date))
         return list(data)
 
+    def build_indexes(self) -> None:
+        """
+        Create the indexes of the loaded expenses.
+        """
+        self.title_index.build(expense["title"] for expense in self.expenses)
+        for key, completions in self.completions.items():
+            completions.build((expense[key], expense["date"])
+                              for expense in self.expenses)
+
+    def _index_expense(self, expense: dict) -> list:
+        """
+        Add a new expense to the indexes.
+        <- Return
+            list of the budgets alerts
+        """
+        self.intern_expense(expense)
+        self.title_index.add(expense["title"])
+        for key, completions in self.completions.items():
+            completions.add(expense[key], expense["date"])
+        if self.analytics is not None:
+            self.analytics.add(expense)
+        if self.daily_totals is not None:
+            self.daily_totals.add(expense)
+        if self.column_orders is not None:
+            self.column_orders.add(expense)
+        if self.budget_tracker is not None:
+            return self.budget_tracker.add(expense)
+        return list()
+
+    def _unindex_expense(self, expense: dict) -> None:
+        """
+        Remove an expense from the indexes.
+        """
+        self.title_index.remove(expense["title"])
+        for key, completions in self.completions.items():
+            completions.remove(expense[key], expense["date"])
+        if self.analytics is not None:
+            self.analytics.remove(expense)
+        if self.daily_totals is not None:
+            self.daily_totals.remove(expense)
+        if self.column_orders is not None:
+            self.column_orders.remove(expense)
+        if self.budget_tracker is not None:
+            self.budget_tracker.remove(expense)
+
+    def get_daily_totals(self) -> DailyTotals:
+        """
+        Returns the range trees of the spend and
+        number of the expenses per day, they are
+        created on the first use.
+        """
+        if self.daily_totals is None:
+            daily_totals = DailyTotals()
+            daily_totals.build(self.expenses)
+            self.daily_totals = daily_totals
+        return self.daily_totals
+
+    def sort_rows(self,
+                  expenses: list,
+                  key: str,
+                  descending: bool = False) -> list:
+        """
+        Returns the rows of the expenses sorted by
+        the key, the sort order of the key is cached
+        and kept up to date on each change.
+        ---------------------------------------
+        -> Params
+            expenses: list of dicts → rows of a view
+            key: str → one of EXPENSE_KEYS
+            descending: bool
+        <- Return
+            list of int → the row of each position
+        """
+        if self.column_orders is None:
+            self.column_orders = ColumnOrders()
+        if key not in self.column_orders:
+            self.column_orders.build(key, self.expenses)
+        return self.column_orders.sort_rows(key, expenses, descending)
+
+    def get_range_summary(self, filters: dict) -> tuple:
+        """
+        Returns the total price and number of the
+        expenses of the filters from the range trees
+        without filtering the expenses. Title can't
+        be answered by the trees. The partitions which
+        aren't loaded and are completely in the range
+        are summed from the manifest without loading
+        them(only without category).
+        ---------------------------------------
+        -> Params
+            filters: dict → from_date, to_date, category
+        <- Return
+            tuple → (total price, total items) or
+            None if the filters have title
+        """
+        if any(name not in ("from_date", "to_date", "category") for name in filters):
+            return None
+        total_price = total_items = 0
+        summed = list()
+        if "category" not in filters:
+            total_price, total_items, summed = self.store.get_summary(
+                filters["from_date"], filters["to_date"])
+        self.load_range(filters["from_date"], filters["to_date"], summed)
+        daily_totals = self.get_daily_totals()
+        if "category" in filters:
+            matcher = self.get_matchers({"category": filters["category"]})["category"]
+            categories = [category for category in daily_totals.trees
+                          if category is not None and matcher(category)]
+        else:
+            categories = [None]
+        for category in categories:
+            price, items = daily_totals.query(filters["from_date"],
+                                              filters["to_date"],
+                                              category)
+            total_price += price
+            total_items += items
+        return total_price, total_items
+
+    def get_group_summary(self, filters: dict, by: str) -> list:
+        """
+        Returns the total price and number of the
+        expenses of the filters for each group if
+        the storage can group them(MongoDB groups
+        them on the server without loading them).
+        ---------------------------------------
+        -> Params
+            filters: dict → from_date, to_date, category
+            by: str → date, month, year, category, title
+        <- Return
+            list of [name, total, count] sorted by the
+            total or None if the expenses have to be
+            grouped in the memory
+        """
+        if any(name not in ("from_date", "to_date", "category") for name in filters):
+            return None
+        return self.store.get_groups(filters["from_date"],
+                                     filters["to_date"],
+                                     by,
+                                     filters.get("category"))
+
+    def set_budgets(self, budgets: list) -> None:
+        """
+        Set the budgets of the config file, the
+        spend counters are created from the loaded
+        expenses once and updated by each loaded or
+        new expense. The weeks and months are loaded
+        before their spend is read.
+        ---------------------------------------
+        -> Params
+            budgets: list of dicts
+        @raises
+            InvalidBudgetError
+        """
+        if self.budget_tracker is None:
+            tracker = BudgetTracker(budgets)
+            tracker.build(self.expenses)
+            self.budget_tracker = tracker
+            return
+        self.budget_tracker.set_budgets(budgets)
+
+    def get_budget_statuses(self, day: datetime = None) -> list:
+        """
+        Returns the status of the budgets in the
+        week or month of the day(default today).
+        """
+        if self.budget_tracker is None:
+            return list()
+        day = day or datetime.now()
+        self.load_range(*get_periods_range(day))
+        return self.budget_tracker.get_statuses(day)
+
+    def complete(self, key: str, prefix: str, limit: int = None) -> list:
+        """
+        Returns the titles or categories which start
+        with the prefix, the most used and recent
+        ones first.
+        ---------------------------------------
+        -> Params
+            key: str → title or category
+            prefix: str
+            limit: int
+        <- Return
+            list of str
+        """
+        return self.completions[key].complete(prefix, limit)
+
+    def search_titles(self, query: str, limit: int = 10) -> list:
+        """
+        Returns the titles which are similar to
+        the query ranked by their relevance.
+        ---------------------------------------
+        -> Params
+            query: str
+            limit: int
+        <- Return
+            list of (title, score, rows count)
+        """
+        return self.title_index.search(query, limit)
+
+    def get_analytics(self) -> object:
+        """
+        Returns the time series analytics of the
+        expenses, it's created on the first use so
+        the command line doesn't load numpy.
+        """
+        if self.analytics is None:
+            from .analytics import SpendAnalytics
+            self.analytics = SpendAnalytics(self.expenses,
+                                            self.symbols["category"])
+        return self.analytics
+
+    def get_spend_report(self,
+                         from_date: datetime,
+                         to_date: datetime) -> dict:
+        """
+        Returns the daily spend, rolling sums,
+        moving averages and monthly deltas per
+        category of the date range.
+        ---------------------------------------
+        -> Params
+            from_date: datetime
+            to_date: datetime
+        <- Return
+            dict → see SpendAnalytics.report
+        """
+        # the rolling sums and the monthly changes need
+        # up to two months before from_date
+        self.load_range(from_date - timedelta(days=62), to_date)
+        return self.get_analytics().report(from_date, to_date)
+
+    def get_scanner(self) -> object:
+        """
+        Returns the parallel scanner, it's imported
+        on the first use so small ledgers and the
+        command line don't load numpy.
+        """
+        if self.scanner is None:
+            from .parallel_scan import ParallelScanner
+            self.scanner = ParallelScanner(self.parallel_workers, self.symbols)
+        return self.scanner
+
+    def expenses_changed(self) -> None:
+        """
+        Remove the data which are computed from
+        the expenses after changing them.
+        """
+        self.changes_count += 1
+        self.last_scan = (None, 0)
+        if self.scanner is not None:
+            self.scanner.invalidate()
+
+    def close(self) -> None:
+        """
+        Release the shared memory and the processes
+        of the parallel scanner.
+        """
+        if self.scanner is not None:
+            self.scanner.close()
+            self.scanner = None
+
     def get_all(self) -> list:
         """
         Returns the expenses.
         """
         return self.expenses
     
-    def get_total_price(self, expenses: list) -> float:
+    @tracer.traced()
+    def get_total_price(self, expenses: list) -> int:
         """
         Loops through the expenses and sum the
         overall price and return it.
@@ -119,9 +656,16 @@ class DataHandler:
         -> Params
             expenses: list
         <- Return
-            float
+            int → cents
+        @note
+            total of the last parallel scan is
+            already summed by the workers.
         """
-        return sum(expense["overall_price"] for expense in expenses)
+        scanned, total = self.last_scan
+        if expenses is scanned:
+            return total
+        # the small ints are summed in C without objects
+        return sum(map(itemgetter("overall_price"), expenses))
 
     def group_expenses_by_date(self,
                                expenses: list) -> dict:
@@ -134,33 +678,355 @@ class DataHandler:
         <- Return
             dict
         """
+        return self.group_expenses(expenses, "date")
+
+    def group_expenses(self,
+                       expenses: list,
+                       key: str) -> dict:
+        """
+        Group the expenses based on the value
+        of the given key.
+        ------------------------------------------
+        -> Params
+            expenses: list
+            key: str → date, category, title...
+        <- Return
+            dict
+        """
         grouped = defaultdict(list)
         for expense in expenses:
-            grouped[expense["date"]].append(expense)
+            grouped[expense[key]].append(expense)
         return grouped
     
-    def add_expense(self, expense: dict) -> None:
+    @tracer.traced()
+    def add_expense(self, expense: dict) -> list:
         """
         Add expense to the current expenses and
         save to file.
         ---------------------------------------
         -> Params
             expense: dict
+        <- Return
+            list of the budgets which passed an
+            alert level by this expense
+        """
+        with self.store.lock:
+            self.sync()
+            alerts = self._insert_expenses([expense])
+        self.history.record(Command("add", [expense]))
+        return alerts
+
+    def _insert_expenses(self, expenses: list, save: bool = True) -> list:
+        """
+        Add the expenses to the indexes, the current
+        expenses and the journal.
+        ---------------------------------------
+        -> Params
+            expenses: list of dicts
+            save: bool → False for the expenses which
+                         are already saved by another
+                         instance
+        <- Return
+            list of the budgets alerts
+        """
+        if self.budget_tracker is not None:
+            # the alerts need the whole weeks and months
+            ranges = [get_periods_range(expense["date"]) for expense in expenses]
+            self.load_range(min(start for start, _ in ranges),
+                            max(end for _, end in ranges))
+        # the partitions are loaded first, so the rewritten
+        # partitions have all of their expenses
+        self._add_loaded(self.store.load_dates(expense["date"] for expense in expenses))
+        alerts = list()
+        for expense in expenses:
+            alerts.extend(self._index_expense(expense))
+        if len(expenses) == 1:
+            self.expenses.insert(self._bisect(expenses[0]["date"]), expenses[0])
+        else:
+            # the later ones are first among the same date
+            self.expenses = sort_expenses(expenses[::-1] + self.expenses)
+        self.expenses_changed()
+        if save:
+            self.store.append(expenses)
+        return alerts
+
+    def _remove_expenses(self, expenses: list, save: bool = True) -> None:
+        """
+        Remove the expense objects from the current
+        expenses, the indexes and the journal.
+        @raises
+            ValueError
         """
-        self.expenses.append(expense)
-        self.expenses = sorted(self.expenses,
-                               key=lambda expense: expense["date"])
-        self.expenses.reverse()
-        write_json(self.data_path, self.expenses)
+        if len(expenses) == 1:
+            del self.expenses[self._find_index(expenses[0])]
+        else:
+            removed = {id(expense) for expense in expenses}
+            kept = [expense for expense in self.expenses
+                    if id(expense) not in removed]
+            if len(self.expenses) - len(kept) != len(removed):
+                raise ValueError("Some of the expenses don't exist.")
+            self.expenses = kept
+        for expense in expenses:
+            self._unindex_expense(expense)
+        self.expenses_changed()
+        if save:
+            self.store.delete(expenses)
+
+    def _change_expense(self,
+                        expense: dict,
+                        changes: dict,
+                        save: bool = True) -> None:
+        """
+        Change the values of the expense object and
+        keep its place, indexes and journal updated.
+        @raises
+            ValueError
+        """
+        if "date" in changes:
+            self._add_loaded(self.store.load_dates((changes["date"],)))
+        index = self._find_index(expense)
+        before = dict(expense)
+        self._unindex_expense(expense)
+        del self.expenses[index]
+        expense.update(changes)
+        self._index_expense(expense)
+        # like the added expenses, it's the first of its day
+        self.expenses.insert(self._bisect(expense["date"]), expense)
+        self.expenses_changed()
+        if save:
+            self.store.update(before, changes)
+
+    def _bisect(self, date: datetime, older: bool = False) -> int:
+        """
+        Returns the index of the first expense which
+        its date is not newer than the given date(or
+        older than it). The expenses are sorted newest
+        first.
+        """
+        low, high = 0, len(self.expenses)
+        while low < high:
+            middle = (low + high) // 2
+            value = self.expenses[middle]["date"]
+            if value > date or (older and value == date):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _find_index(self, expense: dict) -> int:
+        """
+        Returns the index of the expense object in
+        the expenses.
+        @raises
+            ValueError
+        """
+        index = self._bisect(expense["date"])
+        while index < len(self.expenses) and \
+              self.expenses[index]["date"] == expense["date"]:
+            if self.expenses[index] is expense:
+                return index
+            index += 1
+        raise ValueError(f"Expense doesn't exist → {expense}")
+
+    def convert_cell(self, expense: dict, key: str, value: str) -> dict:
+        """
+        Convert the edited value of a table cell to
+        the changes of the expense. Overall price
+        follows the price and quantity.
+        ---------------------------------------
+        -> Params
+            expense: dict
+            key: str → one of EXPENSE_KEYS
+            value: str
+        <- Return
+            dict
+        @raises
+            DataValidationFailed
+        """
+        try:
+            if key == "date":
+                value = parse_date(value.strip())
+            elif key == "quantity":
+                value = int(value)
+            elif key in ("price", "overall_price"):
+                value = to_cents(value)
+            else:
+                value = value.strip()
+                if key == "title" and not value:
+                    raise ValueError(value)
+        except ValueError as error:
+            name = key.replace("_", " ").capitalize()
+            raise DataValidationFailed(f"{name} is invalid → {value}") from error
+        changes = {key: value}
+        if key in ("price", "quantity"):
+            values = {**expense, **changes}
+            changes["overall_price"] = values["price"] * values["quantity"]
+        return changes
+
+    @tracer.traced()
+    def update_expense(self, expense: dict, changes: dict) -> None:
+        """
+        Change the values of an expense, update the
+        indexes and save the changes to the journal.
+        ---------------------------------------
+        -> Params
+            expense: dict → object of the expenses
+            changes: dict → {key: new value}
+        @raises
+            ValueError
+        """
+        with self.store.lock:
+            self.sync()
+            previous = {key: expense[key] for key in changes}
+            self._change_expense(expense, changes)
+        self.history.record(Command("update", [expense], changes, previous))
+
+    @tracer.traced()
+    def delete_expense(self, expense: dict) -> None:
+        """
+        Remove an expense, update the indexes and
+        save the removal to the journal.
+        ---------------------------------------
+        -> Params
+            expense: dict → object of the expenses
+        @raises
+            ValueError
+        """
+        with self.store.lock:
+            self.sync()
+            self._remove_expenses([expense])
+        self.history.record(Command("delete", [expense]))
+
+    def _apply(self, command: Command) -> None:
+        """
+        Apply the command on the expenses without
+        recording it, budget alerts aren't shown.
+        """
+        if command.action == "add":
+            self._insert_expenses(command.expenses)
+        elif command.action == "delete":
+            self._remove_expenses(command.expenses)
+        else:
+            self._change_expense(command.expenses[0], command.changes)
+
+    @tracer.traced()
+    def undo(self) -> Command:
+        """
+        Revert the last change of the expenses.
+        ---------------------------------------
+        <- Return
+            Command → the reverted command or None
+                      if there is nothing to undo
+        @raises
+            ValueError
+        """
+        with self.store.lock:
+            self.sync()
+            command = self.history.undo()
+            if command is not None:
+                self._run_history(command.inverse())
+        return command
+
+    @tracer.traced()
+    def redo(self) -> Command:
+        """
+        Apply the last undone change again.
+        ---------------------------------------
+        <- Return
+            Command → the applied command or None
+                      if there is nothing to redo
+        @raises
+            ValueError
+        """
+        with self.store.lock:
+            self.sync()
+            command = self.history.redo()
+            if command is not None:
+                self._run_history(command)
+        return command
+
+    def _run_history(self, command: Command) -> None:
+        """
+        Apply a command of the history, the history
+        is cleared if its expenses don't match the
+        current ones anymore.
+        """
+        try:
+            self._apply(command)
+        except ValueError:
+            self.history.clear()
+            raise
     
-    def get_all_as_table(self) -> Generator:
+    def convert_table_row(self, row: dict) -> dict:
+        """
+        Convert a row of an imported table(keys are
+        the table headers) to an expense.
+        ---------------------------------------
+        -> Params
+            row: dict
+        <- Return
+            dict
+        @raises
+            InvalidFileContentError
+        """
+        values = dict(zip(EXPENSE_KEYS,
+                          (row.get(header) for header in TABLE_HEADERS)))
+        if not values["title"] or values["price"] is None or not values["date"]:
+            raise InvalidFileContentError(
+                f"Title, Price and Date are required → {row}")
+        try:
+            values["price"] = to_cents(values["price"])
+            values["quantity"] = int(values["quantity"] or 1)
+            if values["overall_price"] is None:
+                values["overall_price"] = values["price"] * values["quantity"]
+            else:
+                values["overall_price"] = to_cents(values["overall_price"])
+            if isinstance(values["date"], str):
+                values["date"] = parse_date(values["date"])
+        except (TypeError, ValueError) as error:
+            raise InvalidFileContentError(
+                f"Invalid value in the row → {row}") from error
+        values["title"] = str(values["title"])
+        values["category"] = str(values["category"] or "")
+        return values
+
+    @tracer.traced()
+    def import_expenses(self, rows: Iterable) -> int:
+        """
+        Add the rows of an imported table to the
+        current expenses and save them to file once.
+        ---------------------------------------
+        -> Params
+            rows: Iterable of dicts
+        <- Return
+            int: number of imported expenses
+        """
+        expenses = [self.convert_table_row(row) for row in rows]
+        if not expenses:
+            return 0
+        with self.store.lock:
+            self.sync()
+            self._insert_expenses(expenses)
+        self.history.record(Command("add", expenses))
+        return len(expenses)
+
+    def get_all_as_table(self, format_date: bool = True) -> Generator:
         """
         Convert the expenses from list of dicts
         to list of tuples(values) for saving
-        in csv and excel or sql.
+        in csv and excel or sql, the prices are
+        the amounts.
+        ---------------------------------------
+        -> Params
+            format_date: bool
+                convert the date to string, xlsx
+                keeps it as a typed date cell.
         """
+        self.load_all()
         yield TABLE_HEADERS
+        codec = get_codec()
         for expense in self.expenses:
-            row = list(expense.values())
-            row[-1] = row[-1].strftime(DATE_FORMAT)
+            row = list(to_amounts(expense).values())
+            if format_date:
+                row[-1] = codec.format(row[-1])
             yield row
\ No newline at end of file
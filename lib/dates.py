@@ -0,0 +1,90 @@
+"""
+This module contains the date codec of the shown and
+exported dates. The expenses are dated by days and a
+ledger only has a few thousand distinct days, so each
+day is formatted once for each format, the texts are
+cached by the day ordinals and parsed dates by their
+texts.
+
+@note
+    the formats are formats of days, the time of a
+    date isn't part of its ordinal.
+"""
+from datetime import datetime
+from .constants import DATE_FORMAT
+
+__all__ = ["DateCodec", "get_codec", "format_date", "parse_date"]
+
+
+class DateCodec:
+    """
+    Cached conversions between the dates and the
+    texts of a format.
+    --------------------------------------------
+    @methods
+        format
+        parse
+    """
+
+    def __init__(self, date_format: str) -> None:
+        self.date_format = date_format
+        # day ordinal → text
+        self.texts = dict()
+        # text → date
+        self.dates = dict()
+
+    def format(self, date: datetime) -> str:
+        """
+        Returns the text of the day of the date.
+        """
+        ordinal = date.toordinal()
+        try:
+            return self.texts[ordinal]
+        except KeyError:
+            text = self.texts[ordinal] = date.strftime(self.date_format)
+            return text
+
+    def parse(self, text: str) -> datetime:
+        """
+        Returns the date of the text, the dates
+        are shared so they mustn't be changed.
+        @raises
+            ValueError
+        """
+        try:
+            return self.dates[text]
+        except KeyError:
+            date = self.dates[text] = datetime.strptime(text, self.date_format)
+            return date
+
+
+# format → codec
+CODECS = dict()
+
+
+def get_codec(date_format: str = DATE_FORMAT) -> DateCodec:
+    """
+    Returns the shared codec of the format.
+    """
+    codec = CODECS.get(date_format)
+    if codec is None:
+        codec = CODECS[date_format] = DateCodec(date_format)
+    return codec
+
+
+def format_date(date: datetime, date_format: str = DATE_FORMAT) -> str:
+    """
+    Returns the text of the date in the format,
+    DATE_FORMAT by default.
+    """
+    return get_codec(date_format).format(date)
+
+
+def parse_date(text: str, date_format: str = DATE_FORMAT) -> datetime:
+    """
+    Returns the date of the text in the format,
+    DATE_FORMAT by default.
+    @raises
+        ValueError
+    """
+    return get_codec(date_format).parse(text)
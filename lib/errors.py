@@ -84,4 +84,34 @@ class TableCellNotFoundError(GUIBaseException):
 class InvalidFileContentError(GUIBaseException):
     """
     Raises when the file doesn't have required data.
-    """
\ No newline at end of file
+    """
+
+class InvalidBudgetError(GUIBaseException):
+    """
+    Raises when a budget of the config file
+    is invalid.
+    """
+
+class UnsupportedCompressionError(GUIBaseException):
+    """
+    Raises when a compression codec is unknown
+    or its module isn't installed.
+    """
+
+class StorageLockedError(GUIBaseException):
+    """
+    Raises when another instance of the program
+    holds the lock of the data files for too long.
+    """
+
+class InvalidRequestError(GUIBaseException):
+    """
+    Raises when a request of the query server is
+    malformed or has invalid parameters.
+    """
+
+class RouteNotFoundError(InvalidRequestError):
+    """
+    Raises when the query server doesn't have the
+    requested path or method.
+    """
@@ -0,0 +1,224 @@
+"""
+This module contains the fenwick(binary indexed)
+trees of the spend and number of the expenses per
+day. Total of any date range, overall or for a
+category, is two prefix sums(O(log D), D is the
+number of days) and adding an expense updates the
+trees of its day in O(log D).
+"""
+from datetime import datetime
+from typing import Iterable
+
+__all__ = ["FenwickTree", "DailyTotals"]
+
+# days which are reserved before the first expense,
+# so older expenses don't rebuild the trees each time.
+MARGIN_DAYS = 365
+
+
+class FenwickTree:
+    """
+    Prefix sums over the indexes 0..size-1 with
+    point updates.
+    --------------------------------------------
+    @methods
+        from_values
+        add
+        grow
+        prefix
+        range_sum
+        get_values
+    """
+    __slots__ = ("tree",)
+
+    def __init__(self, size: int = 0) -> None:
+        # tree[0] is unused, the indexes start from 1
+        self.tree = [0] * (size + 1)
+
+    def __len__(self) -> int:
+        return len(self.tree) - 1
+
+    @classmethod
+    def from_values(cls, values: list) -> object:
+        """
+        Create the tree from the values in O(n).
+        """
+        tree = cls()
+        tree.tree = [0] + list(values)
+        size = len(values)
+        for index in range(1, size + 1):
+            parent = index + (index & -index)
+            if parent <= size:
+                tree.tree[parent] += tree.tree[index]
+        return tree
+
+    def add(self, index: int, value: int) -> None:
+        """
+        Add the value to the index.
+        """
+        tree = self.tree
+        size = len(tree)
+        index += 1
+        while index < size:
+            tree[index] += value
+            index += index & -index
+
+    def grow(self, size: int) -> None:
+        """
+        Add zero values to the end of the tree to
+        have the given size. New nodes only cover
+        the old values which are before them.
+        """
+        old_size = len(self)
+        if size <= old_size:
+            return
+        total = self.prefix(old_size - 1)
+        for index in range(old_size + 1, size + 1):
+            start = index - (index & -index)
+            if start < old_size:
+                self.tree.append(total - self.prefix(start - 1))
+            else:
+                self.tree.append(0)
+
+    def prefix(self, index: int) -> int:
+        """
+        Sum of the values of 0..index.
+        """
+        tree = self.tree
+        index = min(index + 1, len(tree) - 1)
+        total = 0
+        while index > 0:
+            total += tree[index]
+            index -= index & -index
+        return total
+
+    def range_sum(self, start: int, end: int) -> int:
+        """
+        Sum of the values of start..end.
+        """
+        if end < start:
+            return 0
+        return self.prefix(end) - self.prefix(start - 1)
+
+    def get_values(self) -> list:
+        """
+        Returns the value of each index.
+        """
+        return [self.range_sum(index, index) for index in range(len(self))]
+
+
+class DailyTotals:
+    """
+    Spend and number of the expenses per day,
+    overall and per category.
+    --------------------------------------------
+    @methods
+        build
+        add
+        remove
+        query
+    """
+
+    def __init__(self) -> None:
+        # ordinal of the index 0 of the trees
+        self.origin = None
+        self.size = 0
+        # category(None for all) → (spend tree, count tree)
+        self.trees = dict()
+
+    def build(self, expenses: Iterable) -> None:
+        """
+        Create the trees from the expenses.
+        """
+        expenses = list(expenses)
+        self.trees = dict()
+        if not expenses:
+            self.origin = None
+            self.size = 0
+            return
+        ordinals = [expense["date"].toordinal() for expense in expenses]
+        self.origin = min(ordinals) - MARGIN_DAYS
+        self.size = max(ordinals) - self.origin + 1
+        values = dict()
+        for ordinal, expense in zip(ordinals, expenses):
+            index = ordinal - self.origin
+            for category in (None, expense["category"]):
+                if category not in values:
+                    values[category] = ([0] * self.size, [0] * self.size)
+                spends, counts = values[category]
+                spends[index] += expense["overall_price"]
+                counts[index] += 1
+        self.trees = {category: (FenwickTree.from_values(spends),
+                                 FenwickTree.from_values(counts))
+                      for category, (spends, counts) in values.items()}
+
+    def _move_origin(self, ordinal: int) -> None:
+        """
+        Rebuild the trees to start from an older
+        day.
+        """
+        origin = ordinal - MARGIN_DAYS
+        padding = [0] * (self.origin - origin)
+        for category, trees in self.trees.items():
+            self.trees[category] = tuple(
+                FenwickTree.from_values(padding + tree.get_values())
+                for tree in trees)
+        self.size += len(padding)
+        self.origin = origin
+
+    def add(self, expense: dict) -> None:
+        """
+        Add the expense to the trees of its day.
+        """
+        self._update(expense, 1)
+
+    def remove(self, expense: dict) -> None:
+        """
+        Remove the expense from the trees of its day.
+        """
+        self._update(expense, -1)
+
+    def _update(self, expense: dict, sign: int) -> None:
+        """
+        Add the price and count of the expense
+        multiplied by the sign to the trees.
+        """
+        ordinal = expense["date"].toordinal()
+        if self.origin is None:
+            self.origin = ordinal - MARGIN_DAYS
+        elif ordinal < self.origin:
+            self._move_origin(ordinal)
+        index = ordinal - self.origin
+        self.size = max(self.size, index + 1)
+        for category in (None, expense["category"]):
+            trees = self.trees.get(category)
+            if trees is None:
+                trees = self.trees[category] = (FenwickTree(), FenwickTree())
+            spends, counts = trees
+            spends.grow(self.size)
+            counts.grow(self.size)
+            spends.add(index, sign * expense["overall_price"])
+            counts.add(index, sign)
+
+    def query(self,
+              from_date: datetime,
+              to_date: datetime,
+              category: str = None) -> tuple:
+        """
+        Returns the spend and number of expenses
+        of the date range.
+        ---------------------------------------
+        -> Params
+            from_date: datetime
+            to_date: datetime
+            category: str → None for all categories
+        <- Return
+            tuple → (total price in cents, total items)
+        """
+        trees = self.trees.get(category)
+        if trees is None:
+            return 0, 0
+        start = max(from_date.toordinal() - self.origin, 0)
+        end = to_date.toordinal() - self.origin
+        spends, counts = trees
+        return spends.range_sum(start, end), counts.range_sum(start, end)
@@ -0,0 +1,123 @@
+"""
+This module contains the history of the changes of
+the expenses for undo and redo. Each change is kept
+as a command which knows its inverse(add ↔ delete,
+update with the previous values), so undoing and
+redoing apply a single change instead of reloading
+the expenses.
+
+@note
+    the commands keep the expense objects, editing
+    and re-adding keep the same objects, so the older
+    commands still point to the right expenses.
+"""
+from collections import deque
+
+__all__ = ["Command", "CommandHistory"]
+
+
+class Command:
+    """
+    A change of the expenses.
+    --------------------------------------------
+    @methods
+        inverse
+        describe
+    """
+    __slots__ = ("action", "expenses", "changes", "previous")
+
+    def __init__(self,
+                 action: str,
+                 expenses: list,
+                 changes: dict = None,
+                 previous: dict = None) -> None:
+        """
+        ---------------------------------
+        -> Params
+            action: str → add, delete, update
+            expenses: list of dicts
+            changes: dict → new values of update
+            previous: dict → old values of update
+        """
+        self.action = action
+        self.expenses = expenses
+        self.changes = changes
+        self.previous = previous
+
+    def inverse(self) -> object:
+        """
+        Returns the command which reverts this one.
+        """
+        if self.action == "update":
+            return Command("update", self.expenses, self.previous, self.changes)
+        action = "delete" if self.action == "add" else "add"
+        return Command(action, self.expenses)
+
+    def describe(self) -> str:
+        """
+        Returns a short text of the command for
+        the messages.
+        """
+        if len(self.expenses) > 1:
+            return f"{self.action} of {len(self.expenses)} expenses"
+        return f"{self.action} of {self.expenses[0]['title']}"
+
+
+class CommandHistory:
+    """
+    Bounded undo and redo stacks of commands.
+    --------------------------------------------
+    @methods
+        record
+        undo
+        redo
+        clear
+    """
+
+    def __init__(self, limit: int) -> None:
+        """
+        ---------------------------------
+        -> Params
+            limit: int → number of the kept commands,
+                         the oldest ones are dropped
+        """
+        self.undo_stack = deque(maxlen=limit)
+        self.redo_stack = deque(maxlen=limit)
+
+    def record(self, command: Command) -> None:
+        """
+        Add a new command, the undone commands
+        can't be redone after it.
+        """
+        self.undo_stack.append(command)
+        self.redo_stack.clear()
+
+    def undo(self) -> Command:
+        """
+        Returns the last command to revert it or
+        None if there is nothing to undo.
+        """
+        if not self.undo_stack:
+            return None
+        command = self.undo_stack.pop()
+        self.redo_stack.append(command)
+        return command
+
+    def redo(self) -> Command:
+        """
+        Returns the last undone command to apply
+        it again or None if there is nothing to
+        redo.
+        """
+        if not self.redo_stack:
+            return None
+        command = self.redo_stack.pop()
+        self.undo_stack.append(command)
+        return command
+
+    def clear(self) -> None:
+        """
+        Remove all the commands.
+        """
+        self.undo_stack.clear()
+        self.redo_stack.clear()
@@ -14,12 +14,23 @@ from .widgets import DateEntry
 class AddExpenseFrame(Frame):
 
     def __init__(self,
-                 add_expense_callback: Callable):
+                 add_expense_callback: Callable,
+                 complete: Callable = None):
+        """
+        -> Params
+            add_expense_callback: Callable
+            complete: Callable → takes the key and the
+                                 typed text, returns the
+                                 suggestions of the title
+                                 and category entries
+        """
         super().__init__(layout=Vertical)
         self.setObjectName("add-expense-frame")
         self.setup_frame()
 
         self.init_widgets(add_expense_callback=add_expense_callback)
+        if complete is not None:
+            self.set_completions(complete)
 
     def setup_frame(self) -> None:
         """
@@ -42,7 +53,7 @@ class AddExpenseFrame(Frame):
                                 validator="string",
                                 object_name="entry")
         self.price = LabelEntry(label="PRICE",
-                                validator="decimal",
+                                validator="money",
                                 callback_func=self.set_overall_callback,
                                 object_name="entry")
         self.quantity = LabelEntry(label="QUANTITY",
@@ -53,7 +64,7 @@ class AddExpenseFrame(Frame):
         self.overall_price = LabelEntry(label="OVERALL PRICE",
                                         default_value=0,
                                         editable=False,
-                                        validator="decimal",
+                                        validator="money",
                                         object_name="entry")
         self.category = LabelEntry(label="CATEGORY",
                                    validator="string",
@@ -68,11 +79,19 @@ class AddExpenseFrame(Frame):
                                          callback_function=add_expense_callback,
                                          width=270)
 
+    def set_completions(self, complete: Callable) -> None:
+        """
+        Suggest the used titles and categories
+        """
+        self.title.set_completion(lambda text: complete("title", text))
+        self.category.set_completion(lambda text: complete("category", text))
+
     def set_overall_callback(self) -> None:
         """
         Collects quantity and price values
         to calculate the overall price and
-        set it to overall price widget.
+        set it to overall price widget, the
+        prices are cents.
         """
         price = self.price.get_value() or 0
         quantity = self.quantity.get_value() or 1
@@ -15,10 +15,20 @@ from .widgets import Button
 from .widgets import QGraphicsDropShadowEffect
 from .widgets import QColor
 from .widgets import HorizontalTable
+from .widgets import MessageBox
+from .widgets import QTimer
+from .utils import log
 from lib.constants import TABLE_HEADERS
+from lib.constants import EXPENSE_KEYS
 from lib.constants import DOLLAR_ICON_PATH
 from lib.constants import ITEMS_ICON_PATH
 from lib.data_handler import DataHandler
+from lib.money import format_money
+from lib.dates import format_date
+from lib.settings import Settings
+from lib.errors import DataValidationFailed
+from lib.errors import StorageLockedError
+from lib.tracing import tracer
 
 class IllustrationFrame(Frame):
     """
@@ -28,13 +38,22 @@ class IllustrationFrame(Frame):
     """
     def __init__(self,
                  data_handler: DataHandler,
-                 configs: dict) -> None:
+                 configs: Settings) -> None:
         super().__init__(layout=Vertical)
         self.data_handler = data_handler
         self.setObjectName("illustration-frame")
         self.setup_frame()
         self.is_show_details = False
-        self.init_widgets(data_handler.get_all(),
+        # maximum rows of the table
+        self.display_count = configs.get("illustration_count", 100)
+        # the table shows the latest expenses until a filter changes
+        self.is_latest = True
+        # clicked column of the table, None for newest first
+        self.sort_column = None
+        self.sort_descending = False
+        # date range and changes count of the analytics panel
+        self.analytics_key = None
+        self.init_widgets(data_handler.get_latest(),
                           configs)
 
     def setup_frame(self) -> None:
@@ -51,7 +70,7 @@ class IllustrationFrame(Frame):
 
     def init_widgets(self,
                      all_expenses: list,
-                     configs: dict) -> None:
+                     configs: Settings) -> None:
         """
         Initializes the widgets.
         """
@@ -59,17 +78,27 @@ class IllustrationFrame(Frame):
             self.illustration_filters_callback,
             configs)
         self.add_stretch()
-        self.table = HorizontalTable(editable=True, min_height=500)
-        self.table.insert_data(TABLE_HEADERS, all_expenses)
+        self.table = HorizontalTable(editable=True,
+                                     min_height=500,
+                                     edit_callback=self.table_edit_callback,
+                                     formatters={1: format_money, 3: format_money})
+        self.table.menu.add_action("", "DELETE", self.delete_expense_callback)
+        self.table.set_sort_callback(self.sort_callback)
+        self.table.insert_data(TABLE_HEADERS, all_expenses[:self.display_count])
+        # expenses of the table rows
+        self.shown_expenses = all_expenses
         self.illustration_detail = IlusstrationDetailsFrame(self.data_handler,
                                                             all_expenses)
         self.illustration_detail.setVisible(self.is_show_details)
         self.add_stretch()
         total_price = self.data_handler.get_total_price(all_expenses)
         total_items = len(all_expenses)
-        self.illustration_summary = IllustrationSummaryFrame(total_price,
-                                                             total_items,
-                                                             self.show_overall_detail_callback)
+        self.footer = Frame(layout=Horizontal)
+        self.footer.illustration_summary = IllustrationSummaryFrame(total_price,
+                                                                    total_items,
+                                                                    self.show_overall_detail_callback)
+        self.footer.illustration_analytics = IllustrationAnalyticsFrame()
+        self.update_analytics(self.illustration_filter.get_filters())
 
     def illustration_filters_callback(self) -> None:
         """
@@ -77,16 +106,180 @@ class IllustrationFrame(Frame):
         in the IllustrationFiltersFrame to filter
         the data based on the user inputs.
         """
-        values = self.illustration_filter.get_filters()
-        expenses = self.data_handler.filter_data(filters=values)
-        self.table.clear()
-        self.table.insert_data(TABLE_HEADERS, expenses)
-        self.illustration_detail.init_widgets(expenses)
+        with tracer.span("IllustrationFrame.illustration_filters_callback"):
+            values = self.illustration_filter.get_filters()
+            # filter_data pops the dates
+            filters = dict(values)
+            self.update_analytics(values)
+            expenses = self.sort_expenses(self.data_handler.filter_data(filters=values))
+            self.table.clear()
+            self.table.insert_data(TABLE_HEADERS, expenses[:self.display_count])
+            self.shown_expenses = expenses
+            self.is_latest = False
+            self.illustration_detail.init_widgets(expenses)
 
-        total_price = self.data_handler.get_total_price(expenses)
-        total_items = len(expenses)
-        self.illustration_summary.update_summary(total_price, total_items)
+            with tracer.span("IllustrationSummaryFrame.update_summary"):
+                summary = self.data_handler.get_range_summary(filters)
+                if summary is None:
+                    summary = (self.data_handler.get_total_price(expenses),
+                               len(expenses))
+                total_price, total_items = summary
+                self.footer.illustration_summary.update_summary(total_price, total_items)
+
+    def set_display_count(self, display_count: int) -> None:
+        """
+        Change the maximum rows of the table, only
+        the removed or added rows change. The latest
+        expenses view shows the expenses which the
+        data handler loaded for the new count.
+        """
+        with tracer.span("IllustrationFrame.set_display_count"):
+            self.display_count = display_count
+            shown_rows = self.table.rowCount()
+            if self.is_latest:
+                expenses = self.sort_expenses(self.data_handler.get_latest())
+                kept = min(shown_rows, display_count, len(expenses))
+                if any(old is not new for old, new in
+                       zip(self.shown_expenses[:kept], expenses[:kept])):
+                    # an older range was loaded by a filter, the
+                    # new expenses aren't only after the shown ones
+                    shown_rows = 0
+                    self.table.truncate(0)
+                self.shown_expenses = expenses
+                self.illustration_detail.init_widgets(expenses)
+                self.footer.illustration_summary.update_summary(
+                    self.data_handler.get_total_price(expenses),
+                    len(expenses))
+            if display_count < shown_rows:
+                self.table.truncate(display_count)
+            else:
+                self.table.append_data(self.shown_expenses[shown_rows:display_count])
+
+    def sort_callback(self, column: int) -> None:
+        """
+        Sort the shown expenses by the clicked
+        column, clicking it again reverses the
+        order.
+        """
+        with tracer.span("IllustrationFrame.sort_callback"):
+            if column == self.sort_column:
+                self.sort_descending = not self.sort_descending
+            else:
+                self.sort_column = column
+                self.sort_descending = False
+            self.shown_expenses = self.sort_expenses(self.shown_expenses)
+            self.table.insert_data(TABLE_HEADERS,
+                                   self.shown_expenses[:self.display_count])
+
+    def sort_expenses(self, expenses: list) -> list:
+        """
+        Returns the expenses in the order of the
+        sorted column, only the rows are sorted by
+        the cached orders of the data handler.
+        """
+        self.table.set_sort_indicator(self.sort_column, self.sort_descending)
+        if self.sort_column is None:
+            return expenses
+        rows = self.data_handler.sort_rows(expenses,
+                                           EXPENSE_KEYS[self.sort_column],
+                                           self.sort_descending)
+        return [expenses[row] for row in rows]
+
+    def update_analytics(self, filters: dict, force: bool = False) -> None:
+        """
+        Update the analytics panel for the date
+        range of the filters. The title and category
+        filters don't change it, so it's computed
+        again only when the range or the expenses
+        change.
+        """
+        key = (filters["from_date"], filters["to_date"])
+        if not force and self.analytics_key == (*key, self.data_handler.changes_count):
+            return
+        with tracer.span("IllustrationAnalyticsFrame.update_analytics"):
+            report = self.data_handler.get_spend_report(filters["from_date"],
+                                                        filters["to_date"])
+            self.footer.illustration_analytics.update_analytics(report)
+            statuses = self.data_handler.get_budget_statuses(filters["to_date"])
+            self.footer.illustration_analytics.update_budgets(statuses)
+        # the report can load the older expenses of the range
+        self.analytics_key = (*key, self.data_handler.changes_count)
+
+    def refresh_analytics(self) -> None:
+        """
+        Update the analytics panel after changing
+        the budgets.
+        """
+        self.update_analytics(self.illustration_filter.get_filters(), force=True)
     
+    def table_edit_callback(self,
+                            row: int,
+                            column: int,
+                            table_number: int) -> None:
+        """
+        Save the edited cell of the table to the
+        expense. The table is refreshed after the
+        signal, so the order, totals and invalid
+        values are shown correctly.
+        """
+        expense = self.shown_expenses[row]
+        value = self.table.item(row, column).text()
+        try:
+            with tracer.span("IllustrationFrame.table_edit_callback"):
+                changes = self.data_handler.convert_cell(expense,
+                                                         EXPENSE_KEYS[column],
+                                                         value)
+                self.data_handler.update_expense(expense, changes)
+        except (DataValidationFailed, StorageLockedError) as error:
+            log(error, error=error, level=2, color="red")
+            MessageBox(self,
+                       "high",
+                       title="Error",
+                       message=error)
+        except ValueError as error:
+            self.show_missing_expense(error)
+        QTimer.singleShot(0, self.illustration_filters_callback)
+
+    def delete_expense_callback(self) -> None:
+        """
+        Delete the expense of the selected row
+        after the user confirms it.
+        """
+        row = self.table.currentRow()
+        if not 0 <= row < len(self.shown_expenses):
+            return
+        expense = self.shown_expenses[row]
+        message = MessageBox(self,
+                             None,
+                             title="Delete",
+                             message=f"Delete {expense['title']} of "
+                                     f"{format_date(expense['date'], '%Y-%m-%d')}?")
+        if not message.get_answer():
+            return
+        try:
+            with tracer.span("IllustrationFrame.delete_expense_callback"):
+                self.data_handler.delete_expense(expense)
+        except StorageLockedError as error:
+            log(error, error=error, level=2, color="red")
+            MessageBox(self,
+                       "high",
+                       title="Error",
+                       message=error)
+        except ValueError as error:
+            self.show_missing_expense(error)
+        self.illustration_filters_callback()
+
+    def show_missing_expense(self, error: ValueError) -> None:
+        """
+        Show the expense of the table isn't in the
+        expenses anymore(e.g. another window deleted it).
+        """
+        log(error, error=error, level=2, color="red")
+        MessageBox(self,
+                   "high",
+                   title="Error",
+                   message="The expense is changed by another window.")
+
     def show_overall_detail_callback(self) -> None:
         """
         This is a callback method for button in
@@ -106,14 +299,14 @@ class IllustrationFiltersFrame(Frame):
 
     def __init__(self,
                  filters_callback: Callable,
-                 configs: dict) -> None:
+                 configs: Settings) -> None:
         super().__init__(layout=Horizontal)
 
         self.init_widgets(filters_callback, configs)
     
     def init_widgets(self,
                      filters_callback: Callable,
-                     configs: dict) -> None:
+                     configs: Settings) -> None:
         """
         Initializes the widgets.
         """
@@ -137,6 +330,13 @@ class IllustrationFiltersFrame(Frame):
                                    object_name="entry",
                                    callback_func=filters_callback)
 
+    def set_from_date(self, from_date: datetime) -> None:
+        """
+        Change the from date, the expenses are
+        filtered again by the date signal.
+        """
+        self.from_date.date_entry.setDateTime(from_date)
+
     def get_filters(self) -> dict:
         """
         Returns the widgets values. Check if
@@ -165,6 +365,7 @@ class IlusstrationDetailsFrame(Frame):
         self.setMinimumHeight(500)
         self.init_widgets(expenses)
 
+    @tracer.traced()
     def init_widgets(self,
                      expenses: list) -> None:
         """
@@ -208,7 +409,7 @@ class IllustrationDetailFrame(Frame):
         """
         Initializes the widgets.
         """
-        string_date = date.strftime("%Y-%m-%d / %a")
+        string_date = format_date(date, "%Y-%m-%d / %a")
         self.date = Label(string_date,
                           object_name="expense-detail-date")
         self.container = Frame(layout=Horizontal)
@@ -238,11 +439,96 @@ class IllustrationDetailCard(Frame):
             expense: dict
         """
         self.title = Label(expense["title"][:14], object_name="expense-card-label")
-        self.price = Label(expense["price"], object_name="expense-card-label")
+        self.price = Label(format_money(expense["price"]), object_name="expense-card-label")
         self.quantity = Label(expense["quantity"], object_name="expense-card-label")
-        self.overall_price = Label(expense["overall_price"], object_name="expense-card-label")
+        self.overall_price = Label(format_money(expense["overall_price"]), object_name="expense-card-label")
         self.category = Label(expense["category"], object_name="expense-card-label")
 
+class IllustrationAnalyticsFrame(Frame):
+    """
+    This class contains widgets to show the
+    rolling spend, average spend per day and
+    the change from the previous month.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(layout=Horizontal)
+        self.init_widgets()
+
+    def init_widgets(self) -> None:
+        """
+        Initialize the widgets
+        """
+        self.last_week = Label("", object_name="analytics-label")
+        self.last_month = Label("", object_name="analytics-label")
+        self.average = Label("", object_name="analytics-label")
+        self.month_change = Label("", object_name="analytics-label")
+        self.budget = Label("", object_name="analytics-label")
+        self.budget.setVisible(False)
+
+    def update_analytics(self, report: dict) -> None:
+        """
+        Update the widgets values.
+        ---------------------------------------
+        -> Params
+            report: dict → see SpendAnalytics.report
+        """
+        if report is None:
+            for label in (self.last_week, self.last_month,
+                          self.average, self.month_change):
+                label.change_text("-")
+                label.setToolTip("")
+            return
+        last_week = format_money(report["rolling"][7][-1], grouping=True)
+        last_month = format_money(report["rolling"][30][-1], grouping=True)
+        average = format_money(round(report["moving_average"][30][-1]), grouping=True)
+        self.last_week.change_text(f"7 DAYS ${last_week}")
+        self.last_month.change_text(f"30 DAYS ${last_month}")
+        self.average.change_text(f"AVG/DAY ${average}")
+
+        current = report["monthly"][:, -1]
+        delta = report["monthly_delta"][:, -1]
+        previous = float((current - delta).sum())
+        change = f"{float(delta.sum()) / previous:+.1%}" if previous else "-"
+        month = report["months"][-1]
+        self.month_change.change_text(f"{month} {change}")
+        lines = list()
+        for index in (-abs(delta)).argsort():
+            if not current[index] and not delta[index]:
+                continue
+            sign = "-" if delta[index] < 0 else "+"
+            lines.append(f"{report['categories'][index]}: "
+                         f"${format_money(current[index], grouping=True)} "
+                         f"({sign}{format_money(abs(delta[index]), grouping=True)})")
+        self.month_change.setToolTip("\n".join(lines))
+
+    def update_budgets(self, statuses: list) -> None:
+        """
+        Show the most used budget and the others
+        in the tooltip.
+        ---------------------------------------
+        -> Params
+            statuses: list → see BudgetTracker.get_status
+        """
+        self.budget.setVisible(bool(statuses))
+        if not statuses:
+            return
+        statuses = sorted(statuses, key=lambda status: status["ratio"], reverse=True)
+        top = statuses[0]
+        self.budget.change_text(f"BUDGET {top['ratio']:.0%}")
+        # same colors as change_widget_status
+        if top["ratio"] >= 1:
+            self.budget.setStyleSheet("color:#ff0048;")
+        elif top["ratio"] >= 0.8:
+            self.budget.setStyleSheet("color:#ffae00;")
+        else:
+            self.budget.setStyleSheet("")
+        self.budget.setToolTip("\n".join(
+            f"{status['category'] or 'Overall'} {status['period']}: "
+            f"${format_money(status['spent'], grouping=True)} / "
+            f"${format_money(status['limit'], grouping=True)}"
+            for status in statuses))
+
 class IllustrationSummaryFrame(Frame):
     """
     This class contains widgets to show
@@ -251,7 +537,7 @@ class IllustrationSummaryFrame(Frame):
     """
 
     def __init__(self,
-                 total_price: float,
+                 total_price: int,
                  total_items: int,
                  show_overall_detail_callback: Callable) -> None:
         super().__init__(layout=Horizontal)
@@ -261,14 +547,14 @@ class IllustrationSummaryFrame(Frame):
                           show_overall_detail_callback)
     
     def init_widgets(self,
-                     total_price: float,
+                     total_price: int,
                      total_items: int,
                      show_overall_detail_callback: Callable) -> None:
         """
         Initialize the widgets
         ---------------------------------------
         -> Params
-            total_price: float,
+            total_price: int,
             total_items: int
         """
         self.total_price_icon = Label("")
@@ -291,14 +577,14 @@ class IllustrationSummaryFrame(Frame):
         self.update_summary(total_price, total_items)
     
     def update_summary(self,
-                       total_price: float,
+                       total_price: int,
                        total_items: int) -> None:
         """
         Update the widgets values.
         ---------------------------------------
         -> Params
-            total_price: float,
+            total_price: int,
             total_items: int
         """
-        self.total_price.change_text(f"TOTAL PRICE ${'{:,}'.format(total_price)}")
+        self.total_price.change_text(f"TOTAL PRICE ${format_money(total_price, grouping=True)}")
         self.total_items.change_text(f"TOTAL ITEMS {total_items}")
\ No newline at end of file
@@ -1,24 +1,35 @@
 
 
+import os
+from os.path import join
 from datetime import datetime
 from .widgets import Frame
 from .widgets import Horizontal
 from .widgets import MessageBox
 from .widgets import QFileDialog
-from .utils import load_json
-from .utils import write_json
+from .widgets import QFileSystemWatcher
+from .widgets import QTimer
 from .utils import write_csv
 from .utils import log
 from .add_expense_frame import AddExpenseFrame
 from .illustration_frame import IllustrationFrame
 from .tools_frame import ToolsFrame
-from lib.constants import EXPENSES_FILE_PATH
+from lib.constants import EXPENSES_DIR_PATH
 from lib.constants import CONFIGS_FILE_PATH
-from lib.constants import DATE_FORMAT
 from lib.constants import TABLE_HEADERS
+from lib.constants import SYNC_DELAY
 from lib.errors import DataValidationFailed
+from lib.errors import InvalidFileContentError
+from lib.errors import InvalidBudgetError
+from lib.errors import StorageLockedError
 from lib.data_handler import DataHandler
-from lib.tools.excel_handler import ExcelHandler
+from lib.money import format_money
+from lib.dates import format_date
+from lib.settings import Settings
+from lib.tracing import tracer
+from lib.tools.xlsx_handler import XlsxWriter
+from lib.tools.xlsx_handler import XlsxReader
+from lib.tools.xlsx_handler import XlsxHandlerBaseException
 
 
 class MainFrame(Frame):
@@ -31,34 +42,149 @@ class MainFrame(Frame):
         super().__init__(layout=Horizontal)
         self.setContentsMargins(5, 5, 5, 5)
 
-        self.configs = self.load_configs()
-        self.data_handler = data_handler(EXPENSES_FILE_PATH,
-                                        self.configs.get("illustration_count", 100))
+        self.settings = Settings(CONFIGS_FILE_PATH)
+        if self.settings.get("log_file"):
+            log.set_output_file(self.settings.get("log_file"))
+        self.data_handler = data_handler(EXPENSES_DIR_PATH,
+                                        self.settings.get("illustration_count", 100))
+        self.set_budgets()
 
-        self.add_expense_frame = AddExpenseFrame(add_expense_callback=self.add_expense_callback)
+        self.add_expense_frame = AddExpenseFrame(add_expense_callback=self.add_expense_callback,
+                                                 complete=self.data_handler.complete)
 
         self.illustration_frame = IllustrationFrame(self.data_handler,
-                                                    self.configs)
+                                                    self.settings)
         
-        illustration_count = self.configs.get("illustration_count", 100)
-        default_date = self.configs.get("default_from_date",
-                                        datetime(year=2023, month=1, day=1))
+        illustration_count = self.settings.get("illustration_count", 100)
+        default_date = self.settings.get("default_from_date",
+                                         datetime(year=2023, month=1, day=1))
         self.tools_frame = ToolsFrame(illustration_count,
                                       default_date,
                                       self.update_configs,
                                       self.export_excel,
-                                      self.export_csv)
+                                      self.export_csv,
+                                      self.import_excel)
         self.add_stretch()
+        self.subscribe_settings()
+        self.watch_data()
 
-    def load_configs(self) -> dict:
+    def subscribe_settings(self) -> None:
         """
-        Loads the config file.
+        Apply the changed settings of the tools
+        frame or the config file without restarting.
+        """
+        self.settings.subscribe("illustration_count", self.set_illustration_count)
+        self.settings.subscribe("default_from_date", self.set_default_from_date)
+        self.settings.subscribe("budgets", self.budgets_changed)
+        self.settings.subscribe("log_file", log.set_output_file)
+
+    def set_illustration_count(self, count: int) -> None:
+        """
+        Load the missing latest expenses of a bigger
+        count and show or hide the table rows.
+        """
+        with tracer.span("MainFrame.set_illustration_count"):
+            self.data_handler.set_expenses_count(count)
+            self.illustration_frame.set_display_count(count)
+            if self.tools_frame.illustration_count.get_value() != count:
+                self.tools_frame.illustration_count.set_value(str(count))
+
+    def set_default_from_date(self, from_date: datetime) -> None:
+        """
+        Filter the expenses from the new default
+        date, only the partitions of the new range
+        are loaded.
+        """
+        self.tools_frame.default_from_date.date_entry.setDateTime(from_date)
+        self.illustration_frame.illustration_filter.set_from_date(from_date)
+
+    def watch_data(self) -> None:
+        """
+        Watch the data files to show the changes of
+        the other windows, the events are collected
+        for a short time since a write changes a few
+        files.
+        """
+        self.sync_timer = QTimer(self)
+        self.sync_timer.setSingleShot(True)
+        self.sync_timer.setInterval(SYNC_DELAY)
+        self.sync_timer.timeout.connect(self.sync_data)
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.fileChanged.connect(self.sync_timer.start)
+        self.watcher.directoryChanged.connect(self.sync_timer.start)
+        self.update_watch_paths()
+
+    def update_watch_paths(self) -> None:
+        """
+        Add the data files to the watcher, the replaced
+        files(atomic writes) aren't watched anymore and
+        the new files must be added.
+        """
+        paths = [path for path in self.data_handler.store.get_watch_paths() + [self.settings.path]
+                 if os.path.exists(path)]
+        watched = set(self.watcher.files() + self.watcher.directories())
+        paths = [path for path in paths if path not in watched]
+        if paths:
+            self.watcher.addPaths(paths)
+
+    def sync_data(self) -> None:
+        """
+        Read the changes of the other windows and
+        refresh the illustrations if there is any.
+        """
+        try:
+            with tracer.span("MainFrame.sync_data"):
+                self.settings.reload()
+                changed = self.data_handler.sync()
+                self.update_watch_paths()
+                if changed:
+                    self.illustration_frame.illustration_filters_callback()
+        except StorageLockedError as error:
+            # the other window is still writing
+            log(error, level=1)
+            self.sync_timer.start()
+
+    def budgets_changed(self, budgets: list) -> None:
+        """
+        Apply the changed budgets of the config
+        file to the analytics panel.
+        """
+        self.set_budgets()
+        self.illustration_frame.refresh_analytics()
+
+    def set_budgets(self) -> None:
+        """
+        Set the budgets of the config file to the
+        data handler.
         """
         try:
-            return load_json(CONFIGS_FILE_PATH)
-        except FileNotFoundError:
-            return dict()
+            self.data_handler.set_budgets(self.settings.get("budgets", []))
+        except InvalidBudgetError as error:
+            log(error, error=error, level=2, color="red")
+            MessageBox(self,
+                       "high",
+                       title="Error",
+                       message=error)
 
+    def show_budget_alerts(self, alerts: list) -> None:
+        """
+        Show the budgets which passed one of their
+        alert levels by the added expense.
+        """
+        if not alerts:
+            return
+        lines = list()
+        for alert in alerts:
+            name = alert["category"] or "Overall"
+            lines.append(f"{name} {alert['period']} budget: "
+                         f"${format_money(alert['spent'], grouping=True)} of "
+                         f"${format_money(alert['limit'], grouping=True)} "
+                         f"({alert['ratio']:.0%})")
+        level = "high" if max(alert["ratio"] for alert in alerts) >= 1 else "medium"
+        MessageBox(self,
+                   level,
+                   title="Budget",
+                   message="\n".join(lines))
 
     def add_expense_callback(self) -> None:
         """
@@ -67,11 +193,13 @@ class MainFrame(Frame):
         save the exense.
         """
         try:
-            self.add_expense_frame.validate_widgets()
-            values = self.add_expense_frame.get_values()
-            self.data_handler.add_expense(values)
-            self.illustration_frame.illustration_filters_callback()
-        except DataValidationFailed as error:
+            with tracer.span("MainFrame.add_expense_callback"):
+                self.add_expense_frame.validate_widgets()
+                values = self.add_expense_frame.get_values()
+                alerts = self.data_handler.add_expense(values)
+                self.illustration_frame.illustration_filters_callback()
+            self.show_budget_alerts(alerts)
+        except (DataValidationFailed, StorageLockedError) as error:
             log(error, error=error, level=2, color="red")
             error = str(error).replace("_", " ")
             MessageBox(self,
@@ -79,6 +207,44 @@ class MainFrame(Frame):
                        title="Error",
                        message=error)
     
+    def undo_callback(self) -> None:
+        """
+        Revert the last change of the expenses and
+        refresh the illustrations.
+        """
+        self.run_history(self.data_handler.undo, "Undo")
+
+    def redo_callback(self) -> None:
+        """
+        Apply the last undone change again and
+        refresh the illustrations.
+        """
+        self.run_history(self.data_handler.redo, "Redo")
+
+    def run_history(self, function: callable, name: str) -> None:
+        """
+        Run the undo or redo of the data handler.
+        """
+        try:
+            with tracer.span(f"MainFrame.{name.lower()}_callback"):
+                command = function()
+                if command is None:
+                    return
+                self.illustration_frame.illustration_filters_callback()
+            log(f"{name} → {command.describe()}", color="cyan")
+        except ValueError as error:
+            log(error, error=error, level=2, color="red")
+            MessageBox(self,
+                       "high",
+                       title="Error",
+                       message=f"{name} failed, the history is cleared.")
+        except StorageLockedError as error:
+            log(error, error=error, level=2, color="red")
+            MessageBox(self,
+                       "high",
+                       title="Error",
+                       message=error)
+
     def update_configs(self) -> None:
         """
         This method is for updating the config file
@@ -86,10 +252,8 @@ class MainFrame(Frame):
         """
         try:
             self.tools_frame.validate_widgets()
-            configs = self.tools_frame.get_values()
-            self.configs.update(configs)
-            write_json(CONFIGS_FILE_PATH, self.configs)
-        except DataValidationFailed as error:
+            self.settings.update(self.tools_frame.get_values())
+        except (DataValidationFailed, StorageLockedError) as error:
             log(error, error=error, level=2, color="red")
             error = str(error).replace("_", " ")
             MessageBox(self,
@@ -111,8 +275,8 @@ class MainFrame(Frame):
         directory = QFileDialog.getExistingDirectory()
         if not directory:
             return
-        file_name = f"{datetime.now().strftime(DATE_FORMAT)}.{extension}"
-        path = f"{directory}\\{file_name}"
+        file_name = f"{format_date(datetime.now())}.{extension}"
+        path = join(directory, file_name)
         return path
 
 
@@ -124,13 +288,16 @@ class MainFrame(Frame):
         path =self.get_file_path("xlsx")
         if not path:
             return
-        expenses = self.data_handler.get_all_as_table()
+        expenses = self.data_handler.get_all_as_table(format_date=False)
         try:
-            with ExcelHandler() as handler:
+            split_by_month = self.settings.get("split_excel_by_month", False)
+            with tracer.span("MainFrame.export_excel"), \
+                 XlsxWriter(split_by_month=split_by_month) as handler:
                 handler.create_new()
                 handler.add_data(expenses)
                 handler.save_as(path)
-        except Exception:
+        except Exception as error:
+            log(error, error=error, level=2, color="red")
             MessageBox(self,
                        "high",
                        "Error",
@@ -144,5 +311,39 @@ class MainFrame(Frame):
         path =self.get_file_path("csv")
         if not path:
             return
-        expenses = list(self.data_handler.get_all_as_table())
-        write_csv(path=path, data=expenses)
+        with tracer.span("MainFrame.export_csv"):
+            expenses = list(self.data_handler.get_all_as_table())
+            write_csv(path=path, data=expenses)
+
+    def import_excel(self) -> None:
+        """
+        Import the expenses of all the sheets of
+        an excel file. The first row of each sheet
+        must be the table headers.
+        """
+        path, _ = QFileDialog.getOpenFileName(filter="Excel (*.xlsx)")
+        if not path:
+            return
+        try:
+            with tracer.span("MainFrame.import_excel"), XlsxReader() as handler:
+                handler.open_excel(path)
+                count = self.data_handler.import_expenses(handler.fetch_all_sheets())
+            self.illustration_frame.illustration_filters_callback()
+            MessageBox(self,
+                       "low",
+                       "Import",
+                       f"{count} expenses imported.")
+        except (InvalidFileContentError,
+                StorageLockedError,
+                XlsxHandlerBaseException) as error:
+            log(error, error=error, level=2, color="red")
+            MessageBox(self,
+                       "high",
+                       "Error",
+                       str(error))
+        except Exception as error:
+            log(error, error=error, level=2, color="red")
+            MessageBox(self,
+                       "high",
+                       "Error",
+                       "Couldn't read the excel file.")
@@ -21,7 +21,8 @@ class ToolsFrame(Frame):
                  default_date: datetime,
                  update_configs: Callable,
                  export_excel: Callable,
-                 export_csv: Callable):
+                 export_csv: Callable,
+                 import_excel: Callable):
         super().__init__(layout=Vertical)
         self.setObjectName("tools-frame")
         self.setup_frame()
@@ -29,7 +30,8 @@ class ToolsFrame(Frame):
                           default_date,
                           update_configs,
                           export_excel,
-                          export_csv)
+                          export_csv,
+                          import_excel)
 
     def setup_frame(self) -> None:
         """
@@ -48,7 +50,8 @@ class ToolsFrame(Frame):
                      default_date: datetime,
                      update_configs: Callable,
                      export_excel: Callable,
-                     export_csv: Callable) -> None:
+                     export_csv: Callable,
+                     import_excel: Callable) -> None:
         """
         Initializes the widgets.
         """
@@ -65,12 +68,16 @@ class ToolsFrame(Frame):
                                            object_name="add-expense",
                                            callback_function=update_configs,
                                            width=270)
-        # self.export_excel_button = Button(label="EXPORT EXCEL",
-        #                                   object_name="add-expense",
-        #                                   callback_function=export_excel,
-        #                                   width=270)
+        self.export_excel_button = Button(label="EXPORT EXCEL",
+                                          object_name="add-expense",
+                                          callback_function=export_excel,
+                                          width=270)
         
         self.export_csv_button = Button(label="EXPORT CSV",
                                           object_name="add-expense",
                                           callback_function=export_csv,
+                                          width=270)
+        self.import_excel_button = Button(label="IMPORT EXCEL",
+                                          object_name="add-expense",
+                                          callback_function=import_excel,
                                           width=270)
\ No newline at end of file
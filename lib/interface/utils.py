@@ -4,13 +4,35 @@ for logging, opening files and ...
 """
 import re
 import csv
+import sys
+import atexit
+from os import remove
+from os import replace
+from os.path import exists
+from queue import Queue
+from threading import Lock
+from threading import Thread
+from json import JSONDecoder
+from json import JSONDecodeError
 from bson.json_util import loads
 from bson.json_util import dumps
+from bson.json_util import object_pairs_hook
+from bson.json_util import DEFAULT_JSON_OPTIONS
+from time import time
 from time import strftime
-from pprint import pprint
+from time import localtime
+from pprint import pformat
 from typing import Any
-from traceback import print_tb
+from typing import Generator
+from traceback import format_tb
 from ..errors import InvalidLogLevel
+from ..compression import open_file
+
+# characters which are read from the json files at once
+READ_CHUNK_SIZE = 2 ** 20
+# items of a json array which are written at once
+WRITE_CHUNK_SIZE = 1000
+JSON_SEPARATORS = re.compile(r"[\s,]*")
 
 
 def void_function(*args, **kwargs) -> None:
@@ -18,13 +40,24 @@ def void_function(*args, **kwargs) -> None:
 
 class Logger:
     """
-    act as advance print function for debugging the code
+    act as advance print function for debugging the code.
+    the caller converts the args to text and puts the
+    record in a queue, a background thread adds the time
+    stamp and traceback and writes it to stderr, so
+    logging doesn't block the GUI thread and doesn't mix
+    with the output of the command line.
     ----------------------------------------------------
     @properties
             debug: activate and deactivate output
             level: level of printing details
     @methods
-
+            disable_logger
+            disable_log_level
+            enable_log_level
+            is_enabled
+            set_output_file
+            flush
+            compile_mode
     """
     colors = {
         "default": '\033[0m',
@@ -43,8 +76,13 @@ class Logger:
         self.levels = {1: self.level_one,
                        2: self.level_two,
                        3: self.level_three}
-        self.pretty_printer = pprint
-    
+        self.active_levels = set(self.levels)
+        self.pretty_formatter = pformat
+        self.queue = Queue()
+        self.writer = ConsoleWriter(sys.stderr)
+        self.worker = None
+        self.worker_lock = Lock()
+
     def __call__(self,
                  *args,
                  pretty: bool = False,
@@ -63,65 +101,137 @@ class Logger:
                         level_two:
                                 details of the catched error
                                 with line and cause of error
+        @note
+            disabled levels return before any work. the
+            args are converted to text here, so mutable
+            objects are logged in their current state,
+            only the error is formatted by the background
+            thread.
         """
+        if level not in self.active_levels:
+            if level not in self.levels:
+                raise SystemError("Invalid Level name for debugging")
+            return
         if not self.debug:
             return
-        try:
-            self.levels[level](pretty=pretty, color=color, *args, **kwargs)
-        except KeyError as err:
-            print(self.colors["default"], err)
-            raise SystemError("Invalid Level name for debugging")
+        if self.worker is None:
+            self.start_worker()
+        text = self.format_args(args, pretty)
+        self.queue.put((time(), level, text, pretty, color, kwargs))
+
+    def is_enabled(self, level: int) -> bool:
+        """
+        Checks whether the level is enabled or not.
+        hot paths can check it before creating the
+        log arguments.
+        """
+        return self.debug and level in self.active_levels
+
+    def start_worker(self) -> None:
+        """
+        Start the background thread which writes
+        the records.
+        """
+        with self.worker_lock:
+            if self.worker is not None:
+                return
+            self.worker = Thread(target=self.consume,
+                                 name="logger",
+                                 daemon=True)
+            self.worker.start()
+            atexit.register(self.flush)
+
+    def consume(self) -> None:
+        """
+        Write the records of the queue until the
+        program exits.
+        """
+        while True:
+            time_stamp, level, text, pretty, color, kwargs = self.queue.get()
+            try:
+                text = self.levels[level](text,
+                                          time_stamp=time_stamp,
+                                          pretty=pretty,
+                                          **kwargs)
+                self.writer.write(text, self.colors.get(color, self.colors["default"]))
+            except Exception as error:
+                self.writer.write(f"logger failed: {error!r}", self.colors["red"])
+            finally:
+                self.queue.task_done()
+
+    def flush(self) -> None:
+        """
+        Wait until all queued records are written.
+        """
+        if self.worker is not None:
+            self.queue.join()
+
+    def format_args(self, args: tuple, pretty: bool) -> str:
+        """
+        Convert the args to text.
+        """
+        if pretty:
+            return "\n".join(self.pretty_formatter(arg) for arg in args)
+        return " ".join(str(arg) for arg in args)
+
+    def add_error(self, text: str, error: object, pretty: bool) -> str:
+        """
+        Append the error to the text of the args.
+        """
+        error_text = self.format_args((error,), pretty)
+        if not text:
+            return error_text
+        separator = "\n" if pretty else " "
+        return f"{text}{separator}{error_text}"
 
     def level_one(self,
-                  *args,
+                  text: str,
+                  time_stamp: float,
                   pretty: bool,
-                  color: str,
-                  **kwargs) -> None:
+                  **kwargs) -> str:
         """
-        print given argument with time stamp
+        format the text of the args with time stamp
         """
-        time_stamp = strftime(self.time_stamp_format)
-        if pretty:
-            print(self.colors[color], time_stamp, end="\t")
-            self.pretty_printer(*args)
-            print(self.colors["default"], end="")
-            return
-        print(self.colors[color],
-              time_stamp,
-              *args,
-              self.colors["default"])
+        time_stamp = strftime(self.time_stamp_format, localtime(time_stamp))
+        separator = "\t" if pretty else " "
+        return f"{time_stamp}{separator}{text}"
 
     def level_two(self,
-                  *args,
+                  text: str,
+                  time_stamp: float,
                   error: object,
-                  pretty: bool,
-                  color: str) -> None:
+                  pretty: bool) -> str:
         """
-        print traceback of the catched error from try,
+        format traceback of the catched error from try,
         except block
         ----------------------------------------------
         -> Params:
-                *args
+                 text: str,
                  error: object,
                  pretty: bool,
-                 color: str
         """
-        self.level_one(*args, error, pretty=pretty, color=color)
-        print_tb(error.__traceback__)
+        text = self.level_one(self.add_error(text, error, pretty),
+                              time_stamp=time_stamp,
+                              pretty=pretty)
+        traceback = "".join(format_tb(error.__traceback__))
+        return f"{text}\n{traceback}".rstrip()
 
     def level_three(self,
-                    *args,
+                    text: str,
+                    time_stamp: float,
                     pretty: bool,
-                    color: str,
-                    **kwargs) -> None:
+                    **kwargs) -> str:
         """
-        Print debugging messages
+        format debugging messages
         -------------------------------------------------
         -> Params:
-                *args
-                 error
+                text: str
+                error
         """
-        self.level_one(*args, pretty=pretty, color=color, **kwargs)
+        error = kwargs.get("error")
+        if error is not None:
+            text = self.add_error(text, error, pretty)
+        return self.level_one(text, time_stamp=time_stamp, pretty=pretty)
 
     def disable_logger(self) -> None:
         """
@@ -140,8 +250,37 @@ class Logger:
         """
         if not self.levels.get(level):
             raise InvalidLogLevel(f"invalid level -> <{level}>")
-        self.levels[level]
-        self.levels[level] = self.void_function
+        self.active_levels.discard(level)
+
+    def enable_log_level(self, level: int) -> None:
+        """
+        enable a disabled log level
+        --------------------------------------
+        -> Params:
+                level
+        @raises:
+             InvalidLogLevel
+        """
+        if not self.levels.get(level):
+            raise InvalidLogLevel(f"invalid level -> <{level}>")
+        self.active_levels.add(level)
+
+    def set_output_file(self,
+                        path: str,
+                        max_bytes: int = 1024 * 1024,
+                        backup_count: int = 3) -> None:
+        """
+        Write the records into a file instead of
+        stderr. The file is rotated when its size
+        gets bigger than max_bytes.
+        --------------------------------------
+        -> Params:
+                path: str
+                max_bytes: int
+                backup_count: int
+        """
+        self.flush()
+        self.writer = RotatingFileWriter(path, max_bytes, backup_count)
 
     def void_function(self, *args, **kwargs) -> None:
         """
@@ -155,7 +294,67 @@ class Logger:
         there is bug with python pprint module, which is
         cause program crash after compilation
         """
-        self.pretty_printer = print
+        self.pretty_formatter = str
+
+
+class ConsoleWriter:
+    """
+    Writes the log records to a stream with
+    their colors.
+    """
+
+    def __init__(self, stream: object) -> None:
+        self.stream = stream
+
+    def write(self, text: str, color: str) -> None:
+        """
+        Write the text with the color.
+        """
+        self.stream.write(f"{color} {text} {Logger.colors['default']}\n")
+        self.stream.flush()
+
+
+class RotatingFileWriter:
+    """
+    Writes the log records to a file. When the
+    file gets bigger than max_bytes it's renamed
+    to path.1(path.1 to path.2 and so on) and a
+    new file is created.
+    """
+
+    def __init__(self,
+                 path: str,
+                 max_bytes: int,
+                 backup_count: int) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.file = open(path, "a", encoding="utf-8")
+
+    def rotate(self) -> None:
+        """
+        Shift the backup files and start a new file.
+        """
+        self.file.close()
+        for index in range(self.backup_count - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if exists(source):
+                replace(source, f"{self.path}.{index + 1}")
+        if self.backup_count:
+            replace(self.path, f"{self.path}.1")
+        else:
+            remove(self.path)
+        self.file = open(self.path, "a", encoding="utf-8")
+
+    def write(self, text: str, color: str) -> None:
+        """
+        Write the text, colors are ignored in file.
+        """
+        text = f"{text}\n"
+        if self.file.tell() + len(text) > self.max_bytes and self.file.tell():
+            self.rotate()
+        self.file.write(text)
+        self.file.flush()
 
 
 log = Logger()
@@ -219,19 +418,113 @@ def write_file(path: str, data: Any, mode: str = "w", ) -> any:
 
 def load_json(path: str) -> any:
     """
-    Open json file and return it as dict
+    Open json file and return it as dict. Compressed
+    files are detected by their first bytes and the
+    items of an array are parsed while the file is
+    read, so the whole text isn't kept in memory.
     """
-    with open(path, "r") as file:
-        data = loads(file.read())
-    return data
+    with open_file(path, "r") as file:
+        text = file.read(READ_CHUNK_SIZE)
+        if text.lstrip().startswith("["):
+            return list(iter_json_array(file, text))
+        return loads(text + file.read())
+
 
-def write_json(path: str, data: dict) -> None:
+def iter_json_array(file: object, text: str = "") -> Generator:
     """
-    Save data to a json file
+    Parse the items of the json array of the file
+    while the file is read. Each chunk is parsed at
+    once up to its last "}," which is usually the
+    end of an item, otherwise its items are parsed
+    one by one.
+    ----------------------------------
+    -> Params
+        file: text file object
+        text: str → already read beginning of the file
+    @raises
+        ValueError
     """
-    data = dumps(data, indent=4)
-    with open(path, 'w') as file:
-        file.write(data)
+    decoder = None
+    position = text.index("[") + 1
+    while True:
+        chunk = file.read(READ_CHUNK_SIZE)
+        text = text[position:] + chunk
+        position = 0
+        if not chunk:
+            break
+        cut = text.rfind("},")
+        if cut == -1:
+            continue
+        try:
+            # a cut in a string or a nested object isn't valid json
+            items = loads(f"[{text[:cut + 1]}]")
+            position = cut + 2
+        except ValueError:
+            decoder = decoder or _get_decoder()
+            items, position = _scan_json_items(decoder, text)
+        yield from items
+    # the rest closes the array, an object which
+    # wraps the array(e.g. the snapshots) may follow
+    items, _ = (decoder or _get_decoder()).raw_decode(f"[{text}")
+    yield from items
+
+
+def _get_decoder() -> JSONDecoder:
+    """
+    Returns a json decoder of the extended json
+    values(e.g. the dates).
+    """
+    return JSONDecoder(object_pairs_hook=lambda pairs: object_pairs_hook(
+        pairs, DEFAULT_JSON_OPTIONS))
+
+
+def _scan_json_items(decoder: JSONDecoder, text: str) -> tuple:
+    """
+    Parse the complete items at the beginning of
+    the text one by one.
+    <- Return
+        tuple → (items, position after the last item)
+    """
+    items = list()
+    position = 0
+    while True:
+        start = JSON_SEPARATORS.match(text, position).end()
+        try:
+            item, end = decoder.raw_decode(text, start)
+        except JSONDecodeError:
+            return items, position
+        # a number at the end may continue in the next chunk
+        if end >= len(text):
+            return items, position
+        items.append(item)
+        position = JSON_SEPARATORS.match(text, end).end()
+
+
+def write_json(path: str, data: dict, codec: str = None) -> None:
+    """
+    Save data to a json file, items of a list are
+    written one per line. The file is compressed
+    by the codec or the codec of its extension
+    (.gz, .xz, .zst).
+    """
+    with open_file(path, "w", codec) as file:
+        if not isinstance(data, list):
+            file.write(dumps(data, indent=4))
+            return
+        write_json_array(file, data)
+
+
+def write_json_array(file: object, data: list) -> None:
+    """
+    Write the items of the list into the opened
+    file one per line, a chunk of them at once.
+    """
+    file.write("[")
+    for start in range(0, len(data), WRITE_CHUNK_SIZE):
+        items = data[start:start + WRITE_CHUNK_SIZE]
+        separator = ",\n    " if start else "\n    "
+        file.write(separator + ",\n    ".join(map(dumps, items)))
+    file.write("\n]" if data else "]")
 
 
 def write_csv(path: str,
@@ -244,7 +537,7 @@ def write_csv(path: str,
                 csv file path
         data: list of tuples
     """
-    with open(path, "w", newline='') as file:
+    with open_file(path, "w", newline='') as file:
         writer = csv.writer(file, quoting=csv.QUOTE_MINIMAL)
         writer.writerows(data)
         
\ No newline at end of file
@@ -5,6 +5,7 @@ from datetime import datetime
 from typing import Any
 from typing import Union
 from typing import NewType
+from typing import Callable
 from PyQt5.QtWidgets import QAbstractSpinBox
 from PyQt5.QtWidgets import QTableWidgetItem
 from PyQt5.QtWidgets import QAction
@@ -31,6 +32,7 @@ from PyQt5.QtWidgets import QCompleter
 from PyQt5.QtWidgets import QGraphicsDropShadowEffect
 from PyQt5.QtWidgets import QFileDialog
 from PyQt5.QtWidgets import QDateEdit
+from PyQt5.QtWidgets import QShortcut
 from PyQt5.QtGui import QIcon
 from PyQt5.QtGui import QCursor
 from PyQt5.QtGui import QColor
@@ -38,11 +40,19 @@ from PyQt5.QtGui import QIntValidator
 from PyQt5.QtGui import QDoubleValidator
 from PyQt5.QtGui import QRegExpValidator
 from PyQt5.QtGui import QPixmap
+from PyQt5.QtGui import QKeySequence
 from PyQt5.QtCore import Qt
 from PyQt5.QtCore import QSize
 from PyQt5.QtCore import QRegExp
 from PyQt5.QtCore import QSortFilterProxyModel
+from PyQt5.QtCore import QStringListModel
+from PyQt5.QtCore import QTimer
+from PyQt5.QtCore import QFileSystemWatcher
 from lib.errors import DataValidationFailed, RowNotExists, TableCellNotFoundError
+from lib.tracing import tracer
+from lib.money import to_cents
+from lib.money import format_money
+from lib.dates import format_date
 from .utils import log
 from .utils import void_function
 from lib.constants import *
@@ -235,15 +245,13 @@ class WidgetController:
                 return
             self.add_widget(widget)
             self.widgets.append((name, widget))
-        except TypeError as error:
-            log(error=error,
-                level=3, 
-                color="red")
-
-        except AttributeError as error:
-            log(error=error,
-                level=3, 
-                color="red")
+        except (TypeError, AttributeError) as error:
+            # it's called for every attribute, so checks
+            # the level before creating the log record.
+            if log.is_enabled(3):
+                log(error=error,
+                    level=3, 
+                    color="red")
 
     def get_widgets(self) -> list:
         """
@@ -1074,6 +1082,31 @@ class Entry(QLineEdit):
         for callback in callbacks:
             self.textChanged.connect(callback)
 
+    def set_completion(self, suggest: Callable) -> None:
+        """
+        Show the suggestions of the typed text in a
+        popup, the suggestions are already ranked so
+        the completer doesn't filter or sort them.
+
+        @args
+            suggest: Callable → takes the text and
+                                returns a list of str
+        """
+        model = QStringListModel(self)
+        completer = QCompleter(model, self)
+        completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        completer.setCaseSensitivity(Qt.CaseInsensitive)
+        self.setCompleter(completer)
+
+        def update_suggestions(text: str) -> None:
+            model.setStringList(suggest(text) if text else [])
+            if text:
+                completer.complete()
+
+        # textEdited isn't emitted by setText, so choosing
+        # a suggestion doesn't open the popup again
+        self.textEdited.connect(update_suggestions)
+
     def set_upper(self) -> None:
         """
         Force the user input to be uppercase.
@@ -1200,6 +1233,25 @@ class FloatEntry(DigitEntry):
             DoubleValidator(float(value_limit[0]), float(value_limit[1]), 20,
                             self))
 
+class MoneyEntry(FloatEntry):
+    """
+    Money Entry accepts the amount and returns
+    it in cents
+    """
+
+    def __init__(self, value_limit: tuple, **kwargs) -> None:
+        super().__init__(value_limit=value_limit, **kwargs)
+        self._type = to_cents
+
+    def set_value(self, value: Any) -> None:
+        """
+        Show the amount of the cents, texts are
+        set as they are.
+        """
+        if isinstance(value, int):
+            value = format_money(value)
+        super().set_value(value)
+
 class LabelEntry(Frame):
     """
     Labeled Entry .is a frame contains entry
@@ -1224,7 +1276,8 @@ class LabelEntry(Frame):
         "string_multiple_int": StringEntry,
         "section_name_pattern": StringEntry,
         "int": IntEntry,
-        "decimal": FloatEntry
+        "decimal": FloatEntry,
+        "money": MoneyEntry
     }
 
     #TODO: we taking to many argument, need to refactor again,
@@ -1316,6 +1369,12 @@ class LabelEntry(Frame):
         """
         self.entry.set_value(value)
 
+    def set_completion(self, suggest: Callable) -> None:
+        """
+        Show the suggestions of the typed text
+        """
+        self.entry.set_completion(suggest)
+
     def clear_value(self) -> None:
         """
         Clear value of the entry
@@ -1555,7 +1614,14 @@ class HorizontalTable(Table):
                  editable:bool=False,
                  edit_callback: callable = None,
                  double_click_callback: callable = None,
-                 grid_positions: tuple = None) -> None:
+                 grid_positions: tuple = None,
+                 formatters: dict = None) -> None:
+        """
+        -> Params
+            formatters: dict → {column: function} which
+                        converts the values of the column
+                        to their text
+        """
         super().__init__(min_width=min_width,
                          min_height=min_height,
                          selection_mode=selection_mode,
@@ -1564,16 +1630,39 @@ class HorizontalTable(Table):
         self.setObjectName(object_name)
         self.table_number = table_number
         self.grid_positions = grid_positions
+        self.formatters = formatters or dict()
         if editable:
             self.set_callback(edit_callback)
 
     def set_callback(self, callback: callable) -> None:
         """
-        Set callback for cellChange
+        Set callback for cellChange, it gets the
+        row, column and table number.
         """
         if callback:
             self.cellChanged.connect(
-                lambda x: callback(x, self.table_number))
+                lambda row, column: callback(row, column, self.table_number))
+
+    def set_sort_callback(self, callback: callable) -> None:
+        """
+        Set callback for clicking the headers, it
+        gets the column. The rows are sorted by the
+        callback, not by the table.
+        """
+        header = self.horizontalHeader()
+        header.setSectionsClickable(True)
+        header.sectionClicked.connect(callback)
+
+    def set_sort_indicator(self, column: int, descending: bool) -> None:
+        """
+        Show the sorted column and its order on
+        the header, None column hides it.
+        """
+        header = self.horizontalHeader()
+        header.setSortIndicatorShown(column is not None)
+        if column is not None:
+            header.setSortIndicator(
+                column, Qt.DescendingOrder if descending else Qt.AscendingOrder)
 
     def setup_view(self,
                    h_headers: list = None,
@@ -1604,7 +1693,9 @@ class HorizontalTable(Table):
                 data
                 row: row number default is 0
         """
-        data[-1] = datetime.strftime(data[-1], DATE_FORMAT)
+        data[-1] = format_date(data[-1])
+        for column, formatter in self.formatters.items():
+            data[column] = formatter(data[column])
         c_count = self.columnCount()
         for value, column in zip(data, range(c_count)):
             if width:
@@ -1617,6 +1708,7 @@ class HorizontalTable(Table):
             item = QTableWidgetItem(str(value))
             self.setItem(row, column, item)
 
+    @tracer.traced("HorizontalTable.insert_data")
     def insert_data(self,
                     headers: list,
                     data: list,
@@ -1628,17 +1720,48 @@ class HorizontalTable(Table):
             data: list of dicts
             width: list or int
         """
-        self.clear_value()
-        self.horizontalHeader().show()
-        self.setup_view(h_headers=headers,
-                        row_count=len(data),
-                        column_count=len(headers),
-                        has_width=width)
-        for row_index, document in enumerate(data):
-            value = list(document.values())
-            self.insert_row(data=value,
-                            width=width,
-                            row=row_index)
+        # inserted items are not edits of the user
+        self.blockSignals(True)
+        try:
+            self.clear_value()
+            self.horizontalHeader().show()
+            self.setup_view(h_headers=headers,
+                            row_count=len(data),
+                            column_count=len(headers),
+                            has_width=width)
+            for row_index, document in enumerate(data):
+                value = list(document.values())
+                self.insert_row(data=value,
+                                width=width,
+                                row=row_index)
+        finally:
+            self.blockSignals(False)
+
+    def append_data(self, data: list) -> None:
+        """
+        Add the rows of the data after the current
+        rows, the current rows aren't inserted again.
+        ----------------------------------------------
+        -> Params
+            data: list of dicts
+        """
+        self.blockSignals(True)
+        try:
+            start = self.rowCount()
+            self.setRowCount(start + len(data))
+            for row_index, document in enumerate(data, start):
+                self.insert_row(data=list(document.values()),
+                                width=None,
+                                row=row_index)
+        finally:
+            self.blockSignals(False)
+
+    def truncate(self, row_count: int) -> None:
+        """
+        Remove the rows after the row_count.
+        """
+        if row_count < self.rowCount():
+            self.setRowCount(row_count)
 
     def insert_new_row(self, data: tuple) -> None:
         """
@@ -0,0 +1,133 @@
+"""
+This module contains the advisory lock of the data
+files. Every instance of the program which writes the
+expenses holds the lock of the data path, so two
+windows don't write at the same time and each one reads
+the changes of the other before its own write.
+
+@note
+    the lock is advisory, other programs which don't
+    use it can still change the files.
+"""
+import os
+import time
+from threading import RLock
+from .errors import StorageLockedError
+
+try:
+    import fcntl
+except ImportError:
+    # windows
+    fcntl = None
+    import msvcrt
+
+__all__ = ["FileLock", "get_lock"]
+
+# seconds which a writer waits for the other instances
+LOCK_TIMEOUT = 10
+LOCK_RETRY_INTERVAL = 0.05
+
+_locks = dict()
+
+
+class FileLock:
+    """
+    Reentrant exclusive lock of a lock file, the
+    nested acquires of the same process only count.
+    --------------------------------------------
+    @methods
+        acquire
+        release
+    """
+
+    def __init__(self, path: str, timeout: float = LOCK_TIMEOUT) -> None:
+        """
+        ---------------------------------
+        -> Params
+            path: str → lock file, it's created if
+                        it doesn't exist
+            timeout: float → seconds
+        """
+        self.path = path
+        self.timeout = timeout
+        self.file = None
+        self.depth = 0
+        self.thread_lock = RLock()
+
+    def _try_lock(self) -> bool:
+        """
+        Lock the file without blocking.
+        """
+        try:
+            if fcntl is not None:
+                fcntl.flock(self.file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(self.file.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            return False
+        return True
+
+    def _unlock(self) -> None:
+        if fcntl is not None:
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_UN)
+        else:
+            self.file.seek(0)
+            msvcrt.locking(self.file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def acquire(self) -> None:
+        """
+        Wait for the lock of the other instances.
+        @raises
+            StorageLockedError
+        """
+        self.thread_lock.acquire()
+        if self.depth:
+            self.depth += 1
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self.file = open(self.path, "a+")
+            deadline = time.monotonic() + self.timeout
+            while not self._try_lock():
+                if time.monotonic() > deadline:
+                    raise StorageLockedError(
+                        f"Data is locked by another instance → {self.path}")
+                time.sleep(LOCK_RETRY_INTERVAL)
+        except BaseException:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+            self.thread_lock.release()
+            raise
+        self.depth = 1
+
+    def release(self) -> None:
+        """
+        Release the lock when the outer acquire
+        is finished.
+        """
+        self.depth -= 1
+        if not self.depth:
+            self._unlock()
+            self.file.close()
+            self.file = None
+        self.thread_lock.release()
+
+    def __enter__(self) -> object:
+        self.acquire()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.release()
+
+
+def get_lock(path: str) -> FileLock:
+    """
+    Returns the lock of the path, the stores of the
+    same path share it, so reloading the store in a
+    locked block doesn't wait for itself.
+    """
+    path = os.path.abspath(path)
+    if path not in _locks:
+        _locks[path] = FileLock(path)
+    return _locks[path]
@@ -0,0 +1,109 @@
+"""
+This module contains the money values of the expenses.
+The prices are integer cents in the memory and in the
+storages, so the totals are exact sums of integers.
+The amounts are converted to cents where they are
+entered(entries, table cells, imports, requests) and
+back to amounts only where they are shown or written
+for the users(table, summaries, command line, exports).
+
+@note
+    the files of the older versions have amounts(float
+    or int) and no unit, the json snapshots and the
+    partition manifests keep "money": "cents" after
+    they are converted. migrate_expense only runs on
+    the expenses of the files without the unit.
+"""
+import re
+from decimal import Decimal
+from decimal import InvalidOperation
+from decimal import ROUND_HALF_UP
+
+__all__ = ["to_cents", "to_amount", "to_amounts", "format_money",
+           "migrate_expense", "MONEY_KEYS"]
+
+CENTS = 100
+CENT = Decimal("0.01")
+# money values of the expenses
+MONEY_KEYS = ("price", "overall_price")
+# a comma is only accepted as the thousands separator,
+# 1,5 isn't read as 15 or 1.5
+GROUPED_AMOUNT = re.compile(r"[+-]?\d{1,3}(,\d{3})+(\.\d*)?")
+
+
+def to_cents(amount: object) -> int:
+    """
+    Convert an amount to cents, the smaller parts
+    are rounded half up.
+    ---------------------------------------
+    -> Params
+        amount: str, int, float or Decimal
+    <- Return
+        int
+    @raises
+        ValueError
+    """
+    if isinstance(amount, float):
+        # the shortest repr is the typed amount, the
+        # Decimal of the float is its binary value
+        amount = repr(amount)
+    text = str(amount).strip()
+    if "," in text:
+        if not GROUPED_AMOUNT.fullmatch(text):
+            raise ValueError(f"Invalid amount → {amount}")
+        text = text.replace(",", "")
+    try:
+        value = Decimal(text)
+    except InvalidOperation:
+        raise ValueError(f"Invalid amount → {amount}") from None
+    if not value.is_finite():
+        raise ValueError(f"Invalid amount → {amount}")
+    return int(value.quantize(CENT, rounding=ROUND_HALF_UP) * CENTS)
+
+
+def to_amount(cents: int) -> float:
+    """
+    Returns the amount of the cents for json and
+    the spreadsheets. The float is the nearest one
+    to the amount, so it's printed exactly.
+    """
+    return int(cents) / CENTS
+
+
+def to_amounts(values: dict, keys: tuple = MONEY_KEYS) -> dict:
+    """
+    Returns a copy of the values(an expense by
+    default) which has the amounts of the keys.
+    """
+    values = dict(values)
+    for key in keys:
+        values[key] = to_amount(values[key])
+    return values
+
+
+def format_money(cents: int, grouping: bool = False) -> str:
+    """
+    Returns the amount of the cents with two
+    decimals, 123450 → 1234.50 or 1,234.50.
+    """
+    sign = "-" if cents < 0 else ""
+    units, rest = divmod(abs(int(cents)), CENTS)
+    units = f"{units:,}" if grouping else str(units)
+    return f"{sign}{units}.{rest:02d}"
+
+
+def migrate_expense(expense: dict) -> bool:
+    """
+    Convert the amounts of an older expense(or
+    changes of an expense) to cents, the int values
+    are amounts too.
+    <- Return
+        bool → True if a value is converted
+    """
+    migrated = False
+    for key in MONEY_KEYS:
+        value = expense.get(key)
+        if value is not None:
+            expense[key] = to_cents(value)
+            migrated = True
+    return migrated
@@ -0,0 +1,350 @@
+"""
+This module contains the MongoDB storage of the
+expenses. The expenses are documents of a collection
+with compound indexes on the date and category, the
+newest ones are loaded like the partitions and the
+totals and groups of the expenses which aren't loaded
+are computed by aggregation pipelines on the server.
+
+@usage
+    python -m lib --data mongodb://localhost:27017/expenses total
+    store = MongoStore(FakeCollection())
+
+@note
+    MongoStore only uses the methods of the pymongo
+    Collection, so the FakeCollection of the tools
+    (or mongomock) can be used instead of a server.
+    Like the journal, the changes find their document by
+    the values of the expense(see storage module). The
+    prices are int cents like the files, the double
+    prices of the older versions are converted once.
+    BSON dates keep milliseconds, the smaller parts of
+    the dates are dropped.
+"""
+import re
+from datetime import datetime
+from threading import RLock
+from typing import Iterable
+from pymongo import ASCENDING
+from pymongo import DESCENDING
+from pymongo import DeleteOne
+from pymongo import UpdateOne
+from .constants import DATE_FORMAT
+from .constants import EXPENSE_KEYS
+from .errors import UnsupportedCompressionError
+from .money import MONEY_KEYS
+from .money import migrate_expense
+
+__all__ = ["MongoStore"]
+
+COLLECTION_NAME = "expenses"
+# name of the unloaded expenses in the summed names of get_summary
+UNLOADED_NAME = "unloaded"
+# expressions of the group keys of cli.GROUP_KEYS
+GROUP_EXPRESSIONS = {
+    "date": {"$dateToString": {"format": DATE_FORMAT, "date": "$date"}},
+    "month": {"$dateToString": {"format": "%Y-%m", "date": "$date"}},
+    "year": {"$dateToString": {"format": "%Y", "date": "$date"}},
+    "category": "$category",
+    "title": "$title",
+}
+NEWEST_FIRST = [("date", DESCENDING), ("_id", DESCENDING)]
+
+
+def to_expense(document: dict) -> dict:
+    """
+    Returns the expense of the document, the keys are
+    in the order of the other storages.
+    """
+    return {key: document[key] for key in EXPENSE_KEYS}
+
+
+class MongoStore:
+    """
+    MongoDB collection of the expenses. The expenses
+    newer than loaded_from are loaded, the older ones
+    are loaded when a date range needs them.
+    --------------------------------------------
+    @methods
+        load
+        load_more
+        load_range
+        load_dates
+        get_summary
+        get_groups
+        migrate
+        sync
+        append
+        update
+        delete
+        set_codec
+    """
+
+    def __init__(self, collection: object) -> None:
+        """
+        ---------------------------------
+        -> Params
+            collection: pymongo Collection or an object
+                        with the same methods
+        """
+        self.collection = collection
+        self.codec = None
+        # the server orders the writes, the lock only
+        # orders the threads of this instance
+        self.lock = RLock()
+        # date of the oldest loaded expense, None when
+        # nothing is loaded and datetime.min for all
+        self.loaded_from = None
+        self.create_indexes()
+        self.migrate()
+
+    @classmethod
+    def from_uri(cls, uri: str) -> object:
+        """
+        Connect to the database of the connection
+        string, the database name defaults to
+        expenses.
+        """
+        from pymongo import MongoClient
+        client = MongoClient(uri)
+        database = client.get_default_database(COLLECTION_NAME)
+        return cls(database[COLLECTION_NAME])
+
+    def create_indexes(self) -> None:
+        """
+        Create the indexes of the date ranges and
+        the categories in the date ranges, existing
+        indexes are kept.
+        """
+        self.collection.create_index([("date", DESCENDING),
+                                      ("category", ASCENDING)])
+        self.collection.create_index([("category", ASCENDING),
+                                      ("date", DESCENDING)])
+
+    def migrate(self) -> None:
+        """
+        Convert the double prices of the documents
+        of an older version to cents with one
+        request, the converted documents aren't
+        found again.
+        """
+        older = {"$or": [{key: {"$type": "double"}} for key in MONEY_KEYS]}
+        projection = {key: 1 for key in MONEY_KEYS}
+        operations = list()
+        for document in self.collection.find(older, projection):
+            migrate_expense(document)
+            operations.append(UpdateOne(
+                {"_id": document["_id"]},
+                {"$set": {key: document[key] for key in MONEY_KEYS if key in document}}))
+        if operations:
+            self.collection.bulk_write(operations, ordered=False)
+
+    def _find(self, query: dict) -> list:
+        """
+        Returns the expenses of the query newest
+        first, expenses of the same day are in
+        reverse order of adding like the other
+        storages.
+        """
+        cursor = self.collection.find(query, {"_id": 0}).sort(NEWEST_FIRST)
+        return [to_expense(document) for document in cursor]
+
+    def _get_unloaded(self, from_date: datetime, to_date: datetime = None) -> dict:
+        """
+        Returns the date query of the expenses of
+        the range which aren't loaded, None if all
+        of them are loaded.
+        """
+        if self.loaded_from is not None and from_date >= self.loaded_from:
+            return None
+        query = {"$gte": from_date}
+        if to_date is not None:
+            query["$lte"] = to_date
+        if self.loaded_from is not None:
+            query["$lt"] = self.loaded_from
+        return query
+
+    def load(self, count: int = None) -> list:
+        """
+        Returns the latest expenses, the expenses of
+        the day of the oldest one are loaded too, so
+        all the expenses after loaded_from are loaded.
+        ---------------------------------------
+        -> Params
+            count: int → None for all
+        <- Return
+            list of dicts newest first
+        """
+        if count is None:
+            self.loaded_from = datetime.min
+            return self._find({})
+        if count <= 0:
+            self.loaded_from = None
+            return list()
+        cursor = self.collection.find({}, {"date": 1}).sort(NEWEST_FIRST)
+        oldest = list(cursor.skip(count - 1).limit(1))
+        if not oldest:
+            self.loaded_from = datetime.min
+            return self._find({})
+        self.loaded_from = oldest[0]["date"]
+        return self._find({"date": {"$gte": self.loaded_from}})
+
+    def load_more(self, count: int) -> list:
+        """
+        Returns the next older expenses after the
+        loaded ones, the rest of the day of the
+        oldest one is loaded too.
+        ---------------------------------------
+        -> Params
+            count: int → number of the expenses
+        <- Return
+            list of dicts newest first
+        """
+        if self.loaded_from is None:
+            return self.load(count)
+        if self.loaded_from == datetime.min or count <= 0:
+            return list()
+        older = {"date": {"$lt": self.loaded_from}}
+        cursor = self.collection.find(older, {"date": 1}).sort(NEWEST_FIRST)
+        oldest = list(cursor.skip(count - 1).limit(1))
+        from_date = oldest[0]["date"] if oldest else datetime.min
+        return self.load_range(from_date, datetime.max)
+
+    def load_range(self,
+                   from_date: datetime,
+                   to_date: datetime,
+                   exclude: Iterable = ()) -> list:
+        """
+        Returns the expenses from the from_date to
+        the oldest loaded one. The loaded expenses
+        stay contiguous, so the ones after to_date
+        are loaded too.
+        ---------------------------------------
+        -> Params
+            from_date: datetime
+            to_date: datetime
+            exclude: Iterable → UNLOADED_NAME if the
+                                range is already summed
+                                by get_summary
+        """
+        if UNLOADED_NAME in exclude:
+            return list()
+        query = self._get_unloaded(from_date)
+        if query is None:
+            return list()
+        self.loaded_from = from_date
+        return self._find({"date": query})
+
+    def load_dates(self, dates: Iterable) -> list:
+        """
+        Returns the expenses of the days which
+        aren't loaded yet, the changes of them
+        must be in the loaded expenses.
+        """
+        dates = list(dates)
+        if not dates:
+            return list()
+        return self.load_range(min(dates), datetime.max)
+
+    def get_summary(self, from_date: datetime, to_date: datetime) -> tuple:
+        """
+        Returns the total price and number of the
+        expenses of the range which aren't loaded,
+        they are summed by the server.
+        <- Return
+            tuple → (total price, total items, names)
+        """
+        query = self._get_unloaded(from_date, to_date)
+        if query is None:
+            return 0, 0, list()
+        result = list(self.collection.aggregate([
+            {"$match": {"date": query}},
+            {"$group": {"_id": None,
+                        "total": {"$sum": "$overall_price"},
+                        "count": {"$sum": 1}}},
+        ]))
+        if not result:
+            return 0, 0, [UNLOADED_NAME]
+        return result[0]["total"], result[0]["count"], [UNLOADED_NAME]
+
+    def get_groups(self,
+                   from_date: datetime,
+                   to_date: datetime,
+                   by: str,
+                   category: str = None) -> list:
+        """
+        Returns the total price and number of the
+        expenses of the range for each group, they
+        are grouped by the server.
+        ---------------------------------------
+        -> Params
+            from_date: datetime
+            to_date: datetime
+            by: str → one of GROUP_EXPRESSIONS
+            category: str → prefix of the categories
+        <- Return
+            list of [name, total, count] sorted by
+            the total
+        """
+        match = {"date": {"$gte": from_date, "$lte": to_date}}
+        if category:
+            match["category"] = {"$regex": f"^{re.escape(category)}",
+                                 "$options": "i"}
+        groups = self.collection.aggregate([
+            {"$match": match},
+            {"$group": {"_id": GROUP_EXPRESSIONS[by],
+                        "total": {"$sum": "$overall_price"},
+                        "count": {"$sum": 1}}},
+            {"$sort": {"total": DESCENDING}},
+        ])
+        return [[group["_id"], group["total"], group["count"]] for group in groups]
+
+    def sync(self) -> list:
+        """
+        The writes go to the server at once, the
+        changes of the other instances are read
+        by the next load.
+        """
+        return list()
+
+    def get_watch_paths(self) -> list:
+        """
+        There are no files to watch.
+        """
+        return list()
+
+    def append(self, expenses: Iterable) -> None:
+        """
+        Save the new expenses with one request.
+        """
+        # insert_many adds the _id to the documents
+        documents = [dict(expense) for expense in expenses]
+        if documents:
+            self.collection.insert_many(documents, ordered=True)
+
+    def update(self, expense: dict, changes: dict) -> None:
+        """
+        Save the changes of an expense.
+        ---------------------------------------
+        -> Params
+            expense: dict → values before the changes
+            changes: dict
+        """
+        self.collection.update_one(dict(expense), {"$set": changes})
+
+    def delete(self, expenses: Iterable) -> None:
+        """
+        Remove the expenses with one request.
+        """
+        operations = [DeleteOne(dict(expense)) for expense in expenses]
+        if operations:
+            self.collection.bulk_write(operations, ordered=True)
+
+    def set_codec(self, codec: str) -> None:
+        """
+        MongoDB compresses the collections itself.
+        @raises
+            UnsupportedCompressionError
+        """
+        raise UnsupportedCompressionError(
+            "Compression of MongoDB collections is set on the server.")
@@ -0,0 +1,256 @@
+"""
+This module contains the parallel scan of the
+expenses for very large ledgers. The columns
+which are used by the filters are copied into
+shared memory once, then each process of the
+pool filters a chunk of the rows and returns
+the matched rows indexes and their partial sum
+of the overall price.
+
+@note
+    the string columns are dictionary encoded,
+    the filters are checked once over the
+    distinct values in the main process and the
+    workers only look up the codes.
+"""
+import os
+import sys
+from datetime import datetime
+from datetime import timedelta
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from multiprocessing import resource_tracker
+import numpy as np
+from .symbols import SymbolTable
+
+__all__ = ["ParallelScanner"]
+
+EPOCH = datetime(1970, 1, 1)
+SECOND = timedelta(seconds=1)
+STRING_COLUMNS = ("title", "category")
+CHUNKS_PER_WORKER = 4
+
+# shared memory blocks attached by the worker process
+_attached = dict()
+
+
+def to_seconds(value: datetime) -> int:
+    """
+    Convert the datetime to seconds since epoch.
+    """
+    return (value.replace(tzinfo=None) - EPOCH) // SECOND
+
+
+def _open_block(name: str) -> shared_memory.SharedMemory:
+    """
+    Attach to the shared memory block without
+    registering it in the resource tracker. The
+    main process owns and unlinks the block, the
+    tracker of a spawned worker would unlink it
+    (or warn about a leak) when the worker exits.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    register = resource_tracker.register
+    resource_tracker.register = lambda *args: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+def _attach(descriptors: dict) -> dict:
+    """
+    Attach to the shared memory blocks in the
+    worker process and returns the columns as
+    numpy arrays. The blocks are cached until
+    the columns are rebuilt by the main process.
+    """
+    key = tuple(name for name, _, _ in descriptors.values())
+    if _attached.get("key") != key:
+        for block in _attached.get("blocks", ()):
+            block.close()
+        blocks = list()
+        columns = dict()
+        for column, (name, dtype, length) in descriptors.items():
+            block = _open_block(name)
+            blocks.append(block)
+            columns[column] = np.ndarray((length,), dtype=dtype, buffer=block.buf)
+        _attached.update(key=key, blocks=blocks, columns=columns)
+    return _attached["columns"]
+
+
+def _scan_chunk(descriptors: dict,
+                start: int,
+                end: int,
+                from_date: int,
+                to_date: int,
+                allowed_codes: dict) -> tuple:
+    """
+    Filter the rows of a chunk in the worker.
+    ---------------------------------------
+    -> Params
+        descriptors: dict → {column: (name, dtype, length)}
+        start: int
+        end: int
+        from_date: int → seconds
+        to_date: int → seconds
+        allowed_codes: dict → {column: bool array of codes}
+    <- Return
+        tuple → (matched indexes, sum of overall price)
+    """
+    columns = _attach(descriptors)
+    dates = columns["date"][start:end]
+    mask = (dates >= from_date) & (dates <= to_date)
+    for column, allowed in allowed_codes.items():
+        mask &= allowed[columns[column][start:end]]
+    indexes = np.flatnonzero(mask)
+    total = int(columns["overall_price"][start:end][indexes].sum())
+    return indexes + start, total
+
+
+class ParallelScanner:
+    """
+    Keeps the columns of the expenses in shared
+    memory and filters them with a process pool.
+    --------------------------------------------
+    @methods
+        supports
+        build
+        invalidate
+        filter
+        close
+    """
+
+    def __init__(self, workers: int = None, symbols: dict = None) -> None:
+        """
+        ---------------------------------
+        -> Params
+            workers: int
+                number of processes, default is
+                number of cpu cores
+            symbols: dict → {column: SymbolTable}
+                codes of the string columns
+        """
+        self.workers = workers or os.cpu_count() or 1
+        if symbols is None:
+            symbols = {column: SymbolTable() for column in STRING_COLUMNS}
+        self.symbols = symbols
+        self.pool = None
+        self.blocks = list()
+        self.descriptors = None
+        self.dictionaries = dict()
+
+    def supports(self, filters: dict) -> bool:
+        """
+        Checks whether the filters can be scanned
+        in parallel or not.
+        """
+        return all(name in STRING_COLUMNS for name in filters)
+
+    def _share(self, column: str, values: np.ndarray) -> None:
+        """
+        Copy the column into a shared memory block.
+        """
+        block = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+        shared = np.ndarray(values.shape, dtype=values.dtype, buffer=block.buf)
+        shared[:] = values
+        self.blocks.append(block)
+        self.descriptors[column] = (block.name, values.dtype.str, len(values))
+
+    def build(self, expenses: list) -> None:
+        """
+        Create the columns of the expenses in the
+        shared memory.
+        """
+        self.invalidate()
+        self.descriptors = dict()
+        count = len(expenses)
+        self._share("date", np.fromiter(
+            (to_seconds(expense["date"]) for expense in expenses),
+            dtype=np.int64, count=count))
+        self._share("overall_price", np.fromiter(
+            (expense["overall_price"] for expense in expenses),
+            dtype=np.int64, count=count))
+        for column in STRING_COLUMNS:
+            symbols = self.symbols[column]
+            encoded = np.fromiter(
+                (symbols.code(expense[column]) for expense in expenses),
+                dtype=np.int32, count=count)
+            self.dictionaries[column] = list(symbols.values)
+            self._share(column, encoded)
+        self.rows_count = count
+
+    def invalidate(self) -> None:
+        """
+        Remove the columns, they are rebuilt on
+        the next filter.
+        """
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = list()
+        self.descriptors = None
+
+    def get_pool(self) -> ProcessPoolExecutor:
+        """
+        Returns the process pool, it's created on
+        the first scan.
+        """
+        if self.pool is None:
+            self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self.pool
+
+    def filter(self,
+               expenses: list,
+               from_date: datetime,
+               to_date: datetime,
+               filters: dict) -> tuple:
+        """
+        Filter the expenses in parallel, the result
+        is same as DataHandler._filter_expense.
+        ---------------------------------------
+        -> Params
+            expenses: list
+            from_date: datetime
+            to_date: datetime
+            filters: dict → {column: function(value) -> bool}
+        <- Return
+            tuple → (filtered expenses, total price)
+        """
+        if self.descriptors is None:
+            self.build(expenses)
+        allowed_codes = dict()
+        for column, function in filters.items():
+            allowed_codes[column] = np.fromiter(
+                map(function, self.dictionaries[column]),
+                dtype=np.bool_, count=len(self.dictionaries[column]))
+        chunk_size = -(-self.rows_count // (self.workers * CHUNKS_PER_WORKER)) or 1
+        pool = self.get_pool()
+        futures = [
+            pool.submit(_scan_chunk,
+                        self.descriptors,
+                        start,
+                        min(start + chunk_size, self.rows_count),
+                        to_seconds(from_date),
+                        to_seconds(to_date),
+                        allowed_codes)
+            for start in range(0, self.rows_count, chunk_size)
+        ]
+        filtered = list()
+        total = 0
+        # chunks are merged in order to keep the order of the expenses
+        for future in futures:
+            indexes, chunk_total = future.result()
+            filtered.extend(expenses[index] for index in indexes.tolist())
+            total += chunk_total
+        return filtered, total
+
+    def close(self) -> None:
+        """
+        Remove the shared memory and stop the pool.
+        """
+        self.invalidate()
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
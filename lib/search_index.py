@@ -0,0 +1,255 @@
+"""
+This module contains the n-gram inverted index
+of the expense titles for substring and fuzzy
+search. The index is built over the distinct
+titles, each trigram points to the titles that
+contain it, so a query only checks the titles
+which share its trigrams instead of every row.
+
+@note
+    a typo changes up to three trigrams, so the short
+    queries which have only a few trigrams are compared
+    to the words of the titles by edit distance too.
+"""
+from collections import Counter
+from typing import Iterable
+
+__all__ = ["TitleIndex"]
+
+GRAM_SIZE = 3
+# minimum part of the query trigrams which must be
+# found in a title to accept it as a fuzzy match
+FUZZY_THRESHOLD = 0.5
+# queries up to this length are matched by edit distance
+# when they don't share enough trigrams with a title
+TYPO_QUERY_LENGTH = 8
+# queries shorter than this accept one typo, the longer two
+TWO_TYPOS_LENGTH = 6
+
+
+def get_grams(text: str) -> set:
+    """
+    Returns the trigrams of the text.
+    """
+    return {text[index:index + GRAM_SIZE]
+            for index in range(len(text) - GRAM_SIZE + 1)}
+
+
+def get_edit_distance(first: str, second: str, limit: int) -> int:
+    """
+    Returns the number of the inserted, deleted,
+    replaced and swapped(adjacent) characters
+    between the texts, limit + 1 if it's more
+    than the limit.
+    """
+    if abs(len(first) - len(second)) > limit:
+        return limit + 1
+    previous = None
+    row = list(range(len(second) + 1))
+    for i, first_char in enumerate(first, start=1):
+        before, previous, row = previous, row, [i] + [0] * len(second)
+        for j, second_char in enumerate(second, start=1):
+            cost = first_char != second_char
+            row[j] = min(previous[j] + 1, row[j - 1] + 1, previous[j - 1] + cost)
+            if (i > 1 and j > 1 and first_char == second[j - 2]
+                    and first[i - 2] == second_char):
+                row[j] = min(row[j], before[j - 2] + 1)
+        if min(row) > limit:
+            return limit + 1
+    return min(row[-1], limit + 1)
+
+
+def get_padded_grams(text: str) -> set:
+    """
+    Returns the trigrams of the text with a
+    space around it, the padding adds the grams
+    of the word boundaries.
+    """
+    return get_grams(f" {text} ")
+
+
+class TitleIndex:
+    """
+    Inverted index from trigrams to the lower
+    cased titles.
+    --------------------------------------------
+    @methods
+        build
+        add
+        remove
+        search
+        match
+    """
+
+    def __init__(self) -> None:
+        # trigram → lower cased titles
+        self.postings = dict()
+        # lower cased title → {original title: rows count}
+        self.titles = dict()
+        # lower cased title → number of its trigrams
+        self.grams_count = dict()
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    def build(self, titles: Iterable) -> None:
+        """
+        Create the index from the titles of all
+        the expenses.
+        """
+        self.__init__()
+        for title, count in Counter(titles).items():
+            self.add(title, count)
+
+    def add(self, title: str, count: int = 1) -> None:
+        """
+        Add the title of an expense to the index.
+        """
+        key = title.lower()
+        variants = self.titles.get(key)
+        if variants is None:
+            variants = self.titles[key] = dict()
+            grams = get_padded_grams(key)
+            self.grams_count[key] = len(grams)
+            for gram in grams:
+                self.postings.setdefault(gram, set()).add(key)
+        variants[title] = variants.get(title, 0) + count
+
+    def remove(self, title: str) -> None:
+        """
+        Remove the title of an expense from the
+        index, the title is removed when no other
+        expense has it.
+        """
+        key = title.lower()
+        variants = self.titles.get(key)
+        if not variants or title not in variants:
+            return
+        variants[title] -= 1
+        if variants[title]:
+            return
+        del variants[title]
+        if variants:
+            return
+        del self.titles[key]
+        del self.grams_count[key]
+        for gram in get_padded_grams(key):
+            keys = self.postings[gram]
+            keys.discard(key)
+            if not keys:
+                del self.postings[gram]
+
+    def _find_substring(self, query: str) -> list:
+        """
+        Returns the lower cased titles which
+        contain the query.
+        """
+        if len(query) < GRAM_SIZE:
+            return [key for key in self.titles if query in key]
+        postings = sorted((self.postings.get(gram, ()) for gram in get_grams(query)),
+                          key=len)
+        if not postings[0]:
+            return list()
+        candidates = set(postings[0]).intersection(*postings[1:])
+        # trigrams don't keep the order, check the candidates
+        return [key for key in candidates if query in key]
+
+    def _find_fuzzy(self, query: str) -> dict:
+        """
+        Returns the lower cased titles which share
+        most of the trigrams of the query.
+        <- Return
+            dict → {title: score}
+        """
+        grams = get_padded_grams(query)
+        common = Counter()
+        for gram in grams:
+            common.update(self.postings.get(gram, ()))
+        scores = dict()
+        for key, count in common.items():
+            coverage = count / len(grams)
+            if coverage >= FUZZY_THRESHOLD:
+                # prefer the titles with similar length
+                dice = 2 * count / (len(grams) + self.grams_count[key])
+                scores[key] = (coverage + dice) / 2
+            elif GRAM_SIZE <= len(query) <= TYPO_QUERY_LENGTH:
+                score = self._score_typos(query, key)
+                if score:
+                    scores[key] = score
+        return scores
+
+    def _score_typos(self, query: str, key: str) -> float:
+        """
+        Returns the similarity of the query and the
+        closest word of the title(or the title), 0
+        if they have more typos than the length of
+        the query accepts.
+        """
+        limit = 1 if len(query) < TWO_TYPOS_LENGTH else 2
+        distance = min(get_edit_distance(query, word, limit)
+                       for word in {key, *key.split()})
+        if distance > limit:
+            return 0.0
+        return 1 - distance / len(query)
+
+    def _score_substring(self, query: str, key: str) -> float:
+        """
+        Rank of a title which contains the query,
+        exact match, prefix, start of a word and
+        then the other substrings.
+        """
+        if key == query:
+            return 1.0
+        if key.startswith(query):
+            return 0.9
+        if f" {query}" in key:
+            return 0.8
+        return 0.7
+
+    def search(self, query: str, limit: int = None) -> list:
+        """
+        Search the titles and rank them. Titles
+        which contain the query come first, the
+        typos are tolerated by the fuzzy match of
+        the trigrams.
+        ---------------------------------------
+        -> Params
+            query: str
+            limit: int
+        <- Return
+            list of (title, score, rows count)
+        """
+        query = query.strip().lower()
+        if not query:
+            return list()
+        scores = {key: self._score_substring(query, key)
+                  for key in self._find_substring(query)}
+        for key, score in self._find_fuzzy(query).items():
+            scores.setdefault(key, score * 0.6)
+        results = list()
+        for key, score in scores.items():
+            variants = self.titles[key]
+            title = max(variants, key=variants.get)
+            results.append((title, round(score, 3), sum(variants.values())))
+        results.sort(key=lambda result: (-result[1], -result[2], result[0]))
+        return results[:limit]
+
+    def match(self, query: str) -> set:
+        """
+        Returns the original titles which contain
+        the query, or the fuzzy matches when no
+        title contains it.
+        ---------------------------------------
+        -> Params
+            query: str
+        <- Return
+            set of str
+        """
+        query = query.strip().lower()
+        keys = self._find_substring(query)
+        if not keys:
+            keys = self._find_fuzzy(query)
+        titles = set()
+        for key in keys:
+            titles.update(self.titles[key])
+        return titles
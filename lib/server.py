@@ -0,0 +1,534 @@
+"""
+This module contains the local query server of the
+expenses. It keeps one DataHandler in the memory and
+answers the HTTP/JSON requests of the scripts and the
+other tools, so they don't load the data again. It
+only uses asyncio of the standard library and listens
+on localhost or a unix socket.
+
+@usage
+    python -m lib serve --port 8765
+    python -m lib serve --unix /tmp/expenses.sock
+    curl "http://127.0.0.1:8765/expenses?from=01-01-2024&category=food"
+    curl "http://127.0.0.1:8765/aggregate?by=month"
+    curl -d '{"title": "Meat", "price": 12.5, "date": "15-02-2024"}' \\
+         http://127.0.0.1:8765/expenses
+    curl "http://127.0.0.1:8765/export?format=csv" > expenses.csv
+
+@note
+    the expenses and exports are streamed as NDJSON(a
+    json object per line) or csv. The readers take a copy
+    of the expenses under a shared lock and stream it
+    after releasing it, the writes wait for the copies
+    and run one at a time. The DataHandler calls run in
+    a thread one at a time, so the file lock and the big
+    scans don't stop the other connections. Each
+    connection answers one request.
+"""
+import csv
+import json
+import asyncio
+from io import StringIO
+from datetime import datetime
+from typing import Callable
+from typing import Iterable
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
+from urllib.parse import parse_qsl
+from .cli import GROUP_KEYS
+from .cli import format_value
+from .cli import get_group_totals
+from .constants import DATE_FORMAT
+from .constants import EXPENSE_KEYS
+from .constants import TABLE_HEADERS
+from .constants import SERVER_HOST
+from .constants import SERVER_PORT
+from .data_handler import DataHandler
+from .budgets import BUDGET_MONEY_KEYS
+from .money import to_amount
+from .money import to_amounts
+from .dates import format_date
+from .dates import get_codec
+from .errors import GUIBaseException
+from .errors import InvalidRequestError
+from .errors import RouteNotFoundError
+from .errors import StorageLockedError
+from .interface.utils import log
+from .tracing import tracer
+
+__all__ = ["QueryServer", "ReadWriteLock", "serve"]
+
+# rows which are written to the socket before waiting for the client
+STREAM_CHUNK_SIZE = 500
+MAX_BODY_SIZE = 10 * 1024 * 1024
+
+STATUS_TEXTS = {200: "OK",
+                201: "Created",
+                400: "Bad Request",
+                404: "Not Found",
+                500: "Internal Server Error",
+                503: "Service Unavailable"}
+# the subclasses come before their base classes
+ERROR_STATUSES = [(RouteNotFoundError, 404),
+                  (InvalidRequestError, 400),
+                  (StorageLockedError, 503),
+                  (GUIBaseException, 400)]
+
+
+class ReadWriteLock:
+    """
+    asyncio lock of many readers or one writer. A
+    waiting writer stops the new readers, so a long
+    stream of reads doesn't starve the writes.
+    --------------------------------------------
+    @methods
+        read
+        write
+        is_free
+    """
+
+    def __init__(self) -> None:
+        self.condition = asyncio.Condition()
+        self.readers = 0
+        self.writing = False
+        self.waiting_writers = 0
+
+    @asynccontextmanager
+    async def read(self) -> None:
+        async with self.condition:
+            await self.condition.wait_for(
+                lambda: not self.writing and not self.waiting_writers)
+            self.readers += 1
+        try:
+            yield
+        finally:
+            async with self.condition:
+                self.readers -= 1
+                self.condition.notify_all()
+
+    @asynccontextmanager
+    async def write(self) -> None:
+        async with self.condition:
+            self.waiting_writers += 1
+            try:
+                await self.condition.wait_for(
+                    lambda: not self.writing and not self.readers)
+            finally:
+                self.waiting_writers -= 1
+            self.writing = True
+        try:
+            yield
+        finally:
+            async with self.condition:
+                self.writing = False
+                self.condition.notify_all()
+
+    def is_free(self) -> bool:
+        """
+        Returns True if nobody reads, writes or
+        waits for writing.
+        """
+        return not (self.readers or self.writing or self.waiting_writers)
+
+
+class Request:
+    """
+    Parsed HTTP request.
+    """
+    __slots__ = ("method", "path", "query", "body")
+
+    def __init__(self, method: str, path: str, query: dict, body: bytes) -> None:
+        self.method = method
+        self.path = path
+        self.query = query
+        self.body = body
+
+    def json(self) -> object:
+        """
+        Returns the decoded json body.
+        @raises
+            InvalidRequestError
+        """
+        try:
+            return json.loads(self.body)
+        except ValueError as error:
+            raise InvalidRequestError(f"Body must be json → {error}")
+
+
+class QueryServer:
+    """
+    Routes the requests to the shared DataHandler.
+    --------------------------------------------
+    @methods
+        handle
+        start
+    @routes
+        GET  /expenses   filtered expenses as NDJSON
+        GET  /aggregate  total or totals per group
+        POST /expenses   add an expense or a list of them
+        GET  /export     all the expenses as csv or NDJSON
+    """
+
+    def __init__(self, data_handler: DataHandler) -> None:
+        self.data_handler = data_handler
+        self.lock = ReadWriteLock()
+        # the readers load the partitions too, so the calls
+        # of the DataHandler don't run at the same time
+        self.handler_lock = asyncio.Lock()
+        # connections which their response is started
+        self.answered = set()
+        self.routes = {("GET", "/expenses"): self.filter_route,
+                       ("GET", "/aggregate"): self.aggregate_route,
+                       ("POST", "/expenses"): self.add_route,
+                       ("GET", "/export"): self.export_route}
+
+    async def start(self,
+                    host: str = SERVER_HOST,
+                    port: int = SERVER_PORT,
+                    unix_path: str = None) -> asyncio.AbstractServer:
+        """
+        Start listening, the unix socket is used
+        if its path is given.
+        """
+        if unix_path:
+            return await asyncio.start_unix_server(self.handle, path=unix_path)
+        return await asyncio.start_server(self.handle, host, port)
+
+    async def handle(self,
+                     reader: asyncio.StreamReader,
+                     writer: asyncio.StreamWriter) -> None:
+        """
+        Answer the request of a connection, the
+        errors are sent as their to_dict.
+        """
+        try:
+            request = await self.read_request(reader)
+            if request is None:
+                return
+            route = self.routes.get((request.method, request.path))
+            if route is None:
+                raise RouteNotFoundError(
+                    f"No route for {request.method} {request.path}")
+            await route(request, writer)
+        except GUIBaseException as error:
+            status = next(status for error_class, status in ERROR_STATUSES
+                          if isinstance(error, error_class))
+            await self.send_error(writer, error.to_dict(), status)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            # the client closed the connection
+            pass
+        except Exception as error:
+            log(error, error=error, level=2, color="red")
+            await self.send_error(writer,
+                                  {"error": str(error),
+                                   "type": error.__class__.__name__},
+                                  500)
+        finally:
+            self.answered.discard(writer)
+            writer.close()
+
+    async def send_error(self,
+                         writer: asyncio.StreamWriter,
+                         data: dict,
+                         status: int) -> None:
+        """
+        Send the error as the response. If the response
+        is already started(a failed stream) the
+        connection is only closed, the client finds
+        out the body is incomplete.
+        """
+        if writer not in self.answered:
+            await self.send_json(writer, data, status)
+
+    async def run(self, function: Callable, *args) -> any:
+        """
+        Run a DataHandler call in a thread, the other
+        connections are served while it waits for the
+        file lock or scans the expenses.
+        """
+        async with self.handler_lock:
+            return await asyncio.to_thread(function, *args)
+
+    async def read_request(self, reader: asyncio.StreamReader) -> Request:
+        """
+        Read the request line, headers and body.
+        <- Return
+            Request or None if the connection is
+            closed without a request
+        @raises
+            InvalidRequestError
+        """
+        line = await reader.readline()
+        if not line.strip():
+            return None
+        try:
+            method, target, _ = line.decode("latin-1").split()
+        except ValueError:
+            raise InvalidRequestError(f"Invalid request line → {line!r}")
+        headers = dict()
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise InvalidRequestError("Invalid Content-Length")
+        if length > MAX_BODY_SIZE:
+            raise InvalidRequestError(f"Body is bigger than {MAX_BODY_SIZE} bytes")
+        body = await reader.readexactly(length) if length else b""
+        url = urlsplit(target)
+        return Request(method.upper(),
+                       url.path.rstrip("/") or "/",
+                       dict(parse_qsl(url.query)),
+                       body)
+
+    async def send_json(self,
+                        writer: asyncio.StreamWriter,
+                        data: object,
+                        status: int = 200) -> None:
+        """
+        Send the data as a json response.
+        """
+        body = json.dumps(data, default=format_value).encode()
+        self.answered.add(writer)
+        writer.write(self.get_head(status, "application/json", len(body)) + body)
+        await writer.drain()
+
+    async def send_stream(self,
+                          writer: asyncio.StreamWriter,
+                          lines: Iterable,
+                          content_type: str = "application/x-ndjson") -> None:
+        """
+        Send the lines in chunks, the other requests
+        are served while the client reads a chunk.
+        The end of the body is the end of the
+        connection.
+        """
+        self.answered.add(writer)
+        writer.write(self.get_head(200, content_type))
+        chunk = list()
+        for line in lines:
+            chunk.append(line)
+            if len(chunk) >= STREAM_CHUNK_SIZE:
+                writer.write("".join(chunk).encode())
+                chunk = list()
+                await writer.drain()
+        writer.write("".join(chunk).encode())
+        await writer.drain()
+
+    def get_head(self, status: int, content_type: str, length: int = None) -> bytes:
+        """
+        Returns the status line and headers of the
+        response.
+        """
+        head = [f"HTTP/1.1 {status} {STATUS_TEXTS[status]}",
+                f"Content-Type: {content_type}",
+                "Connection: close"]
+        if length is not None:
+            head.append(f"Content-Length: {length}")
+        return ("\r\n".join(head) + "\r\n\r\n").encode("latin-1")
+
+    async def sync(self) -> None:
+        """
+        Read the changes of the other instances(GUI,
+        command line) before a read. It's skipped while
+        the expenses are used by the other requests.
+        """
+        if self.lock.is_free():
+            async with self.lock.write():
+                await self.run(self.data_handler.sync)
+
+    def get_filters(self, query: dict) -> dict:
+        """
+        Create the filters of the DataHandler.filter_data
+        from the query parameters(from, to, title,
+        category).
+        @raises
+            InvalidRequestError
+        """
+        filters = {"from_date": self.parse_date(query.get("from"), datetime.min),
+                   "to_date": self.parse_date(query.get("to"), datetime.max)}
+        if query.get("title"):
+            filters["title"] = query["title"]
+        if query.get("category"):
+            filters["category"] = query["category"]
+        return filters
+
+    def parse_date(self, value: str, default: datetime) -> datetime:
+        """
+        Convert a date parameter to datetime.
+        @raises
+            InvalidRequestError
+        """
+        if not value:
+            return default
+        try:
+            return get_codec().parse(value)
+        except ValueError:
+            raise InvalidRequestError(f"date must be in {DATE_FORMAT} format → {value}")
+
+    def parse_limit(self, query: dict) -> int:
+        """
+        Returns the limit parameter, None for no limit.
+        @raises
+            InvalidRequestError
+        """
+        try:
+            limit = int(query.get("limit") or 0)
+        except ValueError:
+            raise InvalidRequestError(f"limit must be a number → {query['limit']}")
+        return limit or None
+
+    async def filter_route(self, request: Request, writer: asyncio.StreamWriter) -> None:
+        """
+        Stream the filtered expenses as NDJSON.
+        """
+        filters = self.get_filters(request.query)
+        limit = self.parse_limit(request.query)
+
+        def filter_expenses() -> list:
+            with tracer.span("QueryServer.filter_route"):
+                return self.copy(self.data_handler.filter_data(filters)[:limit])
+        await self.sync()
+        async with self.lock.read():
+            expenses = await self.run(filter_expenses)
+        await self.send_stream(
+            writer,
+            (json.dumps(to_amounts(expense), default=format_value) + "\n"
+             for expense in expenses))
+
+    def copy(self, expenses: list) -> list:
+        """
+        Returns a copy of the expenses to stream after
+        releasing the lock, the edits of the other
+        instances change the expense objects.
+        """
+        return [dict(expense) for expense in expenses]
+
+    async def aggregate_route(self, request: Request, writer: asyncio.StreamWriter) -> None:
+        """
+        Send the total price and number of the
+        filtered expenses, for each group if the
+        by parameter is given.
+        """
+        filters = self.get_filters(request.query)
+        by = request.query.get("by")
+        if by is not None and by not in GROUP_KEYS:
+            raise InvalidRequestError(f"by must be one of {', '.join(GROUP_KEYS)} → {by}")
+
+        def aggregate() -> dict:
+            with tracer.span("QueryServer.aggregate_route"):
+                groups = None
+                if by:
+                    groups = self.data_handler.get_group_summary(dict(filters), by)
+                    if groups is None:
+                        groups = get_group_totals(
+                            self.data_handler.filter_data(dict(filters)), by)
+                    summary = (sum(group[1] for group in groups),
+                               sum(group[2] for group in groups))
+                else:
+                    summary = self.data_handler.get_range_summary(filters)
+                if summary is None:
+                    expenses = self.data_handler.filter_data(filters)
+                    summary = (self.data_handler.get_total_price(expenses), len(expenses))
+                data = {"total": to_amount(summary[0]), "count": summary[1]}
+                if groups is not None:
+                    data["by"] = by
+                    data["groups"] = [{"name": name, "total": to_amount(total), "count": count}
+                                      for name, total, count in groups]
+                return data
+        await self.sync()
+        async with self.lock.read():
+            data = await self.run(aggregate)
+        await self.send_json(writer, data)
+
+    async def add_route(self, request: Request, writer: asyncio.StreamWriter) -> None:
+        """
+        Add the expense of the body, a list of
+        expenses is added like an import. The keys
+        are the expense keys(title, price, quantity,
+        overall_price, category, date).
+        """
+        body = request.json()
+        items = body if isinstance(body, list) else [body]
+        if not items or not all(isinstance(item, dict) for item in items):
+            raise InvalidRequestError("Body must be an expense or a list of expenses")
+        rows = [{header: item.get(key) for header, key in zip(TABLE_HEADERS, EXPENSE_KEYS)}
+                for item in items]
+        async with self.lock.write():
+            with tracer.span("QueryServer.add_route"):
+                # the file lock can wait for the other instances
+                if isinstance(body, list):
+                    count = await self.run(self.data_handler.import_expenses, rows)
+                    alerts = list()
+                else:
+                    expense = self.data_handler.convert_table_row(rows[0])
+                    alerts = await self.run(self.data_handler.add_expense, expense)
+                    count = 1
+        alerts = [to_amounts(alert, BUDGET_MONEY_KEYS) for alert in alerts]
+        await self.send_json(writer, {"added": count, "alerts": alerts}, 201)
+
+    async def export_route(self, request: Request, writer: asyncio.StreamWriter) -> None:
+        """
+        Stream all the expenses as csv(default) or
+        NDJSON.
+        """
+        output_format = request.query.get("format", "csv")
+        if output_format not in ("csv", "ndjson"):
+            raise InvalidRequestError(f"format must be csv or ndjson → {output_format}")
+
+        def get_expenses() -> list:
+            with tracer.span("QueryServer.export_route"):
+                self.data_handler.load_all()
+                return self.copy(self.data_handler.get_all())
+        await self.sync()
+        async with self.lock.read():
+            expenses = await self.run(get_expenses)
+        if output_format == "ndjson":
+            lines = (json.dumps(to_amounts(expense), default=format_value) + "\n"
+                     for expense in expenses)
+            await self.send_stream(writer, lines)
+        else:
+            await self.send_stream(writer, self.iter_csv(expenses), "text/csv")
+
+    def iter_csv(self, expenses: list) -> Iterable:
+        """
+        Yield the csv lines of the expenses, the
+        first line is the headers.
+        """
+        buffer = StringIO()
+        csv_writer = csv.writer(buffer, quoting=csv.QUOTE_MINIMAL)
+        csv_writer.writerow(TABLE_HEADERS)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        for expense in expenses:
+            row = list(to_amounts(expense).values())
+            row[-1] = format_date(row[-1])
+            csv_writer.writerow(row)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+
+def serve(data_handler: DataHandler,
+          host: str = SERVER_HOST,
+          port: int = SERVER_PORT,
+          unix_path: str = None) -> None:
+    """
+    Run the query server until it's interrupted.
+    """
+    async def run() -> None:
+        server = await QueryServer(data_handler).start(host, port, unix_path)
+        address = unix_path or "http://{}:{}".format(*server.sockets[0].getsockname()[:2])
+        print(f"Serving expenses on {address}", flush=True)
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,111 @@
+"""
+This module contains the settings of the program. The
+config file is read once and its values are cached, the
+changes are saved to the file and sent to the callbacks
+of the changed keys, so the windows apply a new value
+without restarting. The file is read again only when
+it's changed by another program or window.
+
+@usage
+    settings = Settings(CONFIGS_FILE_PATH)
+    settings.subscribe("illustration_count", callback)
+    settings.update({"illustration_count": 200})
+"""
+from typing import Callable
+from collections import defaultdict
+from .interface.utils import load_json
+from .interface.utils import log
+from .storage import get_stat
+from .storage import write_atomic
+
+__all__ = ["Settings"]
+
+
+class Settings:
+    """
+    Cached values of the config file with change
+    notifications.
+    --------------------------------------------
+    @methods
+        get
+        update
+        subscribe
+        reload
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        ---------------------------------
+        -> Params
+            path: str → json file of the configs, it's
+                        created on the first update
+        """
+        self.path = path
+        self.values = dict()
+        self.stat = None
+        self.callbacks = defaultdict(list)
+        self.reload()
+
+    def get(self, key: str, default: object = None) -> object:
+        """
+        Returns the cached value of the key.
+        """
+        return self.values.get(key, default)
+
+    def subscribe(self, key: str, callback: Callable) -> None:
+        """
+        Call the callback with the new value when
+        the value of the key changes.
+        """
+        self.callbacks[key].append(callback)
+
+    def update(self, values: dict) -> dict:
+        """
+        Save the new values and notify the
+        callbacks of the changed keys.
+        ---------------------------------------
+        -> Params
+            values: dict
+        <- Return
+            dict → the changed values
+        """
+        changes = {key: value for key, value in values.items()
+                   if key not in self.values or self.values[key] != value}
+        if not changes:
+            return changes
+        self.values.update(changes)
+        write_atomic(self.path, self.values)
+        self.stat = get_stat(self.path)
+        self._notify(changes)
+        return changes
+
+    def reload(self) -> dict:
+        """
+        Read the file again if it's changed after
+        the last read or write.
+        <- Return
+            dict → the changed values
+        """
+        stat = get_stat(self.path)
+        if stat == self.stat:
+            return dict()
+        try:
+            values = load_json(self.path)
+        except FileNotFoundError:
+            values = dict()
+        except ValueError as error:
+            # the file is being written or edited by hand,
+            # the cached values are kept until it's valid
+            log(error, error=error, level=2, color="red")
+            return dict()
+        self.stat = stat
+        changes = {key: value for key, value in values.items()
+                   if key not in self.values or self.values[key] != value}
+        self.values = values
+        self._notify(changes)
+        return changes
+
+    def _notify(self, changes: dict) -> None:
+        for key, value in changes.items():
+            for callback in self.callbacks.get(key, ()):
+                callback(value)
@@ -0,0 +1,128 @@
+"""
+This module contains the sort orders of the table
+columns. The order of a column is the loaded expenses
+sorted by its values, it's sorted once on the first
+use and the added expenses are inserted at their
+place, so sorting a view only walks the cached order
+and picks the rows of the view.
+"""
+from bisect import bisect_left
+from bisect import insort
+from itertools import count
+from itertools import repeat
+from typing import Callable
+
+__all__ = ["ColumnOrders"]
+
+# a view this many times smaller than the loaded expenses
+# sorts its own rows instead of walking the whole order
+SMALL_VIEW_RATIO = 8
+
+
+def get_sort_key(key: str) -> Callable:
+    """
+    Returns the sort key of the expenses by the
+    values of the key, the texts are compared case
+    insensitive and the equal values by date.
+    """
+    if key == "date":
+        return lambda expense: expense["date"]
+    if key in ("title", "category"):
+        return lambda expense: (expense[key].casefold(), expense["date"])
+    return lambda expense: (expense[key], expense["date"])
+
+
+class ColumnOrders:
+    """
+    Ascending orders of the expenses for each
+    sorted column.
+    --------------------------------------------
+    @methods
+        build
+        add
+        remove
+        sort_rows
+
+    @note
+        the expenses of the same value and date are in
+        the order of adding, so the descending orders
+        have the later ones first like the expenses.
+    """
+
+    def __init__(self) -> None:
+        # key → expenses in ascending order of the key
+        self.orders = dict()
+        # key → sort key function
+        self.sort_keys = dict()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.orders
+
+    def build(self, key: str, expenses: list) -> None:
+        """
+        Create the order of the key.
+        ---------------------------------------
+        -> Params
+            key: str → one of EXPENSE_KEYS
+            expenses: list of dicts newest first
+        """
+        sort_key = self.sort_keys[key] = get_sort_key(key)
+        # the expenses of a day are the last added first
+        self.orders[key] = sorted(reversed(expenses), key=sort_key)
+
+    def add(self, expense: dict) -> None:
+        """
+        Insert a new expense to the orders.
+        """
+        for key, order in self.orders.items():
+            insort(order, expense, key=self.sort_keys[key])
+
+    def remove(self, expense: dict) -> None:
+        """
+        Remove an expense from the orders, it must
+        have the values which it was added with.
+        """
+        for key, order in self.orders.items():
+            sort_key = self.sort_keys[key]
+            index = bisect_left(order, sort_key(expense), key=sort_key)
+            while order[index] is not expense:
+                index += 1
+            del order[index]
+
+    def sort_rows(self,
+                  key: str,
+                  expenses: list,
+                  descending: bool = False) -> list:
+        """
+        Returns the rows of the view in the order
+        of the key. The order of the key must be
+        built.
+        ---------------------------------------
+        -> Params
+            key: str
+            expenses: list of dicts → rows of the view
+                                      newest first
+            descending: bool
+        <- Return
+            list of int → the row of each position
+        """
+        order = self.orders[key]
+        if len(expenses) * SMALL_VIEW_RATIO < len(order):
+            sort_key = self.sort_keys[key]
+            # the equal expenses keep the order of the orders
+            rows = range(len(expenses))
+            if not descending:
+                rows = reversed(rows)
+            return sorted(rows,
+                          key=lambda row: sort_key(expenses[row]),
+                          reverse=descending)
+        rows = dict(zip(map(id, expenses), count()))
+        if descending:
+            order = reversed(order)
+        # the expenses out of the view get None
+        permutation = [row for row in map(rows.pop, map(id, order), repeat(None))
+                       if row is not None]
+        # the rows which aren't loaded anymore(e.g. deleted by
+        # another window) stay at the end
+        permutation.extend(sorted(rows.values()))
+        return permutation
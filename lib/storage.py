@@ -0,0 +1,1012 @@
+"""
+This module contains the storages of the expenses.
+JsonStore: the expenses file is a snapshot(json object of
+the price unit and the expenses) and the changes after it are appended to a journal file
+next to it(one json operation per line), so adding,
+editing or deleting an expense writes a single line
+instead of rewriting the whole file. The journal is
+merged into the snapshot when it gets long.
+PartitionedStore: a directory of one json file per month
+and a manifest of their date ranges, counts and sums, so
+only the months of a date range are loaded and a change
+rewrites only its month.
+Both of them keep the compression codec of their files
+(see compression module), write under the lock of the
+data path(see locking module) and read only the changes
+of the other instances of the program on sync. The prices
+are saved in cents, the files of the older versions are
+converted once when they are opened(see money module).
+
+@note
+    the expenses don't have ids, the operations keep
+    the values of the changed expense and replaying
+    them changes an expense with the same values.
+    such expenses are indistinguishable, so it
+    doesn't matter which one of them is changed.
+"""
+import os
+import re
+from datetime import datetime
+from collections import defaultdict
+from typing import Iterable
+from bson.json_util import loads
+from bson.json_util import dumps
+from .interface.utils import load_json
+from .interface.utils import write_json
+from .interface.utils import iter_json_array
+from .interface.utils import write_json_array
+from .interface.utils import READ_CHUNK_SIZE
+from .interface.utils import log
+from .compression import detect_codec
+from .compression import get_codec
+from .compression import get_extension
+from .compression import strip_extension
+from .compression import check_codec
+from .compression import open_file
+from .locking import get_lock
+from .money import migrate_expense
+from .constants import EXPENSE_KEYS
+
+__all__ = ["JsonStore", "PartitionedStore", "open_store"]
+
+# number of the journal operations which makes the
+# next load merge them into the snapshot
+COMPACT_THRESHOLD = 1000
+# name of the partitions files, "%Y" for a file per year
+PARTITION_FORMAT = "%Y-%m"
+MANIFEST_FILE_NAME = "manifest.json"
+LOCK_FILE_NAME = ".lock"
+# unit of the prices in the manifest, the older
+# manifests don't have it and have float amounts
+MONEY_UNIT = "cents"
+# beginning of a json snapshot, the unit is written
+# before the expenses, so they're parsed in chunks
+SNAPSHOT_HEAD = re.compile(r'\s*\{\s*"money"\s*:\s*"(\w+)"\s*,\s*"expenses"\s*:\s*\[')
+
+
+def get_key(expense: dict) -> tuple:
+    """
+    Returns the values of the expense which
+    identify it in the journal.
+    """
+    return tuple(expense[key] for key in EXPENSE_KEYS)
+
+
+def get_stat(path: str) -> tuple:
+    """
+    Returns the size and modification time of the
+    file to find out it's changed, None if it
+    doesn't exist.
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def migrate_operation(operation: dict) -> bool:
+    """
+    Convert the amounts of a journal operation
+    of an older version to cents.
+    """
+    migrated = False
+    for key in ("expense", "changes"):
+        if key in operation:
+            migrated |= migrate_expense(operation[key])
+    return migrated
+
+
+def sort_expenses(expenses: list) -> list:
+    """
+    Sort the expenses newest first. Expenses of
+    the same day keep their order, so the added
+    ones have to be before the older ones.
+    """
+    return sorted(expenses, key=lambda expense: expense["date"], reverse=True)
+
+
+class JsonStore:
+    """
+    Snapshot and journal files of the expenses.
+    --------------------------------------------
+    @methods
+        load
+        read
+        load_more
+        sync
+        append
+        update
+        delete
+        compact
+        set_codec
+    """
+
+    def __init__(self, data_path: str) -> None:
+        """
+        ---------------------------------
+        -> Params
+            data_path: str
+                json file of the snapshot, the journal
+                is data_path + ".journal"
+        """
+        self.data_path = data_path
+        self.journal_path = f"{data_path}.journal"
+        self.operations_count = 0
+        # codec of the snapshot, existing files keep their codec
+        self.codec = get_codec(data_path)
+        self.lock = get_lock(f"{data_path}.lock")
+        # snapshot and bytes of the journal which are read
+        self.snapshot_id = None
+        self.journal_offset = 0
+        # expenses after the count of the load, they are
+        # already read for raising the count
+        self.older = list()
+
+    def _get_snapshot_id(self) -> dict:
+        """
+        Returns the size and modification time of the
+        snapshot. The journal keeps them to find out
+        it belongs to another snapshot(e.g. after the
+        compaction or when the file is replaced).
+        """
+        try:
+            stat = os.stat(self.data_path)
+        except FileNotFoundError:
+            return {"size": -1, "mtime": 0}
+        return {"size": stat.st_size, "mtime": stat.st_mtime_ns}
+
+    def _is_journal_finished(self) -> bool:
+        """
+        Checks the last line of the journal is
+        finished by a new line.
+        """
+        with open(self.journal_path, "rb") as file:
+            if not file.seek(0, os.SEEK_END):
+                return True
+            file.seek(-1, os.SEEK_END)
+            return file.read(1) == b"\n"
+
+    def _read_journal(self, offset: int = 0, remove: bool = True) -> list:
+        """
+        Returns the operations of the journal after
+        the offset(bytes). An unfinished last line
+        (crash while writing) isn't read. A journal of
+        another snapshot is removed if remove is True.
+        """
+        try:
+            with open(self.journal_path, "rb") as file:
+                file.seek(offset)
+                data = file.read()
+        except FileNotFoundError:
+            self.journal_offset = 0
+            return list()
+        end = data.rfind(b"\n") + 1
+        self.journal_offset = offset + end
+        lines = data[:end].decode().splitlines()
+        if offset == 0:
+            if not lines:
+                return list()
+            try:
+                header = loads(lines.pop(0))
+            except ValueError:
+                header = None
+            if not header or header.get("snapshot") != self._get_snapshot_id():
+                log(f"Journal doesn't belong to {self.data_path}, it's ignored.",
+                    color="yellow")
+                if remove:
+                    os.remove(self.journal_path)
+                self.journal_offset = 0
+                return list()
+        operations = list()
+        for line in filter(None, lines):
+            try:
+                operations.append(loads(line))
+            except ValueError:
+                log(f"Invalid journal line is ignored → {line[:80]}", color="yellow")
+        return operations
+
+    def _replay(self, expenses: list, operations: list) -> list:
+        """
+        Apply the journal operations on the snapshot
+        expenses. Only the expenses which have the
+        same date as a changed one are compared.
+        """
+        targets = {get_key(operation["expense"])
+                   for operation in operations if operation["op"] != "add"}
+        dates = {key[-1] for key in targets}
+        candidates = defaultdict(list)
+        for expense in expenses:
+            if expense["date"] in dates:
+                key = get_key(expense)
+                if key in targets:
+                    candidates[key].append(expense)
+        added = list()
+        removed = set()
+        for operation in operations:
+            expense = operation["expense"]
+            if operation["op"] != "add":
+                rows = candidates.get(get_key(expense))
+                if not rows:
+                    log(f"Journal operation on a missing expense → {expense}",
+                        color="yellow")
+                    continue
+                removed.add(id(rows.pop()))
+                if operation["op"] == "delete":
+                    continue
+                expense = {**expense, **operation["changes"]}
+            added.append(expense)
+            key = get_key(expense)
+            if key in targets:
+                candidates[key].append(expense)
+        # the later operations are first among the same date
+        added.reverse()
+        expenses = [expense for expense in added + expenses
+                    if id(expense) not in removed]
+        return sort_expenses(expenses)
+
+    def load(self, count: int = None) -> list:
+        """
+        Load the snapshot and apply the journal on it.
+        ---------------------------------------
+        -> Params
+            count: int → number of the latest expenses,
+                         None for all
+        <- Return
+            list of dicts → newest first
+        """
+        with self.lock:
+            try:
+                self.codec = detect_codec(self.data_path)
+            except FileNotFoundError:
+                pass
+            self.snapshot_id = self._get_snapshot_id()
+            expenses, operations, migrated = self._read()
+            self.operations_count = len(operations)
+            if operations:
+                expenses = self._replay(expenses, operations)
+            else:
+                # older files aren't sorted, sort is linear for sorted ones
+                expenses = sort_expenses(expenses)
+            if migrated:
+                log(f"Prices of {self.data_path} are converted to cents.",
+                    color="cyan")
+            if migrated or self.operations_count >= COMPACT_THRESHOLD:
+                self.compact(expenses)
+        self.older = expenses[count:] if count is not None else list()
+        return expenses[:count]
+
+    def _read(self, remove: bool = True) -> tuple:
+        """
+        Returns the expenses of the snapshot and the
+        operations of its journal in cents. The older
+        snapshots are an array of the expenses with
+        amounts, the newer ones keep the unit.
+        <- Return
+            tuple → (expenses, operations, True if
+                     they are converted)
+        """
+        try:
+            expenses, unit = load_snapshot(self.data_path)
+        except FileNotFoundError:
+            expenses, unit = list(), MONEY_UNIT
+        operations = self._read_journal(remove=remove)
+        if unit == MONEY_UNIT:
+            return expenses, operations, False
+        # both of them are converted, so the journal
+        # still finds its expenses in the snapshot
+        for expense in expenses:
+            migrate_expense(expense)
+        for operation in operations:
+            migrate_operation(operation)
+        return expenses, operations, True
+
+    def read(self) -> list:
+        """
+        Returns all the expenses of the snapshot and
+        the journal without changing the files, the
+        older prices are converted in the memory. It's
+        used to copy the file(e.g. partitioning), the
+        source stays a usable backup.
+        <- Return
+            list of dicts → newest first
+        """
+        expenses, operations, _ = self._read(remove=False)
+        if operations:
+            return self._replay(expenses, operations)
+        return sort_expenses(expenses)
+
+    def load_more(self, count: int) -> list:
+        """
+        Returns the next older expenses after the
+        loaded ones from the memory.
+        ---------------------------------------
+        -> Params
+            count: int → number of the expenses
+        <- Return
+            list of dicts or None if they are changed by
+            another instance and must be loaded again
+        """
+        if self.older is None:
+            return None
+        expenses = self.older[:count]
+        del self.older[:count]
+        return expenses
+
+    def sync(self) -> list:
+        """
+        Returns the operations which the other instances
+        appended to the journal after the last read or
+        write, only the new lines are read.
+        <- Return
+            list of dicts → journal operations or None if
+                            the snapshot is replaced(e.g.
+                            compacted) and the expenses
+                            have to be loaded again
+        """
+        with self.lock:
+            if self._get_snapshot_id() != self.snapshot_id:
+                return None
+            size = (get_stat(self.journal_path) or (0, 0))[0]
+            if size == self.journal_offset:
+                return list()
+            if size < self.journal_offset:
+                return None
+            operations = self._read_journal(self.journal_offset)
+            if operations and self.older:
+                # the operations of the older expenses aren't applied
+                self.older = None
+            self.operations_count += len(operations)
+            return operations
+
+    def get_watch_paths(self) -> list:
+        """
+        Returns the files and directories which are
+        changed by the writes of the other instances.
+        """
+        return [self.data_path,
+                self.journal_path,
+                os.path.dirname(os.path.abspath(self.data_path))]
+
+    def load_range(self,
+                   from_date: datetime,
+                   to_date: datetime,
+                   exclude: Iterable = ()) -> list:
+        """
+        Returns the expenses of the date range which
+        are older than the loaded count, they are
+        already read from the file.
+        <- Return
+            list of dicts → newest first or None if they
+                            are changed by another instance
+                            and must be loaded again
+        """
+        if self.older is None:
+            return None
+        expenses = [expense for expense in self.older
+                    if from_date <= expense["date"] <= to_date]
+        if expenses:
+            self.older = [expense for expense in self.older
+                          if not from_date <= expense["date"] <= to_date]
+        return expenses
+
+    def load_dates(self, dates: Iterable) -> list:
+        """
+        The whole file is loaded at once, there are
+        no more expenses to load.
+        """
+        return list()
+
+    def get_summary(self, from_date: datetime, to_date: datetime) -> tuple:
+        """
+        There are no unloaded partitions to sum.
+        """
+        return 0, 0, list()
+
+    def get_groups(self,
+                   from_date: datetime,
+                   to_date: datetime,
+                   by: str,
+                   category: str = None) -> list:
+        """
+        The expenses are grouped in the memory.
+        """
+        return None
+
+    def _write(self, operations: Iterable) -> None:
+        """
+        Append the operations to the journal.
+        """
+        lines = list()
+        for operation in operations:
+            lines.append(dumps(operation))
+            self.operations_count += 1
+        with self.lock:
+            if not os.path.exists(self.journal_path):
+                lines.insert(0, dumps({"snapshot": self._get_snapshot_id()}))
+            elif not self._is_journal_finished():
+                # the unfinished line of a crash stays a separate line
+                lines.insert(0, "")
+            with open(self.journal_path, "a") as file:
+                file.write("\n".join(lines) + "\n")
+                file.flush()
+                os.fsync(file.fileno())
+            self.journal_offset = os.path.getsize(self.journal_path)
+
+    def append(self, expenses: Iterable) -> None:
+        """
+        Save the new expenses.
+        """
+        self._write({"op": "add", "expense": expense} for expense in expenses)
+
+    def update(self, expense: dict, changes: dict) -> None:
+        """
+        Save the changes of an expense.
+        ---------------------------------------
+        -> Params
+            expense: dict → values before the changes
+            changes: dict
+        """
+        self._write(({"op": "update", "expense": expense, "changes": changes},))
+
+    def delete(self, expenses: Iterable) -> None:
+        """
+        Save the removal of the expenses.
+        """
+        self._write({"op": "delete", "expense": expense} for expense in expenses)
+
+    def compact(self, expenses: list) -> None:
+        """
+        Write all the expenses as the new snapshot
+        and remove the journal.
+        ---------------------------------------
+        -> Params
+            expenses: list → all the expenses
+        """
+        with self.lock:
+            write_atomic(self.data_path, expenses, self.codec, write_snapshot)
+            self.snapshot_id = self._get_snapshot_id()
+            # the journal doesn't match the new snapshot
+            # anymore, so a crash here can't apply it twice.
+            if os.path.exists(self.journal_path):
+                os.remove(self.journal_path)
+            self.journal_offset = 0
+        self.operations_count = 0
+
+    def set_codec(self, codec: str) -> None:
+        """
+        Rewrite the snapshot with the compression
+        codec(None for plain json).
+        @raises
+            UnsupportedCompressionError
+        """
+        check_codec(codec)
+        with self.lock:
+            expenses = self.load()
+            self.codec = codec
+            self.compact(expenses)
+
+
+def write_atomic(path: str, data: any, codec: str = None, write: callable = write_json) -> None:
+    """
+    Write the json file through a temporary file,
+    so a crash doesn't leave a half written file.
+    """
+    temp_path = f"{path}.tmp"
+    write(temp_path, data, codec)
+    os.replace(temp_path, path)
+
+
+def load_snapshot(path: str) -> tuple:
+    """
+    Returns the expenses of the json snapshot and
+    the unit of their prices. The snapshots of the
+    older versions are an array of the expenses
+    without a unit.
+    <- Return
+        tuple → (list of dicts, str or None)
+    @raises
+        FileNotFoundError, ValueError
+    """
+    with open_file(path, "r") as file:
+        text = file.read(READ_CHUNK_SIZE)
+        match = SNAPSHOT_HEAD.match(text)
+        if match:
+            return list(iter_json_array(file, text[match.end() - 1:])), match.group(1)
+        if text.lstrip().startswith("["):
+            return list(iter_json_array(file, text)), None
+        snapshot = loads(text + file.read())
+        return snapshot["expenses"], snapshot.get("money")
+
+
+def write_snapshot(path: str, expenses: list, codec: str = None) -> None:
+    """
+    Write the expenses in cents as a json snapshot.
+    """
+    with open_file(path, "w", codec) as file:
+        file.write(f'{{"money": "{MONEY_UNIT}", "expenses": ')
+        write_json_array(file, expenses)
+        file.write("}")
+
+
+class PartitionedStore:
+    """
+    Directory of the expenses partitioned by month.
+    --------------------------------------------
+    @methods
+        load
+        load_more
+        load_range
+        get_partitions
+        get_summary
+        sync
+        append
+        update
+        delete
+        create
+        migrate
+        set_codec
+    """
+
+    def __init__(self,
+                 directory: str,
+                 partition_format: str = PARTITION_FORMAT,
+                 codec: str = None) -> None:
+        """
+        ---------------------------------
+        -> Params
+            directory: str
+            partition_format: str
+                date format of the partition names,
+                only used for the new directories
+            codec: str
+                compression of the partitions, only
+                used for the new directories
+        """
+        self.directory = directory
+        self.manifest_path = os.path.join(directory, MANIFEST_FILE_NAME)
+        self.lock = get_lock(os.path.join(directory, LOCK_FILE_NAME))
+        self.manifest_stat = get_stat(self.manifest_path)
+        try:
+            manifest = load_json(self.manifest_path)
+        except FileNotFoundError:
+            manifest = {"format": partition_format,
+                        "codec": codec,
+                        "money": MONEY_UNIT,
+                        "partitions": dict()}
+        self.partition_format = manifest["format"]
+        self.codec = manifest.get("codec")
+        # name → min_date, max_date, count, total
+        self.manifest = manifest["partitions"]
+        # name → expenses of the loaded partitions
+        self.partitions = dict()
+        # name → stat of the loaded partitions files
+        self.stats = dict()
+        if manifest.get("money") != MONEY_UNIT:
+            self.migrate()
+
+    def get_name(self, date: datetime) -> str:
+        """
+        Returns the partition name of the date.
+        """
+        return date.strftime(self.partition_format)
+
+    def _get_path(self, name: str) -> str:
+        return os.path.join(self.directory, f"{name}.json{get_extension(self.codec)}")
+
+    def get_partitions(self,
+                       from_date: datetime,
+                       to_date: datetime) -> list:
+        """
+        Returns the names of the partitions which
+        have expenses in the date range.
+        """
+        return [name for name, info in self.manifest.items()
+                if info["min_date"] <= to_date and info["max_date"] >= from_date]
+
+    def _load_partitions(self, names: Iterable) -> list:
+        """
+        Load the partitions which aren't loaded yet.
+        <- Return
+            list of dicts → expenses of the partitions
+        """
+        expenses = list()
+        with self.lock:
+            for name in names:
+                if name in self.partitions:
+                    continue
+                path = self._get_path(name)
+                try:
+                    partition = load_json(path)
+                except FileNotFoundError:
+                    log(f"Partition {name} is missing.", color="yellow")
+                    partition = list()
+                self.partitions[name] = partition
+                self.stats[name] = get_stat(path)
+                expenses.extend(partition)
+        return sort_expenses(expenses)
+
+    def load(self, count: int = None) -> list:
+        """
+        Load the latest partitions.
+        ---------------------------------------
+        -> Params
+            count: int → number of the latest expenses,
+                         None for all. The partitions are
+                         loaded completely, so it may load
+                         more expenses.
+        <- Return
+            list of dicts → newest first
+        """
+        names = list()
+        loaded = 0
+        for name in sorted(self.manifest, reverse=True):
+            if count is not None and loaded >= count:
+                break
+            names.append(name)
+            loaded += self.manifest[name]["count"]
+        return self._load_partitions(names)
+
+    def load_more(self, count: int) -> list:
+        """
+        Load the latest partitions which aren't
+        loaded until they have count expenses.
+        ---------------------------------------
+        -> Params
+            count: int → number of the expenses
+        <- Return
+            list of dicts → the new expenses, newest first
+        """
+        names = list()
+        loaded = 0
+        for name in sorted(self.manifest, reverse=True):
+            if loaded >= count:
+                break
+            if name in self.partitions:
+                continue
+            names.append(name)
+            loaded += self.manifest[name]["count"]
+        return self._load_partitions(names)
+
+    def load_range(self,
+                   from_date: datetime,
+                   to_date: datetime,
+                   exclude: Iterable = ()) -> list:
+        """
+        Load the partitions of the date range which
+        aren't loaded yet.
+        ---------------------------------------
+        -> Params
+            from_date: datetime
+            to_date: datetime
+            exclude: Iterable → names of the partitions
+                                which aren't needed
+        <- Return
+            list of dicts → the new expenses, newest first
+        """
+        exclude = set(exclude)
+        return self._load_partitions(name for name in self.get_partitions(from_date, to_date)
+                                     if name not in exclude)
+
+    def load_dates(self, dates: Iterable) -> list:
+        """
+        Load the partitions of the dates which aren't
+        loaded yet, they have to be loaded before
+        changing them.
+        <- Return
+            list of dicts → the new expenses, newest first
+        """
+        names = {self.get_name(date) for date in dates}
+        return self._load_partitions(name for name in names if name in self.manifest)
+
+    def get_summary(self,
+                    from_date: datetime,
+                    to_date: datetime) -> tuple:
+        """
+        Returns the sums of the partitions which
+        aren't loaded and are completely in the date
+        range from the manifest.
+        <- Return
+            tuple → (total price, total items, names)
+        """
+        total_price = total_items = 0
+        names = list()
+        for name in self.get_partitions(from_date, to_date):
+            info = self.manifest[name]
+            if name in self.partitions or info["min_date"] < from_date or \
+               info["max_date"] > to_date:
+                continue
+            total_price += info["total"]
+            total_items += info["count"]
+            names.append(name)
+        return total_price, total_items, names
+
+    def get_groups(self,
+                   from_date: datetime,
+                   to_date: datetime,
+                   by: str,
+                   category: str = None) -> list:
+        """
+        The partitions are grouped in the memory
+        after they are loaded.
+        """
+        return None
+
+    def sync(self) -> list:
+        """
+        Returns the changes which the other instances
+        saved after the last read or write. Only the
+        loaded partitions which their file is changed
+        are read again, the new partitions are loaded.
+        <- Return
+            list of dicts → add and delete operations of
+                            the expenses(like the journal),
+                            a manifest operation when only
+                            the totals of the unloaded
+                            partitions changed or None if
+                            the directory is
+                            rewritten with another codec
+                            and it has to be loaded again
+        """
+        with self.lock:
+            stat = get_stat(self.manifest_path)
+            if stat == self.manifest_stat:
+                return list()
+            try:
+                manifest = load_json(self.manifest_path)
+            except FileNotFoundError:
+                return None
+            if manifest["format"] != self.partition_format or \
+               manifest.get("codec") != self.codec or \
+               manifest.get("money") != MONEY_UNIT:
+                return None
+            self.manifest_stat = stat
+            old_names = set(self.manifest)
+            self.manifest = manifest["partitions"]
+            operations = list()
+            for name in list(self.partitions):
+                if name not in self.manifest:
+                    self.stats.pop(name, None)
+                    operations.extend({"op": "delete", "expense": expense}
+                                      for expense in self.partitions.pop(name))
+                elif get_stat(self._get_path(name)) != self.stats.get(name):
+                    operations.extend(self._reload_partition(name))
+            new_names = [name for name in self.manifest
+                         if name not in old_names and name not in self.partitions]
+            operations.extend({"op": "add", "expense": expense}
+                              for expense in self._load_partitions(new_names))
+        return operations or [{"op": "manifest"}]
+
+    def _reload_partition(self, name: str) -> list:
+        """
+        Read the changed partition again, the expenses
+        which didn't change keep their objects.
+        <- Return
+            list of dicts → delete and add operations
+        """
+        path = self._get_path(name)
+        self.stats[name] = get_stat(path)
+        try:
+            expenses = load_json(path)
+        except FileNotFoundError:
+            expenses = list()
+        old = defaultdict(list)
+        for expense in self.partitions[name]:
+            old[get_key(expense)].append(expense)
+        partition = list()
+        added = list()
+        for expense in expenses:
+            same = old.get(get_key(expense))
+            if same:
+                partition.append(same.pop())
+            else:
+                partition.append(expense)
+                added.append({"op": "add", "expense": expense})
+        self.partitions[name] = partition
+        removed = [{"op": "delete", "expense": expense}
+                   for expenses in old.values() for expense in expenses]
+        return removed + added
+
+    def get_watch_paths(self) -> list:
+        """
+        Returns the files and directories which are
+        changed by the writes of the other instances.
+        """
+        return [self.manifest_path, self.directory]
+
+    def _write_partitions(self, names: Iterable) -> None:
+        """
+        Rewrite the files of the partitions and
+        update their manifest.
+        """
+        with self.lock:
+            for name in set(names):
+                partition = self.partitions[name] = sort_expenses(self.partitions[name])
+                path = self._get_path(name)
+                if not partition:
+                    self.manifest.pop(name, None)
+                    self.stats.pop(name, None)
+                    if os.path.exists(path):
+                        os.remove(path)
+                    continue
+                write_atomic(path, partition, self.codec)
+                self.stats[name] = get_stat(path)
+                self.manifest[name] = {
+                    "min_date": partition[-1]["date"],
+                    "max_date": partition[0]["date"],
+                    "count": len(partition),
+                    "total": sum(expense["overall_price"] for expense in partition)}
+            write_atomic(self.manifest_path, {"format": self.partition_format,
+                                              "codec": self.codec,
+                                              "money": MONEY_UNIT,
+                                              "partitions": self.manifest})
+            self.manifest_stat = get_stat(self.manifest_path)
+
+    def _get_partition(self, name: str) -> list:
+        """
+        Returns the expenses of the partition, it's
+        loaded if it isn't loaded yet.
+        @note
+            the caller has to load the partition before
+            changing it, otherwise its expenses are
+            only in the store.
+        """
+        if name not in self.partitions:
+            if name in self.manifest:
+                self._load_partitions((name,))
+            else:
+                self.partitions[name] = list()
+        return self.partitions[name]
+
+    def _remove(self, expense: dict) -> str:
+        """
+        Remove the expense from its partition, an
+        expense with the same values is removed if
+        the object isn't in it(e.g. the changes of
+        another instance).
+        <- Return
+            str → name of the partition
+        @note
+            the object is removed when there are
+            duplicates, otherwise the data handler
+            and the partition keep different objects
+            and the later changes of the remaining
+            one aren't saved.
+        """
+        name = self.get_name(expense["date"])
+        partition = self._get_partition(name)
+        index = next((index for index, item in enumerate(partition) if item is expense),
+                     None)
+        if index is None:
+            index = next((index for index, item in enumerate(partition) if item == expense),
+                         None)
+        if index is None:
+            log(f"Expense is missing in partition {name} → {expense}",
+                color="yellow")
+        else:
+            del partition[index]
+        return name
+
+    def append(self, expenses: Iterable) -> None:
+        """
+        Save the new expenses, only their partitions
+        are rewritten.
+        """
+        names = list()
+        for expense in expenses:
+            name = self.get_name(expense["date"])
+            # the added expenses are first among the same date
+            self._get_partition(name).insert(0, expense)
+            names.append(name)
+        self._write_partitions(names)
+
+    def update(self, expense: dict, changes: dict) -> None:
+        """
+        Save the changes of an expense, it's moved
+        to another partition if its date changed.
+        ---------------------------------------
+        -> Params
+            expense: dict → values before the changes
+            changes: dict
+        """
+        # the partitions keep the same objects as the data
+        # handler, so the changes are already applied on them
+        changed = {**expense, **changes}
+        name = self.get_name(expense["date"])
+        new_name = self.get_name(changed["date"])
+        if new_name != name:
+            # the changed object is still in its old partition
+            partition = self._get_partition(name)
+            for index, item in enumerate(partition):
+                if item == changed:
+                    changed = partition.pop(index)
+                    break
+            self._get_partition(new_name).insert(0, changed)
+        self._write_partitions((name, new_name))
+
+    def delete(self, expenses: Iterable) -> None:
+        """
+        Save the removal of the expenses.
+        """
+        self._write_partitions([self._remove(expense) for expense in expenses])
+
+    def create(self, expenses: Iterable) -> None:
+        """
+        Write the expenses as the partitions of a
+        new directory.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        self.partitions = defaultdict(list)
+        for expense in expenses:
+            self.partitions[self.get_name(expense["date"])].append(expense)
+        self.partitions = dict(self.partitions)
+        self._write_partitions(self.partitions)
+
+    def migrate(self) -> None:
+        """
+        Convert the amounts of the partitions of an
+        older version to cents, all of them are
+        rewritten once.
+        """
+        with self.lock:
+            manifest = load_json(self.manifest_path)
+            self.manifest_stat = get_stat(self.manifest_path)
+            self.manifest = manifest["partitions"]
+            if manifest.get("money") == MONEY_UNIT:
+                # converted by another instance
+                return
+            log(f"Prices of {self.directory} are converted to cents.", color="cyan")
+            names = list(self.manifest)
+            self._load_partitions(names)
+            for name in names:
+                for expense in self.partitions[name]:
+                    migrate_expense(expense)
+            self._write_partitions(names)
+        # the data handler loads the partitions it needs
+        self.partitions = dict()
+        self.stats = dict()
+
+    def set_codec(self, codec: str) -> None:
+        """
+        Rewrite the partitions with the compression
+        codec(None for plain json).
+        @raises
+            UnsupportedCompressionError
+        @note
+            the data handler has to load all the
+            partitions before it.
+        """
+        check_codec(codec)
+        with self.lock:
+            names = list(self.manifest)
+            self._load_partitions(names)
+            old_paths = {self._get_path(name) for name in names}
+            self.codec = codec
+            self._write_partitions(names)
+            for path in old_paths - {self._get_path(name) for name in names}:
+                os.remove(path)
+
+
+def open_store(data_path: str) -> object:
+    """
+    Returns the storage of the path, json files
+    use JsonStore, MongoDB connection strings use
+    MongoStore and the directories use
+    PartitionedStore. A directory which doesn't
+    exist is created from the json file with the
+    same name(data → data.json) if it exists.
+    """
+    if data_path.startswith(("mongodb://", "mongodb+srv://")):
+        # pymongo client is only imported for the databases
+        from .mongo_store import MongoStore
+        return MongoStore.from_uri(data_path)
+    if strip_extension(data_path).endswith(".json"):
+        return JsonStore(data_path)
+    store = PartitionedStore(data_path)
+    source = f"{data_path}.json"
+    if not os.path.exists(store.manifest_path) and os.path.exists(source):
+        log(f"Partitioning {source} → {data_path}", color="cyan")
+        store.create(JsonStore(source).read())
+        # the directory is read again like the next runs
+        store = PartitionedStore(data_path)
+    return store
@@ -0,0 +1,75 @@
+"""
+This module contains the symbol table which
+interns the repeated strings of the expenses
+(categories and titles). Each distinct value is
+kept once and has an integer code, so the loaded
+expenses share the same string objects and the
+columnar structures store the codes.
+"""
+from sys import getsizeof
+from typing import Callable
+
+__all__ = ["SymbolTable"]
+
+
+class SymbolTable:
+    """
+    Two way mapping between the distinct values
+    and their codes.
+    --------------------------------------------
+    @methods
+        intern
+        code
+        value
+        match
+    """
+    __slots__ = ("codes", "values", "saved_bytes")
+
+    def __init__(self) -> None:
+        # value → code
+        self.codes = dict()
+        # code → value
+        self.values = list()
+        # size of the duplicate strings which are
+        # replaced by the interned ones
+        self.saved_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __contains__(self, value: str) -> bool:
+        return value in self.codes
+
+    def code(self, value: str) -> int:
+        """
+        Returns the code of the value, new values
+        get the next code.
+        """
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def intern(self, value: str) -> str:
+        """
+        Returns the shared object of the value.
+        """
+        canonical = self.values[self.code(value)]
+        if canonical is not value:
+            self.saved_bytes += getsizeof(value)
+        return canonical
+
+    def value(self, code: int) -> str:
+        """
+        Returns the value of the code.
+        """
+        return self.values[code]
+
+    def match(self, function: Callable) -> set:
+        """
+        Returns the values which the function
+        returns True for them, the function is
+        called once per distinct value.
+        """
+        return {value for value in self.values if function(value)}
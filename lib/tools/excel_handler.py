@@ -2,7 +2,8 @@
 This module is about working with an excel file.
 """
 from os.path import exists
-from win32com.client import Dispatch
+from itertools import islice
+from typing import Callable
 from typing import Generator
 from typing import Any
 
@@ -51,6 +52,16 @@ class NotFoundSheetError(ExcelHandlerBaseException):
     Raises when couldn't find the desired sheet.
     """
 
+def com_dispatch(name: str) -> object:
+    """
+    Create the COM object of the given program.
+    win32com is imported here because it's only
+    available on windows.
+    """
+    from win32com.client import Dispatch
+    return Dispatch(name)
+
+
 class ExcelHandler:
     """
     This class contains all the tools to open
@@ -67,17 +78,37 @@ class ExcelHandler:
         fetch_range
         get_as_dict
         update_cell
+        add_data
         save
         save_as
         close
     
     @note
         better to use this class as context manager.
+        each call on the excel objects is a cross
+        process round trip, so data is moved in
+        blocks of rows with a single Range.Value.
     """
     EMPTY_ROWS_TOLERANCE = 5
+    COLUMNS_PROBE_SIZE = 64
     def __init__(self,
-                 dev: bool = False) -> None:
-        self.excel_app = Dispatch("Excel.Application")
+                 dev: bool = False,
+                 dispatch: Callable = com_dispatch,
+                 chunk_size: int = 1000) -> None:
+        """
+        ---------------------------------
+        -> Params
+            dev: bool
+                show the excel app
+            dispatch: Callable
+                creates the excel app object, the
+                FakeExcelApplication can be used
+                instead of the COM object.
+            chunk_size: int
+                number of rows in each read/write block
+        """
+        self.excel_app = dispatch("Excel.Application")
+        self.chunk_size = chunk_size
         self.rows_count = 0
         if dev:
             self.excel_app.Visible = 1
@@ -123,51 +154,72 @@ class ExcelHandler:
         for sheet_number in range(1, total_sheets_count + 1):
             self.sheet = self.work_book.Sheets(sheet_number)
             if self.sheet.name == sheet_name:
-                break
+                return
         raise NotFoundSheetError("Desired sheet is not in the file.")
 
+    def get_range(self, start: tuple, end: tuple) -> object:
+        """
+        Returns the range object between the
+        start and end cells.
+        ----------------------------------------
+        -> Params
+            start: tuple → (1, 1)
+            end: tuple → (14556, 3)
+        """
+        return self.sheet.Range(self.sheet.Cells(*start),
+                                self.sheet.Cells(*end))
+
     def get_columns_count(self) -> int:
         """
-        Loop through the first row and count
-        the number of columns until it faces
-        empty column and stops. Then return
+        Read the first row in blocks of columns
+        and count the number of columns until it
+        faces empty column and stops. Then return
         the counter as number of columns.
-        so line order null
         """
         column_count = 0
         while True:
-            if self.sheet.Cells(1, column_count + 1).value:
+            start = column_count + 1
+            end = column_count + self.COLUMNS_PROBE_SIZE
+            row = self.get_range((1, start), (1, end)).value[0]
+            for value in row:
+                if not value:
+                    return column_count
                 column_count += 1
-                continue
-            break
-        return column_count
     
+    def _is_empty_row(self, row: int, columns_count: int) -> bool:
+        """
+        Checks whether the row is empty or not.
+        """
+        row_data = self.get_range((row, 1),
+                                  (row, columns_count)).value[0]
+        return not any(row_data)
+
     def _calculate_rows_count(self,
                              columns_count: int,
                              rows_count: int = 1,
                              stride: int = 1000) -> None:
         """
-        Recursive method to find the last row in
-        the file.
+        Find the last row in the file. It jumps
+        forward by stride until it faces an empty
+        row, then binary searches between the last
+        filled row and the empty row.
         ----------------------------------------
         -> Params
             columns_count: int
             rows_count: int
             stride: int
         """
-        if stride == 0:
-            self.rows_count = rows_count - 1
-            return
-        row_data = self.sheet.Range(
-                            self.sheet.Cells(rows_count, 1),
-                            self.sheet.Cells(rows_count, columns_count))
-        row_data = row_data.value[0]
-        if any(row_data):
-            rows_count += stride       
-        else:
-            stride //= 2
-            rows_count -= stride
-        self._calculate_rows_count(columns_count, rows_count, stride)
+        last_filled = rows_count - 1
+        while not self._is_empty_row(rows_count, columns_count):
+            last_filled = rows_count
+            rows_count += stride
+        while rows_count - last_filled > 1:
+            middle = (rows_count + last_filled) // 2
+            if self._is_empty_row(middle, columns_count):
+                rows_count = middle
+            else:
+                last_filled = middle
+        self.rows_count = last_filled
 
     def check_empty_rows(self, columns_count: int) -> int:
         """
@@ -185,10 +237,8 @@ class ExcelHandler:
         rows_count = self.rows_count + 1
         while empty_rows_faced_coount < self.EMPTY_ROWS_TOLERANCE:
             rows_count += 1
-            row_data = self.sheet.Range(
-                            self.sheet.Cells(rows_count, 1),
-                            self.sheet.Cells(rows_count, columns_count))
-            row_data = row_data.value[0]
+            row_data = self.get_range((rows_count, 1),
+                                      (rows_count, columns_count)).value[0]
             if any(row_data):
                 empty_rows_faced_coount = 0
                 continue
@@ -238,15 +288,23 @@ class ExcelHandler:
     def fetch_range(self, start: tuple, end: tuple) -> Generator:
         """
         Fetch data from sepcific positions range
-        in the file.
+        in the file. Rows are read in blocks of
+        chunk_size rows.
         ----------------------------------------
         -> Params
             start: tuple → (1, 1)
             end: tuple → (14556, 3)
         """
-        range_object = self.sheet.Range(self.sheet.Cells(*start),
-                                        self.sheet.Cells(*end))
-        yield from range_object.value
+        start_row, start_column = start
+        end_row, end_column = end
+        for row in range(start_row, end_row + 1, self.chunk_size):
+            last_row = min(row + self.chunk_size - 1, end_row)
+            value = self.get_range((row, start_column),
+                                   (last_row, end_column)).value
+            if not isinstance(value, tuple):
+                # a single cell range returns the value itself
+                value = ((value,),)
+            yield from value
 
     def get_as_dict(self, 
                     headers: tuple,
@@ -270,17 +328,41 @@ class ExcelHandler:
         """
         self.sheet.Cells(*cell_position).value = value
     
-    def add_data(self, data: list) -> None:
+    def update_range(self, start: tuple, rows: list) -> None:
         """
-        Add data to the current active sheet.
-        Data must be list of list(tuple).
+        Write a 2-D block of values to the active
+        sheet with a single Range.Value assignment.
+        Short rows are padded with None.
+        ------------------------------------------
+        -> Params
+            start: tuple → (5, 1)
+            rows: list of list(tuple)
+        """
+        columns_count = max(len(row) for row in rows)
+        block = tuple(tuple(row) + (None,) * (columns_count - len(row))
+                      for row in rows)
+        start_row, start_column = start
+        end = (start_row + len(block) - 1, start_column + columns_count - 1)
+        self.get_range(start, end).value = block
+
+    def add_data(self, data: list, start: tuple = (1, 1)) -> None:
+        """
+        Add data to the current active sheet in
+        blocks of chunk_size rows.
+        Data must be list(generator) of list(tuple).
         -------------------------------------
         -> Params
             data: list
+            start: tuple
         """
-        for row_index, row in enumerate(data, start=1):
-            for column_index, column in enumerate(row, start=1):
-                self.update_cell((row_index, column_index), column)
+        data = iter(data)
+        row_index, column_index = start
+        while True:
+            rows = list(islice(data, self.chunk_size))
+            if not rows:
+                break
+            self.update_range((row_index, column_index), rows)
+            row_index += len(rows)
 
     def save(self) -> None:
         """
@@ -304,7 +386,6 @@ class ExcelHandler:
         del self.excel_app
 
 if __name__ == "__main__":
-    import time
     from os import getcwd
     root = getcwd()
     with ExcelHandler() as handler:
@@ -0,0 +1,275 @@
+"""
+This module contains an in memory stand-in
+for the Excel COM objects. It implements the
+part of the Excel object model which is used
+by ExcelHandler and counts every call as a
+round trip, so ExcelHandler can be used and
+measured without Excel(on linux).
+
+@usage
+    app = FakeExcelApplication()
+    with ExcelHandler(dispatch=app.dispatch) as handler:
+        handler.create_new()
+        handler.add_data(rows)
+    app.round_trips
+"""
+from os.path import exists
+from typing import Any
+from .xlsx_handler import XlsxReader
+from .xlsx_handler import XlsxWriter
+
+__version__ = "1.0"
+__all__ = ["FakeExcelApplication", "fake_dispatch"]
+
+
+class FakeCell:
+    """
+    Position of a cell in a sheet.
+    """
+
+    def __init__(self, sheet: object, row: int, column: int) -> None:
+        self.sheet = sheet
+        self.row = row
+        self.column = column
+
+    @property
+    def value(self) -> Any:
+        self.sheet.app.round_trips += 1
+        return self.sheet.cells.get((self.row, self.column))
+
+    @value.setter
+    def value(self, value: Any) -> None:
+        self.sheet.app.round_trips += 1
+        self.sheet.set_cell(self.row, self.column, value)
+
+    Value = value
+
+
+class FakeRange:
+    """
+    Rectangle of cells between two cells. Like
+    Excel, the value of a single cell range is
+    the value itself and the value of other
+    ranges is a tuple of row tuples.
+    """
+
+    def __init__(self, sheet: object, start: FakeCell, end: FakeCell) -> None:
+        self.sheet = sheet
+        self.start = (min(start.row, end.row), min(start.column, end.column))
+        self.end = (max(start.row, end.row), max(start.column, end.column))
+
+    @property
+    def value(self) -> Any:
+        self.sheet.app.round_trips += 1
+        (start_row, start_column), (end_row, end_column) = self.start, self.end
+        cells = self.sheet.cells
+        if self.start == self.end:
+            return cells.get(self.start)
+        return tuple(
+            tuple(cells.get((row, column))
+                  for column in range(start_column, end_column + 1))
+            for row in range(start_row, end_row + 1))
+
+    @value.setter
+    def value(self, value: Any) -> None:
+        self.sheet.app.round_trips += 1
+        start_row, start_column = self.start
+        end_row, end_column = self.end
+        if not isinstance(value, (tuple, list)):
+            value = [[value] * (end_column - start_column + 1)] * (end_row - start_row + 1)
+        for row_index, row in enumerate(value[:end_row - start_row + 1]):
+            for column_index, cell in enumerate(row[:end_column - start_column + 1]):
+                self.sheet.set_cell(start_row + row_index,
+                                    start_column + column_index,
+                                    cell)
+
+    Value = value
+
+
+class FakeSheet:
+    """
+    A sheet which keeps the non-empty cells
+    in a dict of (row, column) → value.
+    """
+
+    def __init__(self, app: object, name: str) -> None:
+        self.app = app
+        self.name = name
+        self.cells = dict()
+
+    def set_cell(self, row: int, column: int, value: Any) -> None:
+        """
+        Set or remove(empty value) a cell.
+        """
+        if value is None or value == "":
+            self.cells.pop((row, column), None)
+            return
+        self.cells[(row, column)] = value
+
+    def Cells(self, row: int, column: int) -> FakeCell:
+        self.app.round_trips += 1
+        return FakeCell(self, row, column)
+
+    def Range(self, start: FakeCell, end: FakeCell = None) -> FakeRange:
+        self.app.round_trips += 1
+        return FakeRange(self, start, end or start)
+
+    def get_rows(self) -> list:
+        """
+        Returns the cells of the sheet as rows
+        from A1 to the last used cell.
+        """
+        if not self.cells:
+            return list()
+        rows_count = max(row for row, _ in self.cells)
+        columns_count = max(column for _, column in self.cells)
+        return [[self.cells.get((row, column))
+                 for column in range(1, columns_count + 1)]
+                for row in range(1, rows_count + 1)]
+
+
+class FakeSheets:
+    """
+    Collection of the sheets of a work book.
+    """
+
+    def __init__(self, app: object) -> None:
+        self.app = app
+        self.items = list()
+
+    def __call__(self, index: int) -> FakeSheet:
+        self.app.round_trips += 1
+        return self.items[index - 1]
+
+    @property
+    def Count(self) -> int:
+        self.app.round_trips += 1
+        return len(self.items)
+
+    def Add(self, name: str = None) -> FakeSheet:
+        self.app.round_trips += 1
+        sheet = FakeSheet(self.app, name or f"Sheet{len(self.items) + 1}")
+        self.items.append(sheet)
+        return sheet
+
+
+class FakeWorkbook:
+    """
+    A work book which is saved and opened
+    as xlsx file.
+    """
+
+    def __init__(self, app: object, file_path: str = None) -> None:
+        self.app = app
+        self.file_path = file_path
+        self.Sheets = FakeSheets(app)
+
+    def load(self, file_path: str) -> None:
+        """
+        Load the sheets of an xlsx file.
+        """
+        with XlsxReader() as reader:
+            reader.open_excel(file_path)
+            for name in reader.get_sheet_names():
+                reader.set_sheet(name)
+                sheet = FakeSheet(self.app, name)
+                for row_index, row in enumerate(reader.fetch_all(skip_empty_rows=False),
+                                                start=1):
+                    for column_index, value in enumerate(row, start=1):
+                        sheet.set_cell(row_index, column_index, value)
+                self.Sheets.items.append(sheet)
+
+    def Save(self) -> None:
+        self.SaveAs(self.file_path)
+
+    def SaveAs(self, file_path: str) -> None:
+        self.app.round_trips += 1
+        with XlsxWriter() as writer:
+            writer.create_new()
+            for sheet in self.Sheets.items:
+                writer.add_data(sheet.get_rows(),
+                                has_headers=False,
+                                sheet_name=sheet.name)
+            writer.save_as(file_path)
+        self.file_path = file_path
+
+    def Close(self) -> None:
+        self.app.round_trips += 1
+        self.app.Workbooks.remove(self)
+
+
+class FakeWorkbooks:
+    """
+    Collection of the open work books.
+    """
+
+    def __init__(self, app: object) -> None:
+        self.app = app
+        self.items = list()
+
+    def __call__(self, index: int) -> FakeWorkbook:
+        self.app.round_trips += 1
+        return self.items[index - 1]
+
+    def Add(self) -> FakeWorkbook:
+        self.app.round_trips += 1
+        work_book = FakeWorkbook(self.app)
+        work_book.Sheets.items.append(FakeSheet(self.app, "Sheet1"))
+        self.items.append(work_book)
+        return work_book
+
+    def open(self, file_path: str) -> FakeWorkbook:
+        self.app.round_trips += 1
+        work_book = FakeWorkbook(self.app, file_path)
+        if exists(file_path):
+            work_book.load(file_path)
+        self.items.append(work_book)
+        return work_book
+
+    Open = open
+
+    def remove(self, work_book: FakeWorkbook) -> None:
+        """
+        Remove a closed work book.
+        """
+        if work_book in self.items:
+            self.items.remove(work_book)
+
+
+class FakeExcelApplication:
+    """
+    In memory stand-in for Excel.Application.
+    round_trips is the number of calls which
+    would cross the process boundary with COM.
+    """
+
+    def __init__(self) -> None:
+        self.round_trips = 0
+        self.Visible = 0
+        self.Workbooks = FakeWorkbooks(self)
+
+    @property
+    def WorkBooks(self) -> FakeWorkbooks:
+        return self.Workbooks
+
+    @property
+    def ActiveWorkbook(self) -> FakeWorkbook:
+        self.round_trips += 1
+        if not self.Workbooks.items:
+            return None
+        return self.Workbooks.items[-1]
+
+    def dispatch(self, name: str) -> object:
+        """
+        Dispatch function for ExcelHandler which
+        returns this application.
+        """
+        return self
+
+
+def fake_dispatch(name: str) -> FakeExcelApplication:
+    """
+    Dispatch function for ExcelHandler which
+    creates a new fake application.
+    """
+    return FakeExcelApplication()
@@ -0,0 +1,331 @@
+"""
+This module contains an in memory stand-in for
+a pymongo Collection. It implements the part of
+the Collection which is used by MongoStore(the
+queries, projections, sorts and the aggregation
+stages of its pipelines), so MongoStore can be
+tested without a server.
+
+@usage
+    collection = FakeCollection()
+    store = MongoStore(collection)
+    store.append(expenses)
+    collection.requests
+
+@note
+    the documents are compared as python values,
+    the order of the mixed types of MongoDB isn't
+    implemented.
+"""
+import re
+from datetime import datetime
+from itertools import islice
+from typing import Any
+from typing import Iterable
+from bson import ObjectId
+from pymongo import DeleteOne
+from pymongo import InsertOne
+from pymongo import UpdateOne
+
+__version__ = "1.0"
+__all__ = ["FakeCollection"]
+
+# python types of the $type names
+TYPES = {
+    "double": float,
+    "int": int,
+    "long": int,
+    "string": str,
+    "date": datetime,
+    "bool": bool,
+    "objectId": ObjectId,
+}
+COMPARISONS = {
+    "$eq": lambda value, other: value == other,
+    "$ne": lambda value, other: value != other,
+    "$gt": lambda value, other: value > other,
+    "$gte": lambda value, other: value >= other,
+    "$lt": lambda value, other: value < other,
+    "$lte": lambda value, other: value <= other,
+    "$in": lambda value, other: value in other,
+}
+MISSING = object()
+
+
+def match_type(value: Any, name: str) -> bool:
+    """
+    Returns True if the value is the BSON type.
+    """
+    if isinstance(value, bool):
+        return name == "bool"
+    return isinstance(value, TYPES[name])
+
+
+def match_field(value: Any, condition: Any) -> bool:
+    """
+    Returns True if the value of a field meets
+    the condition of the query.
+    """
+    if not (isinstance(condition, dict)
+            and condition
+            and all(key.startswith("$") for key in condition)):
+        return value is not MISSING and value == condition
+    for operator, other in condition.items():
+        if operator == "$exists":
+            if (value is not MISSING) != bool(other):
+                return False
+        elif operator == "$options":
+            continue
+        elif value is MISSING:
+            return False
+        elif operator == "$type":
+            if not match_type(value, other):
+                return False
+        elif operator == "$regex":
+            flags = re.IGNORECASE if "i" in condition.get("$options", "") else 0
+            if not isinstance(value, str) or not re.search(other, value, flags):
+                return False
+        elif not COMPARISONS[operator](value, other):
+            return False
+    return True
+
+
+def match(document: dict, query: dict) -> bool:
+    """
+    Returns True if the document meets the query.
+    """
+    for key, condition in query.items():
+        if key == "$or":
+            if not any(match(document, other) for other in condition):
+                return False
+        elif key == "$and":
+            if not all(match(document, other) for other in condition):
+                return False
+        elif not match_field(document.get(key, MISSING), condition):
+            return False
+    return True
+
+
+def project(document: dict, projection: dict = None) -> dict:
+    """
+    Returns a copy of the document with the
+    fields of the projection.
+    """
+    if not projection:
+        return dict(document)
+    included = [key for key, value in projection.items() if value and key != "_id"]
+    if not included:
+        return {key: value for key, value in document.items()
+                if projection.get(key, 1)}
+    result = {key: document[key] for key in included if key in document}
+    if projection.get("_id", 1):
+        result["_id"] = document["_id"]
+    return result
+
+
+def evaluate(expression: Any, document: dict) -> Any:
+    """
+    Returns the value of an aggregation
+    expression for the document.
+    """
+    if isinstance(expression, str) and expression.startswith("$"):
+        return document.get(expression[1:])
+    if isinstance(expression, dict) and "$dateToString" in expression:
+        options = expression["$dateToString"]
+        return evaluate(options["date"], document).strftime(options["format"])
+    return expression
+
+
+def sort_documents(documents: list, keys: list) -> list:
+    """
+    Returns the documents sorted by the keys of
+    (field, direction), the first key first.
+    """
+    documents = list(documents)
+    for key, direction in reversed(keys):
+        documents.sort(key=lambda document: document[key], reverse=direction < 0)
+    return documents
+
+
+class FakeCursor:
+    """
+    Result of find, the sort, skip and limit
+    are applied when it's iterated.
+    """
+
+    def __init__(self, documents: list, projection: dict = None) -> None:
+        self.documents = documents
+        self.projection = projection
+        self.keys = list()
+        self.skipped = 0
+        self.limited = 0
+
+    def sort(self, keys: Any, direction: int = None) -> object:
+        if isinstance(keys, str):
+            keys = [(keys, direction or 1)]
+        self.keys = list(keys)
+        return self
+
+    def skip(self, count: int) -> object:
+        self.skipped = count
+        return self
+
+    def limit(self, count: int) -> object:
+        self.limited = count
+        return self
+
+    def __iter__(self) -> Iterable:
+        documents = sort_documents(self.documents, self.keys)
+        end = self.skipped + self.limited if self.limited else None
+        for document in islice(documents, self.skipped, end):
+            yield project(document, self.projection)
+
+
+class FakeCollection:
+    """
+    In memory collection of documents.
+    --------------------------------------------
+    @methods
+        create_index
+        index_information
+        find
+        count_documents
+        aggregate
+        insert_many
+        update_one
+        delete_one
+        bulk_write
+
+    @note
+        requests counts the calls like the round
+        trips of a server.
+    """
+
+    def __init__(self) -> None:
+        self.documents = list()
+        self.indexes = {"_id_": [("_id", 1)]}
+        self.requests = 0
+
+    def create_index(self, keys: list) -> str:
+        self.requests += 1
+        name = "_".join(f"{key}_{direction}" for key, direction in keys)
+        self.indexes.setdefault(name, list(keys))
+        return name
+
+    def index_information(self) -> dict:
+        return {name: {"key": keys} for name, keys in self.indexes.items()}
+
+    def _find_first(self, query: dict) -> int:
+        """
+        Returns the index of the first document of
+        the query, None if nothing matches.
+        """
+        for index, document in enumerate(self.documents):
+            if match(document, query):
+                return index
+        return None
+
+    def find(self, query: dict = None, projection: dict = None) -> FakeCursor:
+        self.requests += 1
+        documents = [document for document in self.documents
+                     if match(document, query or {})]
+        return FakeCursor(documents, projection)
+
+    def count_documents(self, query: dict) -> int:
+        self.requests += 1
+        return sum(1 for document in self.documents if match(document, query))
+
+    def aggregate(self, pipeline: list) -> list:
+        """
+        Run the $match, $group, $sort and $limit
+        stages of the pipeline.
+        """
+        self.requests += 1
+        documents = self.documents
+        for stage in pipeline:
+            (operator, options), = stage.items()
+            if operator == "$match":
+                documents = [document for document in documents
+                             if match(document, options)]
+            elif operator == "$group":
+                documents = self._group(documents, options)
+            elif operator == "$sort":
+                documents = sort_documents(documents, list(options.items()))
+            elif operator == "$limit":
+                documents = documents[:options]
+            else:
+                raise NotImplementedError(f"{operator} stage isn't implemented.")
+        return [dict(document) for document in documents]
+
+    def _group(self, documents: list, options: dict) -> list:
+        """
+        Returns the groups of the $group stage, the
+        accumulators are $sum.
+        """
+        groups = dict()
+        for document in documents:
+            key = evaluate(options["_id"], document)
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = {"_id": key}
+                for name in options:
+                    if name != "_id":
+                        group[name] = 0
+            for name, accumulator in options.items():
+                if name == "_id":
+                    continue
+                (operator, expression), = accumulator.items()
+                if operator != "$sum":
+                    raise NotImplementedError(f"{operator} isn't implemented.")
+                value = evaluate(expression, document)
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    group[name] += value
+        return list(groups.values())
+
+    def _insert(self, document: dict) -> None:
+        # like pymongo, the _id is added to the given document
+        document.setdefault("_id", ObjectId())
+        self.documents.append(dict(document))
+
+    def insert_many(self, documents: Iterable, ordered: bool = True) -> None:
+        self.requests += 1
+        for document in documents:
+            self._insert(document)
+
+    def _update(self, query: dict, update: dict) -> None:
+        index = self._find_first(query)
+        if index is None:
+            return
+        for operator, changes in update.items():
+            if operator != "$set":
+                raise NotImplementedError(f"{operator} isn't implemented.")
+            self.documents[index].update(changes)
+
+    def update_one(self, query: dict, update: dict) -> None:
+        self.requests += 1
+        self._update(query, update)
+
+    def _delete(self, query: dict) -> None:
+        index = self._find_first(query)
+        if index is not None:
+            del self.documents[index]
+
+    def delete_one(self, query: dict) -> None:
+        self.requests += 1
+        self._delete(query)
+
+    def bulk_write(self, operations: list, ordered: bool = True) -> None:
+        """
+        Run the InsertOne, UpdateOne and DeleteOne
+        operations with one request.
+        """
+        self.requests += 1
+        for operation in operations:
+            if isinstance(operation, InsertOne):
+                self._insert(operation._doc)
+            elif isinstance(operation, UpdateOne):
+                self._update(operation._filter, operation._doc)
+            elif isinstance(operation, DeleteOne):
+                self._delete(operation._filter)
+            else:
+                raise NotImplementedError(f"{type(operation).__name__} isn't implemented.")
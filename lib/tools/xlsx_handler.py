@@ -0,0 +1,763 @@
+"""
+This module is about reading and writing xlsx
+files without Excel. An xlsx file is a zip of
+xml parts, so rows can be streamed into the
+sheet xml one by one with constant memory.
+"""
+import re
+import shutil
+from os.path import exists
+from posixpath import join
+from posixpath import normpath
+from zipfile import ZipFile
+from zipfile import ZIP_DEFLATED
+from tempfile import TemporaryFile
+from datetime import date
+from datetime import datetime
+from datetime import timedelta
+from xml.etree.ElementTree import iterparse
+from xml.etree.ElementTree import parse
+from typing import Generator
+from typing import Iterable
+from typing import Any
+
+__version__ = "1.0"
+__all__ = ["XlsxWriter", "XlsxReader"]
+
+EXCEL_EPOCH = datetime(1899, 12, 30)
+DATE_STYLE_INDEX = 1
+MAX_SHEET_NAME_LENGTH = 31
+INVALID_XML_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+CELL_REFERENCE = re.compile(r"([A-Z]+)(\d+)")
+DATE_FORMAT_CODE = re.compile(r"[dmyhs]", re.IGNORECASE)
+# builtin number formats of excel which are dates
+BUILTIN_DATE_FORMATS = set(range(14, 23)) | {45, 46, 47}
+
+MAIN_NAMESPACE = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+RELATIONSHIP_NAMESPACE = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+PACKAGE_RELATIONSHIP_NAMESPACE = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+CONTENT_TYPES_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '<Override PartName="/xl/sharedStrings.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>'
+    '{sheets}'
+    '</Types>'
+)
+CONTENT_TYPE_SHEET_XML = (
+    '<Override PartName="/xl/worksheets/sheet{index}.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+)
+ROOT_RELS_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+WORKBOOK_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets>{sheets}</sheets>'
+    '</workbook>'
+)
+WORKBOOK_SHEET_XML = '<sheet name="{name}" sheetId="{index}" r:id="rId{index}"/>'
+WORKBOOK_RELS_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '{sheets}'
+    '<Relationship Id="rId{styles}" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>'
+    '<Relationship Id="rId{strings}" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings" Target="sharedStrings.xml"/>'
+    '</Relationships>'
+)
+WORKBOOK_SHEET_REL_XML = (
+    '<Relationship Id="rId{index}" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet{index}.xml"/>'
+)
+STYLES_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<numFmts count="1"><numFmt numFmtId="164" formatCode="{date_format}"/></numFmts>'
+    '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/></cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+SHEET_HEADER_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<dimension ref="{dimension}"/>'
+    '<sheetData>'
+)
+SHEET_FOOTER_XML = '</sheetData></worksheet>'
+SHARED_STRINGS_HEADER_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'count="{count}" uniqueCount="{unique_count}">'
+)
+SHARED_STRINGS_FOOTER_XML = '</sst>'
+
+
+class XlsxHandlerBaseException(Exception):
+    """
+    Custom base class for the exceptions
+    """
+    def __init__(self, message: str = None):
+        super().__init__(message)
+        self.message = message
+
+    def __str__(self) -> str:
+        return f"{self.message}"
+
+    def __len__(self) -> int:
+        return len(self.message)
+
+    @property
+    def error_message(self) -> str:
+        """
+        Return exception error_message
+        """
+        return self.message
+
+    def to_dict(self) -> dict:
+        """
+        return error message as dictionary.
+        make it easier for the to pass error
+        in RestApi
+        """
+        return {"error": self.message,
+                "type": self.__class__.__name__}
+
+
+class NotCreatedWorkbookError(XlsxHandlerBaseException):
+    """
+    Raises when data is added before creating
+    the work book.
+    """
+
+class NotFoundExcelFileError(XlsxHandlerBaseException):
+    """
+    Raises when couldn't find the desired file.
+    """
+
+class NotFoundSheetError(XlsxHandlerBaseException):
+    """
+    Raises when couldn't find the desired sheet.
+    """
+
+
+def escape(value: str) -> str:
+    """
+    Escape the xml special characters of a text
+    or attribute value.
+    """
+    return (value.replace("&", "&amp;")
+                 .replace("<", "&lt;")
+                 .replace(">", "&gt;")
+                 .replace('"', "&quot;"))
+
+
+def column_letter(column_index: int) -> str:
+    """
+    Convert 1-based column index to excel
+    column letters(1 → A, 27 → AA).
+    """
+    letters = ""
+    while column_index:
+        column_index, remainder = divmod(column_index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def column_index(letters: str) -> int:
+    """
+    Convert excel column letters to 1-based
+    column index(A → 1, AA → 27).
+    """
+    index = 0
+    for letter in letters:
+        index = index * 26 + ord(letter) - 64
+    return index
+
+
+def parse_reference(reference: str) -> tuple:
+    """
+    Convert a cell reference like C12 to
+    (row, column) → (12, 3).
+    """
+    letters, row = CELL_REFERENCE.match(reference).groups()
+    return int(row), column_index(letters)
+
+
+def from_excel_serial(serial: float) -> datetime:
+    """
+    Convert the excel serial number to
+    datetime.
+    """
+    return EXCEL_EPOCH + timedelta(days=serial)
+
+
+def to_excel_serial(value: date) -> float:
+    """
+    Convert date or datetime to the excel
+    serial number(days since 1899-12-30).
+    """
+    if not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    value = value.replace(tzinfo=None)
+    delta = value - EXCEL_EPOCH
+    return delta.days + delta.seconds / 86400
+
+
+class XlsxSheet:
+    """
+    Keeps the rows of a sheet in a temporary
+    file until the work book is saved. The
+    dimension of the sheet must be written
+    before its rows, so the rows are spooled
+    and copied into the zip at the end.
+    """
+
+    def __init__(self, name: str, index: int) -> None:
+        self.name = name
+        self.index = index
+        self.rows_count = 0
+        self.columns_count = 0
+        self.file = TemporaryFile()
+
+    def write_row(self, cells: str, columns_count: int) -> None:
+        """
+        Append a row xml to the sheet.
+        ------------------------------------
+        -> Params
+            cells: str
+            columns_count: int
+        """
+        self.rows_count += 1
+        self.columns_count = max(self.columns_count, columns_count)
+        row = f'<row r="{self.rows_count}">{cells}</row>'
+        self.file.write(row.encode("utf-8"))
+
+    def get_dimension(self) -> str:
+        """
+        Returns the used range of the sheet
+        like A1:F120.
+        """
+        if not self.rows_count:
+            return "A1"
+        last_column = column_letter(self.columns_count)
+        return f"A1:{last_column}{self.rows_count}"
+
+    def close(self) -> None:
+        """
+        Remove the temporary file.
+        """
+        self.file.close()
+
+
+class XlsxWriter:
+    """
+    This class writes an xlsx file without
+    Excel. Strings are saved in the shared
+    strings table, numbers and dates are
+    saved as typed cells.
+
+    @methods
+        create_new
+        add_data
+        add_row
+        save_as
+        close
+
+    @note
+        it has the same usage as ExcelHandler
+        and better to use it as context manager.
+    """
+    DEFAULT_SHEET_NAME = "Expenses"
+
+    def __init__(self,
+                 split_by_month: bool = False,
+                 date_column: int = -1,
+                 date_format: str = "dd-mm-yyyy") -> None:
+        """
+        ---------------------------------
+        -> Params
+            split_by_month: bool
+                create one sheet per month based
+                on the date column
+            date_column: int
+                index of the date in each row
+            date_format: str
+                excel format code of the date cells
+        """
+        self.split_by_month = split_by_month
+        self.date_column = date_column
+        self.date_format = date_format
+        self.sheets = None
+
+    def __enter__(self) -> object:
+        return self
+
+    def __exit__(self, *args) -> object:
+        self.close()
+
+    def create_new(self) -> None:
+        """
+        Reset the work book.
+        """
+        self.close()
+        self.sheets = dict()
+        self.headers = None
+        self.shared_strings = dict()
+        self.strings_count = 0
+
+    def _get_sheet(self, name: str) -> XlsxSheet:
+        """
+        Returns the sheet by the name and create
+        it if doesn't exist.
+        """
+        sheet = self.sheets.get(name)
+        if sheet is None:
+            sheet = XlsxSheet(name, len(self.sheets) + 1)
+            self.sheets[name] = sheet
+            if self.headers:
+                self._write_row(sheet, self.headers)
+        return sheet
+
+    def _string_index(self, value: str) -> int:
+        """
+        Returns the index of the string in the
+        shared strings table.
+        """
+        self.strings_count += 1
+        index = self.shared_strings.get(value)
+        if index is None:
+            index = len(self.shared_strings)
+            self.shared_strings[value] = index
+        return index
+
+    def _cell(self, reference: str, value: Any) -> str:
+        """
+        Returns the xml of a cell based on the
+        type of the value.
+        """
+        if value is None:
+            return ""
+        if isinstance(value, bool):
+            return f'<c r="{reference}" t="b"><v>{int(value)}</v></c>'
+        if isinstance(value, (int, float)):
+            return f'<c r="{reference}"><v>{value!r}</v></c>'
+        if isinstance(value, date):
+            serial = to_excel_serial(value)
+            return (f'<c r="{reference}" s="{DATE_STYLE_INDEX}">'
+                    f'<v>{serial!r}</v></c>')
+        index = self._string_index(str(value))
+        return f'<c r="{reference}" t="s"><v>{index}</v></c>'
+
+    def _write_row(self, sheet: XlsxSheet, row: list) -> None:
+        """
+        Convert the row values to cells and
+        write them into the sheet.
+        """
+        row_number = sheet.rows_count + 1
+        cells = "".join(
+            self._cell(f"{column_letter(column)}{row_number}", value)
+            for column, value in enumerate(row, start=1))
+        sheet.write_row(cells, len(row))
+
+    def get_sheet_name(self, row: list) -> str:
+        """
+        Returns the sheet name of the row. If the
+        split by month is active, it is the year
+        and month of the date column.
+        """
+        if not self.split_by_month:
+            return self.DEFAULT_SHEET_NAME
+        row_date = row[self.date_column]
+        if isinstance(row_date, date):
+            return row_date.strftime("%Y-%m")
+        return self.DEFAULT_SHEET_NAME
+
+    def add_row(self, row: list, sheet_name: str = None) -> None:
+        """
+        Add a row to the work book.
+        ------------------------------------
+        -> Params
+            row: list
+            sheet_name: str
+                by default it's based on split_by_month
+        """
+        if self.sheets is None:
+            raise NotCreatedWorkbookError("Work book is not created.")
+        sheet = self._get_sheet(sheet_name or self.get_sheet_name(row))
+        self._write_row(sheet, row)
+
+    def add_data(self,
+                 data: Iterable,
+                 has_headers: bool = True,
+                 sheet_name: str = None) -> None:
+        """
+        Add data to the work book. Data must be
+        list(generator) of list(tuple) and the
+        first row is the headers which repeats
+        on top of each sheet.
+        -------------------------------------
+        -> Params
+            data: Iterable
+            has_headers: bool
+            sheet_name: str
+        """
+        data = iter(data)
+        if has_headers:
+            self.headers = next(data, None)
+            if sheet_name or not self.split_by_month:
+                # headers are written on creation of the sheet
+                self._get_sheet(sheet_name or self.DEFAULT_SHEET_NAME)
+        for row in data:
+            self.add_row(row, sheet_name)
+
+    def _write_shared_strings(self, zip_file: ZipFile) -> None:
+        """
+        Write the shared strings table into the zip.
+        """
+        header = SHARED_STRINGS_HEADER_XML.format(
+            count=self.strings_count,
+            unique_count=len(self.shared_strings))
+        with zip_file.open("xl/sharedStrings.xml", "w") as file:
+            file.write(header.encode("utf-8"))
+            for value in self.shared_strings:
+                value = escape(INVALID_XML_CHARS.sub("", value))
+                file.write(f'<si><t xml:space="preserve">{value}</t></si>'
+                           .encode("utf-8"))
+            file.write(SHARED_STRINGS_FOOTER_XML.encode("utf-8"))
+
+    def _write_sheet(self, zip_file: ZipFile, sheet: XlsxSheet) -> None:
+        """
+        Copy the spooled rows of the sheet into
+        the zip.
+        """
+        header = SHEET_HEADER_XML.format(dimension=sheet.get_dimension())
+        path = f"xl/worksheets/sheet{sheet.index}.xml"
+        with zip_file.open(path, "w") as file:
+            file.write(header.encode("utf-8"))
+            sheet.file.seek(0)
+            shutil.copyfileobj(sheet.file, file)
+            file.write(SHEET_FOOTER_XML.encode("utf-8"))
+
+    def save_as(self, file_path: str) -> None:
+        """
+        Save current work book to new file.
+        """
+        if self.sheets is None:
+            raise NotCreatedWorkbookError("Work book is not created.")
+        sheets = list(self.sheets.values())
+        if not sheets:
+            sheets = [self._get_sheet(self.DEFAULT_SHEET_NAME)]
+        content_types = "".join(CONTENT_TYPE_SHEET_XML.format(index=sheet.index)
+                                for sheet in sheets)
+        workbook_sheets = "".join(
+            WORKBOOK_SHEET_XML.format(
+                name=escape(sheet.name[:MAX_SHEET_NAME_LENGTH]),
+                index=sheet.index)
+            for sheet in sheets)
+        workbook_rels = "".join(WORKBOOK_SHEET_REL_XML.format(index=sheet.index)
+                                for sheet in sheets)
+        styles = STYLES_XML.format(date_format=escape(self.date_format))
+        with ZipFile(file_path, "w", compression=ZIP_DEFLATED) as zip_file:
+            zip_file.writestr("[Content_Types].xml",
+                              CONTENT_TYPES_XML.format(sheets=content_types))
+            zip_file.writestr("_rels/.rels", ROOT_RELS_XML)
+            zip_file.writestr("xl/workbook.xml",
+                              WORKBOOK_XML.format(sheets=workbook_sheets))
+            zip_file.writestr("xl/_rels/workbook.xml.rels",
+                              WORKBOOK_RELS_XML.format(
+                                  sheets=workbook_rels,
+                                  styles=len(sheets) + 1,
+                                  strings=len(sheets) + 2))
+            zip_file.writestr("xl/styles.xml", styles)
+            for sheet in sheets:
+                self._write_sheet(zip_file, sheet)
+            self._write_shared_strings(zip_file)
+
+    def close(self) -> None:
+        """
+        Remove the spooled sheets.
+        """
+        if not self.sheets:
+            return
+        for sheet in self.sheets.values():
+            sheet.close()
+        self.sheets = None
+
+
+class XlsxReader:
+    """
+    This class reads an xlsx file without
+    Excel. The sheet xml is parsed lazily
+    and each row is yielded as soon as it
+    is parsed, so memory doesn't depend on
+    the number of rows.
+
+    @methods
+        open_excel
+        set_sheet
+        get_sheet_names
+        get_columns_count
+        get_rows_count
+        fetch_all
+        fetch_all_sheets
+        get_as_dict
+        close
+
+    @note
+        it has the same usage as ExcelHandler
+        and better to use it as context manager.
+    """
+
+    def __init__(self) -> None:
+        self.zip_file = None
+        self.rows_count = 0
+        self.columns_count = 0
+
+    def __enter__(self) -> object:
+        return self
+
+    def __exit__(self, *args) -> object:
+        self.close()
+
+    def open_excel(self,
+                   file_path: str,
+                   sheet_name: str = None) -> None:
+        """
+        Open an excel file and load its shared
+        strings, date styles and sheets paths.
+        """
+        if not exists(file_path):
+            raise NotFoundExcelFileError("Couldn't find the desired excel file.")
+        self.zip_file = ZipFile(file_path)
+        self.sheets = self._load_sheets()
+        self.shared_strings = self._load_shared_strings()
+        self.date_styles = self._load_date_styles()
+        self.set_sheet(sheet_name)
+
+    def _load_sheets(self) -> dict:
+        """
+        Returns a mapping of the sheets names to
+        their xml path inside the zip.
+        """
+        with self.zip_file.open("xl/_rels/workbook.xml.rels") as file:
+            relations = {
+                relation.get("Id"): relation.get("Target")
+                for relation in parse(file).getroot()
+                if relation.tag == f"{PACKAGE_RELATIONSHIP_NAMESPACE}Relationship"
+            }
+        sheets = dict()
+        with self.zip_file.open("xl/workbook.xml") as file:
+            workbook = parse(file).getroot()
+        for sheet in workbook.iter(f"{MAIN_NAMESPACE}sheet"):
+            target = relations[sheet.get(f"{RELATIONSHIP_NAMESPACE}id")]
+            if target.startswith("/"):
+                path = target.lstrip("/")
+            else:
+                path = normpath(join("xl", target))
+            sheets[sheet.get("name")] = path
+        return sheets
+
+    def _load_shared_strings(self) -> list:
+        """
+        Returns the shared strings table.
+        """
+        strings = list()
+        if "xl/sharedStrings.xml" not in self.zip_file.namelist():
+            return strings
+        with self.zip_file.open("xl/sharedStrings.xml") as file:
+            for _, element in iterparse(file):
+                if element.tag != f"{MAIN_NAMESPACE}si":
+                    continue
+                # rich texts are splitted into several <t>
+                strings.append("".join(
+                    text.text or ""
+                    for text in element.iter(f"{MAIN_NAMESPACE}t")))
+                element.clear()
+        return strings
+
+    def _load_date_styles(self) -> set:
+        """
+        Returns the indexes of the cell styles
+        which have a date number format.
+        """
+        date_styles = set()
+        if "xl/styles.xml" not in self.zip_file.namelist():
+            return date_styles
+        with self.zip_file.open("xl/styles.xml") as file:
+            styles = parse(file).getroot()
+        date_formats = set(BUILTIN_DATE_FORMATS)
+        for number_format in styles.iter(f"{MAIN_NAMESPACE}numFmt"):
+            # remove the quoted texts and colors like [Red]
+            code = re.sub(r'"[^"]*"|\[[^\]]*\]', "", number_format.get("formatCode", ""))
+            if DATE_FORMAT_CODE.search(code):
+                date_formats.add(int(number_format.get("numFmtId")))
+        cell_formats = styles.find(f"{MAIN_NAMESPACE}cellXfs")
+        if cell_formats is None:
+            return date_styles
+        for index, cell_format in enumerate(cell_formats):
+            if int(cell_format.get("numFmtId", 0)) in date_formats:
+                date_styles.add(index)
+        return date_styles
+
+    def get_sheet_names(self) -> list:
+        """
+        Returns the name of the sheets.
+        """
+        return list(self.sheets)
+
+    def set_sheet(self, sheet_name: str = None) -> None:
+        """
+        Set the sheet file in an excel file and
+        read its dimension.
+        ------------------------------------
+        -> Params
+            sheet_name: str
+        """
+        if not sheet_name:
+            sheet_name = next(iter(self.sheets), None)
+        if sheet_name not in self.sheets:
+            raise NotFoundSheetError("Desired sheet is not in the file.")
+        self.sheet_path = self.sheets[sheet_name]
+        self.rows_count, self.columns_count = self._read_dimension()
+
+    def _read_dimension(self) -> tuple:
+        """
+        Read the used range from the dimension
+        tag at the top of the sheet xml. It only
+        parses until the dimension tag.
+        <- Return
+            tuple → (rows_count, columns_count)
+        """
+        with self.zip_file.open(self.sheet_path) as file:
+            for _, element in iterparse(file, events=("start",)):
+                if element.tag == f"{MAIN_NAMESPACE}dimension":
+                    last_cell = element.get("ref", "A1").split(":")[-1]
+                    return parse_reference(last_cell)
+                if element.tag == f"{MAIN_NAMESPACE}sheetData":
+                    break
+        return 0, 0
+
+    def get_columns_count(self) -> int:
+        """
+        Returns number of the columns in the
+        used range of the sheet.
+        """
+        return self.columns_count
+
+    def get_rows_count(self) -> int:
+        """
+        Returns number of the rows in the
+        used range of the sheet.
+        """
+        return self.rows_count
+
+    def _cell_value(self, element: object) -> Any:
+        """
+        Convert a cell element to its python value
+        based on its type and style.
+        """
+        cell_type = element.get("t", "n")
+        if cell_type == "inlineStr":
+            return "".join(text.text or ""
+                           for text in element.iter(f"{MAIN_NAMESPACE}t"))
+        value = element.findtext(f"{MAIN_NAMESPACE}v")
+        if value is None:
+            return None
+        if cell_type == "s":
+            return self.shared_strings[int(value)]
+        if cell_type == "b":
+            return value == "1"
+        if cell_type in ("str", "e"):
+            return value
+        number = float(value)
+        if int(element.get("s", 0)) in self.date_styles:
+            return from_excel_serial(number)
+        if number.is_integer() and "." not in value and "E" not in value:
+            return int(number)
+        return number
+
+    def fetch_all(self,
+                  rows_count: int = None,
+                  columns_count: int = None,
+                  skip_empty_rows: bool = True) -> Generator:
+        """
+        Fetch all data in the sheet row by row.
+        ------------------------------------
+        -> Params
+            rows_count : int
+            columns_count: int
+            skip_empty_rows: bool
+        <- Return
+            Generator
+        @note
+            the dimension of the sheet is only a hint
+            of the columns, the rows are read until
+            the end of the sheet data. rows_count and
+            columns_count can limit them.
+        """
+        columns_count = columns_count or self.columns_count
+        with self.zip_file.open(self.sheet_path) as file:
+            for _, element in iterparse(file):
+                if element.tag != f"{MAIN_NAMESPACE}row":
+                    continue
+                row_number = int(element.get("r", 0))
+                if rows_count and row_number > rows_count:
+                    break
+                row = [None] * columns_count
+                for position, cell in enumerate(element.iter(f"{MAIN_NAMESPACE}c")):
+                    reference = cell.get("r")
+                    column = parse_reference(reference)[1] if reference else position + 1
+                    if column > columns_count:
+                        row.extend([None] * (column - len(row)))
+                    row[column - 1] = self._cell_value(cell)
+                element.clear()
+                if skip_empty_rows and not any(value is not None for value in row):
+                    continue
+                yield row
+
+    def fetch_all_sheets(self, skip_empty_rows: bool = True) -> Generator:
+        """
+        Fetch the rows of all the sheets as dicts,
+        the first row of each sheet is its headers
+        like the sheets of XlsxWriter.
+        """
+        for sheet_name in self.get_sheet_names():
+            self.set_sheet(sheet_name)
+            rows = self.fetch_all(skip_empty_rows=skip_empty_rows)
+            headers = next(rows, None)
+            if headers is None:
+                continue
+            yield from self.get_as_dict(headers, rows)
+
+    def get_as_dict(self,
+                    headers: tuple,
+                    data: Generator) -> Generator:
+        """
+        Returns the data as a dicts
+        """
+        for row in data:
+            yield dict(zip(headers, row))
+
+    def close(self) -> None:
+        """
+        Close the file.
+        """
+        if self.zip_file:
+            self.zip_file.close()
+            self.zip_file = None
@@ -0,0 +1,206 @@
+"""
+This module contains a lightweight tracer to
+measure the time of the callbacks and the data
+handler operations. Spans are kept in a ring
+buffer and can be saved as chrome trace event
+json(open it in chrome://tracing or perfetto).
+
+@usage
+    from lib.tracing import tracer
+
+    @tracer.traced()
+    def filter_data(...):
+        ...
+
+    with tracer.span("insert_rows", rows=100):
+        ...
+
+    tracer.enable()
+    tracer.dump("trace.json")
+
+@note
+    the tracer is disabled by default, set the
+    EXPENSE_TRACKER_TRACE environment variable
+    to enable it on start.
+"""
+import os
+import json
+from time import perf_counter_ns
+from threading import get_ident
+from collections import deque
+from functools import wraps
+from typing import Callable
+
+__all__ = ["Tracer", "tracer"]
+
+
+class Span:
+    """
+    Context manager which records a complete
+    event when it exits.
+    """
+    __slots__ = ("tracer", "name", "args", "start")
+
+    def __init__(self, tracer: object, name: str, args: dict) -> None:
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self) -> object:
+        self.start = perf_counter_ns()
+        return self
+
+    def __exit__(self, *args) -> None:
+        end = perf_counter_ns()
+        self.tracer.record(self.name, self.start, end, self.args)
+
+
+class NullSpan:
+    """
+    Span which does nothing, returned when the
+    tracer is disabled.
+    """
+    __slots__ = ()
+
+    def __enter__(self) -> object:
+        return self
+
+    def __exit__(self, *args) -> None:
+        pass
+
+
+NULL_SPAN = NullSpan()
+
+
+class Tracer:
+    """
+    Records nested spans into a ring buffer.
+    --------------------------------------------
+    @methods
+        enable
+        disable
+        span
+        traced
+        record
+        clear
+        to_chrome_trace
+        dump
+    """
+
+    def __init__(self, capacity: int = 100000) -> None:
+        """
+        ---------------------------------
+        -> Params
+            capacity: int
+                number of the latest spans to keep
+        """
+        self.enabled = False
+        self.spans = deque(maxlen=capacity)
+        self.pid = os.getpid()
+
+    def enable(self) -> None:
+        """
+        Start recording the spans.
+        """
+        self.enabled = True
+
+    def disable(self) -> None:
+        """
+        Stop recording the spans.
+        """
+        self.enabled = False
+
+    def span(self, name: str, **args) -> Span:
+        """
+        Returns a context manager which measures
+        the time of its block.
+        -------------------------------------
+        -> Params
+            name: str
+            args: shown in the trace viewer
+        """
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name, args)
+
+    def traced(self, name: str = None) -> Callable:
+        """
+        Decorator to measure the time of each
+        call of the function. The name of the
+        span is the function qualified name by
+        default.
+        @note
+            don't use it on the methods which are
+            connected to qt signals, qt passes the
+            signal arguments to the wrapper. use
+            span inside them instead.
+        """
+        def decorator(function: Callable) -> Callable:
+            span_name = name or function.__qualname__
+            @wraps(function)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                start = perf_counter_ns()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    self.record(span_name, start, perf_counter_ns(), None)
+            return wrapper
+        return decorator
+
+    def record(self,
+               name: str,
+               start: int,
+               end: int,
+               args: dict) -> None:
+        """
+        Add a finished span to the ring buffer.
+        -------------------------------------
+        -> Params
+            name: str
+            start: int → nanoseconds
+            end: int → nanoseconds
+            args: dict
+        """
+        self.spans.append((name, start, end, get_ident(), args))
+
+    def clear(self) -> None:
+        """
+        Remove the recorded spans.
+        """
+        self.spans.clear()
+
+    def to_chrome_trace(self) -> dict:
+        """
+        Convert the recorded spans to chrome
+        trace event format. Nesting of the spans
+        is shown by the viewer based on their
+        times in each thread.
+        """
+        events = list()
+        for name, start, end, thread, args in self.spans:
+            event = {"name": name,
+                     "ph": "X",
+                     "ts": start / 1000,
+                     "dur": (end - start) / 1000,
+                     "pid": self.pid,
+                     "tid": thread}
+            if args:
+                event["args"] = {key: str(value) for key, value in args.items()}
+            events.append(event)
+        return {"traceEvents": events,
+                "displayTimeUnit": "ms"}
+
+    def dump(self, path: str) -> None:
+        """
+        Save the recorded spans as chrome trace
+        event json.
+        """
+        with open(path, "w") as file:
+            json.dump(self.to_chrome_trace(), file)
+
+
+tracer = Tracer()
+if os.environ.get("EXPENSE_TRACKER_TRACE"):
+    tracer.enable()
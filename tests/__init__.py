@@ -0,0 +1,39 @@
+"""
+Tests of the expense tracker. They run from the
+root of the repository:
+
+    python -m unittest
+"""
+import os
+import shutil
+from lib.storage import JsonStore
+
+ROOT_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_DATA_PATH = os.path.join(ROOT_PATH, "lib", "data", "data.json")
+
+
+def copy_sample_data(directory: str, name: str = "data.json") -> str:
+    """
+    Copy the shipped expenses to the directory,
+    the tests don't change the sample data.
+    """
+    path = os.path.join(directory, name)
+    shutil.copyfile(SAMPLE_DATA_PATH, path)
+    return path
+
+
+def load_sample_data() -> list:
+    """
+    Returns the shipped expenses in cents, the
+    sample keeps the amounts of the older versions.
+    """
+    return JsonStore(SAMPLE_DATA_PATH).read()
+
+
+def get_values(expenses: list) -> list:
+    """
+    Returns the expenses as a sorted list of values,
+    the order of the same date expenses and the
+    duplicates don't matter.
+    """
+    return sorted((tuple(expense.values()) for expense in expenses), key=repr)
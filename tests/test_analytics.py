@@ -0,0 +1,118 @@
+"""
+Tests of the numpy spend analytics and the
+analytics panel.
+"""
+import os
+import random
+import unittest
+from datetime import datetime
+from importlib.util import find_spec
+from tempfile import TemporaryDirectory
+import numpy as np
+from lib.analytics import SpendAnalytics
+from lib.data_handler import DataHandler
+from . import copy_sample_data
+
+FROM_DATE = datetime(2023, 1, 1)
+TO_DATE = datetime(2024, 2, 18)
+
+
+class SpendAnalyticsTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = TemporaryDirectory()
+        self.data_handler = DataHandler(copy_sample_data(self.directory.name), None)
+        self.analytics = self.data_handler.get_analytics()
+
+    def tearDown(self) -> None:
+        self.data_handler.close()
+        self.directory.cleanup()
+
+    def assertSameReport(self, first: dict, second: dict) -> None:
+        self.assertEqual(first.keys(), second.keys())
+        np.testing.assert_array_equal(first["daily"], second["daily"])
+        for window in first["rolling"]:
+            np.testing.assert_array_equal(first["rolling"][window],
+                                          second["rolling"][window])
+        np.testing.assert_array_equal(first["monthly"], second["monthly"])
+
+    def test_edits_dont_grow_the_columns(self) -> None:
+        size = len(self.analytics)
+        random.seed(0)
+        for _ in range(200):
+            expense = random.choice(self.data_handler.expenses)
+            price = random.randint(1, 100000)
+            self.data_handler.update_expense(expense, {"price": price,
+                                                       "overall_price": price})
+        self.assertEqual(len(self.analytics), size)
+        self.data_handler.delete_expense(self.data_handler.expenses[0])
+        self.assertEqual(len(self.analytics), size - 1)
+        fresh = SpendAnalytics(self.data_handler.expenses, self.data_handler.symbols["category"])
+        self.assertSameReport(self.analytics.report(FROM_DATE, TO_DATE),
+                              fresh.report(FROM_DATE, TO_DATE))
+
+    def test_remove_unknown_expense(self) -> None:
+        size = len(self.analytics)
+        expense = dict(self.data_handler.expenses[0], category="Unknown")
+        self.analytics.remove(expense)
+        expense = dict(self.data_handler.expenses[0], overall_price=-1)
+        self.analytics.remove(expense)
+        self.assertEqual(len(self.analytics), size)
+
+    def test_daily_sums(self) -> None:
+        start = FROM_DATE.toordinal()
+        end = TO_DATE.toordinal()
+        daily = self.analytics.get_daily(start, end).sum(axis=0)
+        expected = np.zeros(end - start + 1, dtype=np.int64)
+        for expense in self.data_handler.expenses:
+            ordinal = expense["date"].toordinal()
+            if start <= ordinal <= end:
+                expected[ordinal - start] += expense["overall_price"]
+        np.testing.assert_array_equal(daily, expected)
+
+
+@unittest.skipUnless(find_spec("PyQt5"), "PyQt5 isn't installed")
+class AnalyticsPanelTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        from lib.interface.widgets import QApplication
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self) -> None:
+        from lib.interface.illustration_frame import IllustrationFrame
+        self.directory = TemporaryDirectory()
+        self.data_handler = DataHandler(copy_sample_data(self.directory.name), None)
+        self.frame = IllustrationFrame(self.data_handler, {"default_from_date": FROM_DATE})
+        self.reports = 0
+        get_spend_report = self.data_handler.get_spend_report
+
+        def count_reports(*args) -> dict:
+            self.reports += 1
+            return get_spend_report(*args)
+        self.data_handler.get_spend_report = count_reports
+
+    def tearDown(self) -> None:
+        self.data_handler.close()
+        self.directory.cleanup()
+
+    def test_text_filters_dont_refresh_the_panel(self) -> None:
+        filters = self.frame.illustration_filter
+        filters.title.set_value("me")
+        self.frame.illustration_filters_callback()
+        filters.category.set_value("fo")
+        self.frame.illustration_filters_callback()
+        self.assertEqual(self.reports, 0)
+
+    def test_changes_refresh_the_panel(self) -> None:
+        self.data_handler.delete_expense(self.data_handler.expenses[0])
+        self.frame.illustration_filters_callback()
+        self.frame.illustration_filters_callback()
+        self.assertEqual(self.reports, 1)
+        self.frame.refresh_analytics()
+        self.assertEqual(self.reports, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
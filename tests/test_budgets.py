@@ -0,0 +1,130 @@
+"""
+Tests of the budget counters and alerts.
+"""
+import os
+import random
+import unittest
+from datetime import datetime
+from datetime import timedelta
+from tempfile import TemporaryDirectory
+from lib.budgets import BudgetTracker
+from lib.budgets import get_period_range
+from lib.budgets import get_periods_range
+from lib.data_handler import DataHandler
+from lib.errors import InvalidBudgetError
+from lib.storage import write_snapshot
+from . import load_sample_data
+
+
+def create_expense(date: datetime, price: int, category: str = "Food") -> dict:
+    return {"title": "Bread",
+            "price": price,
+            "quantity": 1,
+            "overall_price": price,
+            "category": category,
+            "date": date}
+
+
+def sum_brute_force(expenses: list, status: dict) -> int:
+    return sum(expense["overall_price"] for expense in expenses
+               if status["start"] <= expense["date"] <= status["end"]
+               and status["category"] in (None, expense["category"]))
+
+
+class BudgetTrackerTest(unittest.TestCase):
+
+    def test_period_ranges(self) -> None:
+        # 2024-04-29 is a monday
+        day = datetime(2024, 5, 1)
+        tracker = BudgetTracker([{"period": "weekly", "limit": 1},
+                                 {"period": "monthly", "limit": 1}])
+        weekly, monthly = tracker.get_statuses(day)
+        self.assertEqual((weekly["start"], weekly["end"]),
+                         (datetime(2024, 4, 29), datetime(2024, 5, 5)))
+        self.assertEqual((monthly["start"], monthly["end"]),
+                         (datetime(2024, 5, 1), datetime(2024, 5, 31)))
+        self.assertEqual(get_periods_range(day), (datetime(2024, 4, 29), datetime(2024, 5, 31)))
+        self.assertEqual(get_period_range("monthly", 2023 * 12 + 11),
+                         (datetime(2023, 12, 1), datetime(2023, 12, 31)))
+
+    def test_alerts(self) -> None:
+        tracker = BudgetTracker([{"period": "weekly", "limit": 100, "alert_at": [0.5, 1]},
+                                 {"period": "monthly", "category": "Gift", "limit": 1000}])
+        day = datetime(2024, 5, 1)
+        self.assertEqual(tracker.add(create_expense(day, 4000)), [])
+        alerts = tracker.add(create_expense(day, 2000))
+        self.assertEqual([(alert["period"], alert["level"], alert["spent"]) for alert in alerts],
+                         [("weekly", 0.5, 6000)])
+        # a passed level isn't shown again
+        self.assertEqual(tracker.add(create_expense(day, 1000)), [])
+        alerts = tracker.add(create_expense(day, 95000, "Gift"))
+        self.assertEqual([(alert["period"], alert["level"]) for alert in alerts],
+                         [("weekly", 1.0), ("monthly", 0.8)])
+        tracker.remove(create_expense(day, 95000, "Gift"))
+        self.assertEqual(tracker.get_spent("weekly", day), 7000)
+        self.assertEqual(tracker.get_spent("monthly", day, "Gift"), 0)
+
+    def test_invalid_budgets(self) -> None:
+        for budget in ({"period": "daily", "limit": 10},
+                       {"period": "weekly"},
+                       {"period": "weekly", "limit": "ten"},
+                       {"period": "weekly", "limit": 0},
+                       {"period": "weekly", "limit": 10, "alert_at": ["high"]}):
+            with self.subTest(budget=budget), self.assertRaises(InvalidBudgetError):
+                BudgetTracker([budget])
+
+
+class PartialLoadTest(unittest.TestCase):
+    """
+    The budgets count the expenses which aren't
+    loaded yet.
+    """
+
+    def setUp(self) -> None:
+        self.directory = TemporaryDirectory()
+        self.expenses = [create_expense(datetime(2024, 6, 10), 500),
+                         create_expense(datetime(2024, 4, 29), 10000)]
+        self.budgets = [{"period": "weekly", "limit": 150},
+                        {"period": "monthly", "limit": 1000}]
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def open(self, name: str, expenses: list, count: int) -> DataHandler:
+        path = os.path.join(self.directory.name, name)
+        write_snapshot(os.path.join(self.directory.name, "data.json"), expenses)
+        data_handler = DataHandler(path, count)
+        self.addCleanup(data_handler.close)
+        data_handler.set_budgets(self.budgets)
+        return data_handler
+
+    def check_alert(self, name: str) -> None:
+        data_handler = self.open(name, self.expenses, 1)
+        self.assertEqual(len(data_handler.expenses), 1)
+        alerts = data_handler.add_expense(create_expense(datetime(2024, 5, 1), 6000))
+        self.assertEqual([(alert["period"], alert["spent"]) for alert in alerts],
+                         [("weekly", 16000)])
+        weekly, monthly = data_handler.get_budget_statuses(datetime(2024, 5, 1))
+        self.assertEqual((weekly["spent"], monthly["spent"]), (16000, 6000))
+
+    def test_partitions(self) -> None:
+        self.check_alert("data")
+
+    def test_json_file(self) -> None:
+        self.check_alert("data.json")
+
+    def test_statuses_of_the_sample_data(self) -> None:
+        expenses = load_sample_data()
+        self.budgets.append({"period": "monthly", "category": "Food", "limit": 100})
+        generator = random.Random(0)
+        for name in ("data", "data.json"):
+            data_handler = self.open(name, expenses, 20)
+            first = min(expense["date"] for expense in expenses)
+            for _ in range(20):
+                day = first + timedelta(days=generator.randint(0, 500))
+                for status in data_handler.get_budget_statuses(day):
+                    self.assertEqual(status["spent"], sum_brute_force(expenses, status))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+"""
+Tests of the command line on a copy of the sample
+data.
+"""
+import json
+import os
+import unittest
+from contextlib import redirect_stderr
+from contextlib import redirect_stdout
+from datetime import datetime
+from io import StringIO
+from tempfile import TemporaryDirectory
+from lib.cli import main
+from lib.constants import TABLE_HEADERS
+from lib.data_handler import DataHandler
+from lib.dates import format_date
+from lib.interface.utils import write_json
+from lib.money import to_amount
+from lib.money import to_amounts
+from . import copy_sample_data
+
+FOOD_FILTERS = {"from_date": datetime(2023, 6, 1), "to_date": datetime(2023, 12, 31),
+                "category": "Food"}
+FOOD_ARGUMENTS = ["--from", "01-06-2023", "--to", "31-12-2023", "--category", "food"]
+
+
+class CommandLineTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = TemporaryDirectory()
+        self.path = copy_sample_data(self.directory.name)
+        self.data_handler = DataHandler(copy_sample_data(self.directory.name, "sample.json"),
+                                        None)
+        self.addCleanup(self.data_handler.close)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def run_command(self, *arguments: str) -> tuple:
+        """
+        Run the command on the copy and returns the
+        exit code, the output and the errors.
+        """
+        output = StringIO()
+        errors = StringIO()
+        with redirect_stdout(output), redirect_stderr(errors):
+            code = main(["--data", self.path, *arguments])
+        return code, output.getvalue(), errors.getvalue()
+
+    def get_json_rows(self, *arguments: str) -> list:
+        code, output, _ = self.run_command(*arguments, "--format", "json")
+        self.assertEqual(code, 0)
+        return [json.loads(line) for line in output.splitlines()]
+
+    def test_list(self) -> None:
+        expenses = self.data_handler.filter_data(dict(FOOD_FILTERS))
+        expected = [dict(zip(TABLE_HEADERS, to_amounts(expense).values()),
+                         Date=format_date(expense["date"]))
+                    for expense in expenses]
+        self.assertEqual(self.get_json_rows("list", *FOOD_ARGUMENTS), expected)
+        self.assertEqual(self.get_json_rows("list", "--limit", "3"),
+                         self.get_json_rows("list")[:3])
+
+    def test_total(self) -> None:
+        expenses = self.data_handler.filter_data(dict(FOOD_FILTERS))
+        self.assertEqual(self.get_json_rows("total", *FOOD_ARGUMENTS),
+                         [{"Total Price": to_amount(self.data_handler.get_total_price(expenses)),
+                           "Total Items": len(expenses)}])
+        rows = self.get_json_rows("total")
+        self.assertEqual(rows[0]["Total Items"], len(self.data_handler.expenses))
+
+    def test_group(self) -> None:
+        expected = dict()
+        for expense in self.data_handler.expenses:
+            total, count = expected.get(expense["category"], (0, 0))
+            expected[expense["category"]] = (total + expense["overall_price"], count + 1)
+        rows = self.get_json_rows("group", "--by", "category")
+        self.assertEqual({row["Category"]: (row["Total Price"], row["Total Items"])
+                          for row in rows},
+                         {name: (to_amount(total), count)
+                          for name, (total, count) in expected.items()})
+        totals = [row["Total Price"] for row in rows]
+        self.assertEqual(totals, sorted(totals, reverse=True))
+
+    def test_error_exit_code(self) -> None:
+        config_path = os.path.join(self.directory.name, "configs.json")
+        write_json(config_path, {"budgets": [{"period": "daily", "limit": 10}]})
+        code, output, errors = self.run_command("--config", config_path, "budgets")
+        self.assertEqual((code, output), (1, ""))
+        self.assertTrue(errors.startswith("Error: "))
+        # invalid arguments are rejected by the parser
+        with self.assertRaises(SystemExit) as context:
+            self.run_command("total", "--from", "2024-01-01")
+        self.assertEqual(context.exception.code, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+"""
+Tests of the ranked completions against the brute
+force scores of the uses.
+"""
+import math
+import random
+import unittest
+from datetime import datetime
+from datetime import timedelta
+from lib.completion import CompletionIndex
+from lib.completion import HALF_LIFE_DAYS
+from lib.completion import get_weight
+
+FIRST_DAY = datetime(2023, 1, 1)
+WORDS = ["bread", "Bread", "bus", "butter", "banana", "beer", "bike",
+         "cake", "car", "carrot", "coffee", "cinema", "tea", "taxi", "train"]
+
+
+def rank_brute_force(uses: list, prefix: str) -> list:
+    """
+    Returns the scores of the values which start
+    with the prefix, the highest first.
+    """
+    scores = dict()
+    for value, date in uses:
+        key = value.lower()
+        if key.startswith(prefix.lower()):
+            scores[key] = scores.get(key, 0) + 2 ** ((date - FIRST_DAY).days / HALF_LIFE_DAYS)
+    return sorted(scores.values(), reverse=True)
+
+
+class CompletionIndexTest(unittest.TestCase):
+
+    def test_recency_weight(self) -> None:
+        day = datetime(2024, 5, 1)
+        for days, ratio in ((HALF_LIFE_DAYS, 2), (3 * HALF_LIFE_DAYS, 8),
+                            (HALF_LIFE_DAYS // 2, math.sqrt(2)), (-HALF_LIFE_DAYS, .5)):
+            self.assertAlmostEqual(get_weight(day + timedelta(days=days)) / get_weight(day),
+                                   ratio)
+
+    def test_ranking(self) -> None:
+        day = datetime(2024, 5, 1)
+        index = CompletionIndex()
+        index.build([("Bread", day), ("Bread", day), ("Bus", day),
+                     ("Butter", day - timedelta(days=40)), ("Cake", day)])
+        # two uses are more than one use of the same day
+        self.assertEqual(index.complete("b"), ["Bread", "Bus", "Butter"])
+        # a use a month later is worth two uses
+        index.add("butter", day + timedelta(days=HALF_LIFE_DAYS + 1))
+        self.assertEqual(index.complete("B"), ["butter", "Bread", "Bus"])
+        self.assertEqual(index.complete("bu"), ["butter", "Bus"])
+        self.assertEqual(index.complete("b", 1), ["butter"])
+        self.assertEqual(index.complete("x"), [])
+        index.remove("butter", day + timedelta(days=HALF_LIFE_DAYS + 1))
+        self.assertEqual(index.complete("b"), ["Bread", "Bus", "butter"])
+        index.remove("Cake", day)
+        self.assertEqual(index.complete("c"), [])
+        self.assertEqual(len(index), 3)
+
+    def assertRanks(self, index: CompletionIndex, uses: list) -> None:
+        for prefix in ("", "b", "B", "bu", "ca", "car", "carr", "t", "z"):
+            expected = rank_brute_force(uses, prefix)[:index.limit]
+            scores = [index.scores[value.lower()] / get_weight(FIRST_DAY)
+                      for value in index.complete(prefix)]
+            self.assertEqual(len(scores), len(expected))
+            for score, expected_score in zip(scores, expected):
+                self.assertTrue(math.isclose(score, expected_score, rel_tol=1e-9),
+                                (prefix, scores, expected))
+
+    def test_adds_and_removes(self) -> None:
+        generator = random.Random(0)
+        uses = [(generator.choice(WORDS), FIRST_DAY + timedelta(days=generator.randint(0, 400)))
+                for _ in range(100)]
+        index = CompletionIndex(limit=4)
+        index.build(uses)
+        self.assertRanks(index, uses)
+        for number in range(300):
+            if generator.random() < .6 or not uses:
+                use = (generator.choice(WORDS),
+                       FIRST_DAY + timedelta(days=generator.randint(0, 500)))
+                uses.append(use)
+                index.add(*use)
+            else:
+                index.remove(*uses.pop(generator.randrange(len(uses))))
+            if number % 10 == 0:
+                self.assertRanks(index, uses)
+        self.assertRanks(index, uses)
+        self.assertEqual(len(index), len({value.lower() for value, _ in uses}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+"""
+Tests of the cached date codec.
+"""
+import unittest
+from datetime import datetime
+from datetime import timedelta
+from lib.dates import DateCodec
+from lib.dates import format_date
+from lib.dates import get_codec
+from lib.dates import parse_date
+
+
+class DateCodecTest(unittest.TestCase):
+
+    def test_round_trip(self) -> None:
+        for date_format in ("%d-%m-%Y", "%Y-%m-%d", "%d/%m/%y"):
+            codec = DateCodec(date_format)
+            day = datetime(2023, 1, 1)
+            for days in range(800):
+                date = day + timedelta(days=days)
+                text = codec.format(date)
+                self.assertEqual(text, date.strftime(date_format))
+                self.assertEqual(codec.parse(text), date)
+                # the cached texts and dates are returned again
+                self.assertIs(codec.format(date), text)
+                self.assertIs(codec.parse(text), codec.parse(text))
+            self.assertEqual(len(codec.texts), 800)
+
+    def test_time_isnt_part_of_the_day(self) -> None:
+        codec = DateCodec("%d-%m-%Y")
+        self.assertEqual(codec.format(datetime(2024, 2, 29, 23, 59)), "29-02-2024")
+        self.assertEqual(codec.format(datetime(2024, 2, 29)), "29-02-2024")
+
+    def test_invalid_date(self) -> None:
+        codec = DateCodec("%d-%m-%Y")
+        for text in ("31-02-2024", "2024-01-01", "", "1-1-24 ", "tomorrow"):
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    codec.parse(text)
+                # the invalid texts aren't cached
+                with self.assertRaises(ValueError):
+                    codec.parse(text)
+                self.assertNotIn(text, codec.dates)
+
+    def test_shared_codecs(self) -> None:
+        self.assertIs(get_codec(), get_codec())
+        self.assertIsNot(get_codec("%Y"), get_codec())
+        self.assertEqual(format_date(datetime(2024, 5, 1), "%Y-%m"), "2024-05")
+        self.assertEqual(parse_date("01-05-2024"), datetime(2024, 5, 1))
+        with self.assertRaises(ValueError):
+            parse_date("01-13-2024")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+"""
+Tests of the ExcelHandler on the in memory
+Excel stand-in.
+"""
+import os
+import unittest
+from math import ceil
+from tempfile import TemporaryDirectory
+from lib.data_handler import DataHandler
+from lib.tools.excel_handler import ExcelHandler
+from lib.tools.fake_excel import FakeExcelApplication
+from . import copy_sample_data
+
+CHUNK_SIZE = 100
+# Cells, Cells, Range and its Value of a block
+BLOCK_ROUND_TRIPS = 4
+
+
+class ExcelHandlerTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = TemporaryDirectory()
+        data_handler = DataHandler(copy_sample_data(self.directory.name), None)
+        self.rows = [list(row) for row in data_handler.get_all_as_table(format_date=False)]
+        data_handler.close()
+        self.app = FakeExcelApplication()
+        self.handler = ExcelHandler(dispatch=self.app.dispatch, chunk_size=CHUNK_SIZE)
+        self.handler.create_new()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def get_blocks_round_trips(self, rows_count: int) -> int:
+        return ceil(rows_count / CHUNK_SIZE) * BLOCK_ROUND_TRIPS
+
+    def test_add_data_writes_blocks(self) -> None:
+        round_trips = self.app.round_trips
+        self.handler.add_data(self.rows)
+        self.assertEqual(self.app.round_trips - round_trips,
+                         self.get_blocks_round_trips(len(self.rows)))
+        self.assertEqual(self.handler.sheet.get_rows(), self.rows)
+
+    def test_fetch_range_reads_blocks(self) -> None:
+        self.handler.add_data(self.rows)
+        round_trips = self.app.round_trips
+        rows = list(self.handler.fetch_range((1, 1), (len(self.rows), len(self.rows[0]))))
+        self.assertEqual(self.app.round_trips - round_trips,
+                         self.get_blocks_round_trips(len(self.rows)))
+        self.assertEqual([list(row) for row in rows], self.rows)
+
+    def test_export_import_round_trip(self) -> None:
+        path = os.path.join(self.directory.name, "expenses.xlsx")
+        self.handler.add_data(self.rows)
+        self.handler.save_as(path)
+        self.handler.close()
+        app = FakeExcelApplication()
+        with ExcelHandler(dispatch=app.dispatch, chunk_size=CHUNK_SIZE) as handler:
+            handler.open_excel(path)
+            rows = [list(row) for row in handler.fetch_all()]
+        self.assertEqual(rows, self.rows)
+        # far fewer calls than one per cell
+        self.assertLess(app.round_trips, len(self.rows))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+"""
+Tests of the fenwick range totals against the
+brute force sums.
+"""
+import random
+import unittest
+from datetime import datetime
+from datetime import timedelta
+from tempfile import TemporaryDirectory
+from lib.data_handler import DataHandler
+from lib.fenwick import DailyTotals
+from lib.fenwick import FenwickTree
+from lib.fenwick import MARGIN_DAYS
+from . import copy_sample_data
+
+
+def sum_brute_force(expenses: list,
+                    from_date: datetime,
+                    to_date: datetime,
+                    category: str = None) -> tuple:
+    """
+    Returns the spend and number of the expenses of
+    the date range by checking each of them.
+    """
+    matched = [expense["overall_price"] for expense in expenses
+               if from_date <= expense["date"] <= to_date
+               and category in (None, expense["category"])]
+    return sum(matched), len(matched)
+
+
+class FenwickTreeTest(unittest.TestCase):
+
+    def test_range_sums(self) -> None:
+        generator = random.Random(0)
+        values = [generator.randint(-1000, 1000) for _ in range(300)]
+        tree = FenwickTree.from_values(values)
+        for _ in range(500):
+            index = generator.randrange(len(values))
+            value = generator.randint(-1000, 1000)
+            values[index] += value
+            tree.add(index, value)
+            start = generator.randrange(len(values))
+            end = generator.randrange(start - 1, len(values))
+            self.assertEqual(tree.range_sum(start, end), sum(values[start:end + 1]))
+        self.assertEqual(tree.get_values(), values)
+
+    def test_grow(self) -> None:
+        generator = random.Random(1)
+        values = list()
+        tree = FenwickTree()
+        for size in range(1, 200, 7):
+            tree.grow(size)
+            values.extend([0] * (size - len(values)))
+            index = generator.randrange(size)
+            values[index] += index
+            tree.add(index, index)
+            self.assertEqual(tree.get_values(), values)
+            self.assertEqual(tree.prefix(size - 1), sum(values))
+
+
+class DailyTotalsTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = TemporaryDirectory()
+        self.data_handler = DataHandler(copy_sample_data(self.directory.name), None)
+        self.expenses = list(self.data_handler.expenses)
+        self.categories = [None] + sorted({expense["category"] for expense in self.expenses})
+        self.totals = DailyTotals()
+        self.totals.build(self.expenses)
+        self.first = self.expenses[-1]["date"]
+        self.last = self.expenses[0]["date"]
+
+    def tearDown(self) -> None:
+        self.data_handler.close()
+        self.directory.cleanup()
+
+    def get_random_date(self, generator: random.Random, margin: int = 30) -> datetime:
+        days = (self.last - self.first).days
+        return self.first + timedelta(days=generator.randint(-margin, days + margin))
+
+    def assertSums(self, generator: random.Random, count: int) -> None:
+        for _ in range(count):
+            from_date = self.get_random_date(generator)
+            to_date = self.get_random_date(generator)
+            category = generator.choice(self.categories)
+            self.assertEqual(self.totals.query(from_date, to_date, category),
+                             sum_brute_force(self.expenses, from_date, to_date, category))
+
+    def test_query(self) -> None:
+        generator = random.Random(2)
+        self.assertSums(generator, 300)
+        self.assertEqual(self.totals.query(datetime.min, datetime.max),
+                         sum_brute_force(self.expenses, datetime.min, datetime.max))
+        self.assertEqual(self.totals.query(self.first, self.last, "Unknown"), (0, 0))
+
+    def test_adds_and_removes(self) -> None:
+        generator = random.Random(3)
+        for number in range(300):
+            if generator.random() < .6:
+                # older than the margin and newer than the last day
+                date = self.get_random_date(generator, MARGIN_DAYS + 100)
+                expense = {"title": f"Added {number}",
+                           "price": 100,
+                           "quantity": 1,
+                           "overall_price": generator.randint(1, 10000),
+                           "category": generator.choice(self.categories[1:] + ["New"]),
+                           "date": date}
+                self.expenses.append(expense)
+                self.totals.add(expense)
+                if expense["category"] not in self.categories:
+                    self.categories.append(expense["category"])
+                self.first = min(self.first, date)
+                self.last = max(self.last, date)
+            else:
+                expense = self.expenses.pop(generator.randrange(len(self.expenses)))
+                self.totals.remove(expense)
+            if number % 20 == 0:
+                self.assertSums(generator, 20)
+        self.assertSums(generator, 200)
+
+    def test_empty(self) -> None:
+        totals = DailyTotals()
+        totals.build([])
+        self.assertEqual(totals.query(self.first, self.last), (0, 0))
+        expense = self.expenses[0]
+        totals.add(expense)
+        self.assertEqual(totals.query(self.first, self.last),
+                         (expense["overall_price"], 1))
+
+    def test_data_handler_keeps_the_totals(self) -> None:
+        generator = random.Random(4)
+        totals = self.data_handler.get_daily_totals()
+        for _ in range(50):
+            expense = generator.choice(self.data_handler.expenses)
+            date = self.get_random_date(generator)
+            if generator.random() < .5:
+                self.data_handler.delete_expense(expense)
+            else:
+                changes = self.data_handler.convert_cell(expense, "date",
+                                                         date.strftime("%d-%m-%Y"))
+                changes.update(self.data_handler.convert_cell(expense, "price", "3.5"))
+                self.data_handler.update_expense(expense, changes)
+        self.assertIs(self.data_handler.get_daily_totals(), totals)
+        self.totals = totals
+        self.expenses = self.data_handler.expenses
+        self.assertSums(generator, 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
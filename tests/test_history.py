@@ -0,0 +1,133 @@
+"""
+Tests of the undo and redo of the expense changes.
+"""
+import os
+import unittest
+from datetime import datetime
+from tempfile import TemporaryDirectory
+from lib.data_handler import DataHandler
+from lib.history import Command
+from lib.history import CommandHistory
+from . import copy_sample_data
+from . import get_values
+
+ALL_DATES = {"from_date": datetime.min, "to_date": datetime.max}
+
+
+class CommandHistoryTest(unittest.TestCase):
+
+    def test_inverse(self) -> None:
+        expense = {"title": "Meat", "price": 1100}
+        command = Command("update", [expense], {"price": 950}, {"price": 1100})
+        inverse = command.inverse()
+        self.assertEqual((inverse.action, inverse.changes, inverse.previous),
+                         ("update", {"price": 1100}, {"price": 950}))
+        self.assertEqual(Command("add", [expense]).inverse().action, "delete")
+        self.assertEqual(Command("delete", [expense]).inverse().action, "add")
+        self.assertIs(Command("delete", [expense]).inverse().expenses[0], expense)
+
+    def test_limit_and_new_commands(self) -> None:
+        history = CommandHistory(3)
+        commands = [Command("add", [{"title": str(number)}]) for number in range(5)]
+        for command in commands:
+            history.record(command)
+        self.assertEqual([history.undo() for _ in range(4)], commands[:1:-1] + [None])
+        self.assertIs(history.redo(), commands[2])
+        history.record(commands[0])
+        self.assertIsNone(history.redo())
+
+
+class UndoRedoTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = TemporaryDirectory()
+        copy_sample_data(self.directory.name)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def open(self, name: str, count: int = None) -> DataHandler:
+        data_handler = DataHandler(os.path.join(self.directory.name, name), count)
+        self.addCleanup(data_handler.close)
+        return data_handler
+
+    def assertSaved(self, data_handler: DataHandler, name: str) -> None:
+        data_handler.load_all()
+        self.assertEqual(get_values(self.open(name).expenses),
+                         get_values(data_handler.expenses))
+
+    def check_update(self, name: str, count: int = None) -> None:
+        data_handler = self.open(name, count)
+        original = get_values(data_handler.expenses)
+        expense = data_handler.expenses[10]
+        before = dict(expense)
+        changes = data_handler.convert_cell(expense, "price", "12.5")
+        changes.update(data_handler.convert_cell(expense, "title", "Edited"))
+        changes.update(data_handler.convert_cell(expense, "date", "01-01-2023"))
+        data_handler.update_expense(expense, changes)
+        changed = dict(expense)
+        data_handler.undo()
+        # the same object gets its previous values back
+        self.assertEqual(expense, before)
+        self.assertEqual(get_values(data_handler.expenses), original)
+        self.assertEqual(data_handler.search_titles("Edited"), [])
+        self.assertSaved(data_handler, name)
+        data_handler.redo()
+        self.assertEqual(expense, changed)
+        self.assertEqual(data_handler.search_titles("Edited")[0][0], "Edited")
+        self.assertSaved(data_handler, name)
+
+    def check_delete(self, name: str, count: int = None) -> None:
+        data_handler = self.open(name, count)
+        total = data_handler.get_range_summary(dict(ALL_DATES))
+        expense = data_handler.expenses[5]
+        data_handler.delete_expense(expense)
+        self.assertEqual(data_handler.get_range_summary(dict(ALL_DATES)),
+                         (total[0] - expense["overall_price"], total[1] - 1))
+        data_handler.undo()
+        self.assertTrue(any(item is expense for item in data_handler.expenses))
+        self.assertEqual(data_handler.get_range_summary(dict(ALL_DATES)), total)
+        self.assertSaved(data_handler, name)
+        data_handler.redo()
+        self.assertFalse(any(item is expense for item in data_handler.expenses))
+        self.assertEqual(data_handler.get_range_summary(dict(ALL_DATES)),
+                         (total[0] - expense["overall_price"], total[1] - 1))
+        self.assertSaved(data_handler, name)
+
+    def test_update_of_json_file(self) -> None:
+        self.check_update("data.json")
+
+    def test_update_of_partitions(self) -> None:
+        self.check_update("data", 100)
+
+    def test_delete_of_json_file(self) -> None:
+        self.check_delete("data.json")
+
+    def test_delete_of_partitions(self) -> None:
+        self.check_delete("data", 100)
+
+    def test_undo_of_several_changes(self) -> None:
+        data_handler = self.open("data.json")
+        original = get_values(data_handler.expenses)
+        expense = data_handler.expenses[0]
+        data_handler.update_expense(expense, data_handler.convert_cell(expense, "quantity", "4"))
+        data_handler.delete_expense(expense)
+        data_handler.add_expense(dict(expense, title="Added"))
+        while data_handler.undo() is not None:
+            pass
+        self.assertEqual(get_values(data_handler.expenses), original)
+        self.assertSaved(data_handler, "data.json")
+        for _ in range(3):
+            data_handler.redo()
+        self.assertIsNone(data_handler.redo())
+        self.assertSaved(data_handler, "data.json")
+
+    def test_reload_clears_the_history(self) -> None:
+        data_handler = self.open("data.json")
+        data_handler.delete_expense(data_handler.expenses[0])
+        data_handler.reload()
+        self.assertIsNone(data_handler.undo())
+
+
+if __name__ == "__main__":
+    unittest.main()
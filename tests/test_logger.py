@@ -0,0 +1,49 @@
+"""
+Tests of the background Logger.
+"""
+import io
+import unittest
+from contextlib import redirect_stderr
+from contextlib import redirect_stdout
+from lib.interface.utils import Logger
+
+
+class LoggerTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.stdout = io.StringIO()
+        self.stderr = io.StringIO()
+        with redirect_stderr(self.stderr):
+            self.log = Logger()
+
+    def write(self, *args, **kwargs) -> None:
+        with redirect_stdout(self.stdout):
+            self.log(*args, **kwargs)
+            self.log.flush()
+
+    def test_records_go_to_stderr(self) -> None:
+        self.write("Partitioning", "data.json", "→", "data")
+        self.assertIn("Partitioning data.json → data", self.stderr.getvalue())
+        self.assertEqual(self.stdout.getvalue(), "")
+
+    def test_args_are_logged_in_their_state_of_the_call(self) -> None:
+        values = [1]
+        with redirect_stdout(self.stdout):
+            self.log("values", values)
+            values.append(2)
+            self.log.flush()
+        self.assertIn("values [1]", self.stderr.getvalue())
+        self.assertNotIn("[1, 2]", self.stderr.getvalue())
+
+    def test_error_is_appended(self) -> None:
+        try:
+            raise ValueError("bad value")
+        except ValueError as error:
+            self.write("failed", error=error, level=2)
+        output = self.stderr.getvalue()
+        self.assertIn("failed bad value", output)
+        self.assertIn("test_error_is_appended", output)
+
+
+if __name__ == "__main__":
+    unittest.main()
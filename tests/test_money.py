@@ -0,0 +1,188 @@
+"""
+Tests of the cents amounts and the migration of
+the older data files.
+"""
+import os
+import unittest
+from datetime import datetime
+from tempfile import TemporaryDirectory
+from bson.json_util import dumps
+from lib.data_handler import DataHandler
+from lib.interface.utils import load_json
+from lib.interface.utils import write_json
+from lib.money import format_money
+from lib.money import migrate_expense
+from lib.money import to_amount
+from lib.money import to_cents
+from lib.storage import JsonStore
+from lib.storage import PartitionedStore
+from lib.storage import load_snapshot
+from lib.storage import write_snapshot
+from . import load_sample_data
+
+ALL_DATES = {"from_date": datetime.min, "to_date": datetime.max}
+
+
+def to_legacy(expense: dict) -> dict:
+    """
+    Returns the expense with the float amounts of
+    the older versions.
+    """
+    return dict(expense,
+                price=to_amount(expense["price"]),
+                overall_price=to_amount(expense["overall_price"]))
+
+
+def get_mtimes(directory: str) -> dict:
+    return {name: os.stat(os.path.join(directory, name)).st_mtime_ns
+            for name in os.listdir(directory) if not name.endswith(".lock")}
+
+
+class MoneyTest(unittest.TestCase):
+
+    def test_to_cents(self) -> None:
+        self.assertEqual(to_cents("12.345"), 1235)
+        self.assertEqual(to_cents(0.1), 10)
+        self.assertEqual(to_cents(19.99), 1999)
+        self.assertEqual(to_cents("1,234.5"), 123450)
+        self.assertEqual(to_cents(-2.675), -268)
+        self.assertEqual(to_cents(7), 700)
+        self.assertEqual(to_cents("12,345,678.9"), 1234567890)
+        self.assertEqual(to_cents("-1,000"), -100000)
+        for amount in ("", "abc", "nan", "inf", None,
+                       "1,5", "12,50", "1,23", "1,2345", ",100", "1,000,00", "1.000,50"):
+            with self.subTest(amount=amount), self.assertRaises(ValueError):
+                to_cents(amount)
+
+    def test_amounts_round_trip(self) -> None:
+        for cents in range(-10000, 10000, 7):
+            self.assertEqual(to_cents(to_amount(cents)), cents)
+
+    def test_format_money(self) -> None:
+        self.assertEqual(format_money(5), "0.05")
+        self.assertEqual(format_money(-5), "-0.05")
+        self.assertEqual(format_money(123456789, grouping=True), "1,234,567.89")
+
+    def test_migrate_expense(self) -> None:
+        expense = {"price": 19.99, "overall_price": 59.97, "quantity": 3}
+        self.assertTrue(migrate_expense(expense))
+        self.assertEqual(expense, {"price": 1999, "overall_price": 5997, "quantity": 3})
+        # the int prices of the older files are amounts too
+        expense = {"price": 12, "overall_price": 36, "quantity": 3}
+        self.assertTrue(migrate_expense(expense))
+        self.assertEqual(expense, {"price": 1200, "overall_price": 3600, "quantity": 3})
+        self.assertFalse(migrate_expense({"title": "Bread"}))
+
+
+class MigrationTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.expenses = load_sample_data()
+        cls.total = sum(expense["overall_price"] for expense in cls.expenses)
+
+    def setUp(self) -> None:
+        self.directory = TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def open(self, path: str, count: int = None) -> DataHandler:
+        data_handler = DataHandler(path, count)
+        self.addCleanup(data_handler.close)
+        return data_handler
+
+    def assertCents(self, expenses: list) -> None:
+        self.assertTrue(all(type(expense["price"]) is int
+                            and type(expense["overall_price"]) is int
+                            for expense in expenses))
+
+    def test_json_store(self) -> None:
+        path = os.path.join(self.directory.name, "data.json")
+        write_json(path, [to_legacy(expense) for expense in self.expenses])
+        # an older journal with float amounts
+        store = JsonStore(path)
+        added = {"title": "Bread", "price": 1.1, "quantity": 3,
+                 "overall_price": 3.3, "category": "Food",
+                 "date": datetime(2024, 1, 1)}
+        with open(store.journal_path, "w") as file:
+            file.write(dumps({"snapshot": store._get_snapshot_id()}) + "\n")
+            file.write(dumps({"op": "add", "expense": added}) + "\n")
+        data_handler = self.open(path)
+        self.assertCents(data_handler.expenses)
+        self.assertEqual(data_handler.get_total_price(data_handler.expenses), self.total + 330)
+        # the journal is merged into the converted snapshot
+        self.assertFalse(os.path.exists(store.journal_path))
+        expenses, unit = load_snapshot(path)
+        self.assertEqual(unit, "cents")
+        self.assertCents(expenses)
+        mtimes = get_mtimes(self.directory.name)
+        reopened = self.open(path)
+        self.assertEqual(get_mtimes(self.directory.name), mtimes)
+        self.assertEqual(reopened.expenses, data_handler.expenses)
+
+    def test_partitioned_store(self) -> None:
+        directory = os.path.join(self.directory.name, "data")
+        PartitionedStore(directory).create([to_legacy(expense) for expense in self.expenses])
+        manifest_path = os.path.join(directory, "manifest.json")
+        manifest = load_json(manifest_path)
+        # manifest of the older versions
+        del manifest["money"]
+        write_json(manifest_path, manifest)
+        data_handler = self.open(directory, 50)
+        self.assertCents(data_handler.expenses)
+        self.assertEqual(data_handler.get_range_summary(dict(ALL_DATES)),
+                         (self.total, len(self.expenses)))
+        manifest = load_json(manifest_path)
+        self.assertEqual(manifest["money"], "cents")
+        self.assertTrue(all(type(partition["total"]) is int
+                            for partition in manifest["partitions"].values()))
+        mtimes = get_mtimes(directory)
+        reopened = self.open(directory, None)
+        self.assertEqual(get_mtimes(directory), mtimes)
+        self.assertCents(reopened.expenses)
+        self.assertEqual(reopened.get_total_price(reopened.expenses), self.total)
+
+    def test_partitioning_keeps_the_source(self) -> None:
+        path = os.path.join(self.directory.name, "data.json")
+        write_json(path, [to_legacy(expense) for expense in self.expenses])
+        store = JsonStore(path)
+        with open(store.journal_path, "w") as file:
+            file.write(dumps({"snapshot": store._get_snapshot_id()}) + "\n")
+            file.write(dumps({"op": "delete", "expense": to_legacy(self.expenses[0])}) + "\n")
+        with open(path, "rb") as file:
+            source = file.read()
+        files = sorted(os.listdir(self.directory.name))
+        data_handler = self.open(os.path.join(self.directory.name, "data"))
+        self.assertCents(data_handler.expenses)
+        self.assertEqual(data_handler.get_total_price(data_handler.expenses),
+                         self.total - self.expenses[0]["overall_price"])
+        # the older version still reads its file and journal
+        with open(path, "rb") as file:
+            self.assertEqual(file.read(), source)
+        self.assertEqual(sorted(os.listdir(self.directory.name)), sorted(files + ["data"]))
+
+    def test_integer_amounts_of_an_older_file(self) -> None:
+        path = os.path.join(self.directory.name, "data.json")
+        expense = {"title": "Bread", "price": 12, "quantity": 2,
+                   "overall_price": 24, "category": "Food",
+                   "date": datetime(2024, 1, 1)}
+        write_json(path, [expense])
+        data_handler = self.open(path)
+        self.assertEqual([(expense["price"], expense["overall_price"])
+                          for expense in data_handler.expenses], [(1200, 2400)])
+        self.assertEqual(load_snapshot(path), (data_handler.expenses, "cents"))
+        # the converted prices aren't converted again
+        self.assertEqual(self.open(path).expenses, data_handler.expenses)
+
+    def test_converted_data_isnt_rewritten(self) -> None:
+        path = os.path.join(self.directory.name, "data.json")
+        write_snapshot(path, self.expenses)
+        mtimes = get_mtimes(self.directory.name)
+        data_handler = self.open(path)
+        self.assertEqual(get_mtimes(self.directory.name), mtimes)
+        self.assertCountEqual(data_handler.expenses, self.expenses)
+
+
+if __name__ == "__main__":
+    unittest.main()
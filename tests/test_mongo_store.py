@@ -0,0 +1,139 @@
+"""
+Tests of the MongoDB storage on the in memory
+collection.
+"""
+import unittest
+from datetime import datetime
+from tempfile import TemporaryDirectory
+from lib.cli import get_group_totals
+from lib.mongo_store import MongoStore
+from lib.mongo_store import UNLOADED_NAME
+from lib.storage import JsonStore
+from lib.tools.fake_mongo import FakeCollection
+from . import copy_sample_data
+
+
+def load_sample() -> list:
+    """
+    Returns the shipped expenses newest first.
+    """
+    with TemporaryDirectory() as directory:
+        return JsonStore(copy_sample_data(directory)).load()
+
+
+def in_range(expenses: list, from_date: datetime, to_date: datetime) -> list:
+    return [expense for expense in expenses
+            if from_date <= expense["date"] <= to_date]
+
+
+class MongoStoreTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.expenses = load_sample()
+
+    def setUp(self) -> None:
+        self.collection = FakeCollection()
+        self.store = MongoStore(self.collection)
+        # the expenses of a day are loaded in reverse order of adding
+        self.store.append(reversed(self.expenses))
+
+    def test_load_more_pages_through_all(self) -> None:
+        loaded = self.store.load(100)
+        self.assertGreaterEqual(len(loaded), 100)
+        # the whole day of the oldest one is loaded
+        self.assertTrue(all(expense["date"] >= self.store.loaded_from
+                            for expense in loaded))
+        self.assertEqual(len(loaded), sum(1 for expense in self.expenses
+                                          if expense["date"] >= self.store.loaded_from))
+        while True:
+            page = self.store.load_more(100)
+            if not page:
+                break
+            self.assertLess(page[0]["date"], loaded[-1]["date"])
+            loaded.extend(page)
+        self.assertEqual(self.store.loaded_from, datetime.min)
+        self.assertEqual(loaded, self.expenses)
+
+    def test_get_summary_of_unloaded(self) -> None:
+        self.store.load(100)
+        from_date = datetime(2023, 1, 1)
+        to_date = datetime(2024, 12, 31)
+        expected = [expense for expense in in_range(self.expenses, from_date, to_date)
+                    if expense["date"] < self.store.loaded_from]
+        total, count, names = self.store.get_summary(from_date, to_date)
+        self.assertEqual(total, sum(expense["overall_price"] for expense in expected))
+        self.assertIsInstance(total, int)
+        self.assertEqual(count, len(expected))
+        self.assertEqual(names, [UNLOADED_NAME])
+
+    def test_get_summary_of_loaded_range(self) -> None:
+        self.store.load(None)
+        self.assertEqual(self.store.get_summary(datetime(2023, 1, 1), datetime.max),
+                         (0, 0, list()))
+
+    def test_get_groups(self) -> None:
+        from_date = datetime(2023, 6, 1)
+        to_date = datetime(2024, 1, 31)
+        expenses = in_range(self.expenses, from_date, to_date)
+        for by in ("date", "month", "year", "category", "title"):
+            with self.subTest(by=by):
+                groups = self.store.get_groups(from_date, to_date, by)
+                self.assertEqual(sorted(groups), sorted(get_group_totals(expenses, by)))
+                totals = [group[1] for group in groups]
+                self.assertEqual(totals, sorted(totals, reverse=True))
+
+    def test_get_groups_of_category_prefix(self) -> None:
+        from_date = datetime.min
+        to_date = datetime.max
+        expenses = [expense for expense in self.expenses
+                    if expense["category"].lower().startswith("fo")]
+        groups = self.store.get_groups(from_date, to_date, "title", "FO")
+        self.assertTrue(groups)
+        self.assertEqual(sorted(groups), sorted(get_group_totals(expenses, "title")))
+
+    def test_update(self) -> None:
+        expense = self.expenses[10]
+        self.store.update(expense, {"price": 1, "overall_price": expense["quantity"]})
+        documents = list(self.collection.find({"title": expense["title"],
+                                               "date": expense["date"],
+                                               "price": 1}))
+        self.assertEqual(len(documents), 1)
+        self.assertEqual(documents[0]["overall_price"], expense["quantity"])
+        self.assertEqual(self.collection.count_documents({}), len(self.expenses))
+
+    def test_delete(self) -> None:
+        deleted = [self.expenses[0], self.expenses[-1]]
+        requests = self.collection.requests
+        self.store.delete(deleted)
+        self.assertEqual(self.collection.requests, requests + 1)
+        expected = list(self.expenses)
+        for expense in deleted:
+            expected.remove(expense)
+        # one of the equal expenses is deleted, they can't be told apart
+        key = lambda expense: tuple(expense.values())
+        self.assertEqual(sorted(self.store.load(None), key=key),
+                         sorted(expected, key=key))
+
+    def test_migrate_is_idempotent(self) -> None:
+        collection = FakeCollection()
+        older = [dict(expense,
+                      price=expense["price"] / 100,
+                      overall_price=expense["overall_price"] / 100)
+                 for expense in reversed(self.expenses)]
+        collection.insert_many(older)
+        self.assertTrue(collection.count_documents({"price": {"$type": "double"}}))
+        store = MongoStore(collection)
+        self.assertEqual(collection.count_documents({"price": {"$type": "double"}}), 0)
+        self.assertEqual(store.load(None), self.expenses)
+        # the converted documents aren't written again
+        documents = list(collection.find({}))
+        requests = collection.requests
+        MongoStore(collection)
+        # the indexes and the find of migrate, no bulk write
+        self.assertEqual(collection.requests - requests, 3)
+        self.assertEqual(list(collection.find({})), documents)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+"""
+Tests of the parallel scan against the serial
+filter of the data handler.
+"""
+import random
+import unittest
+from datetime import timedelta
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+from lib import parallel_scan
+from lib.data_handler import DataHandler
+from . import copy_sample_data
+
+
+class ParallelScanTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = TemporaryDirectory()
+        self.data_handler = DataHandler(copy_sample_data(self.directory.name), None, 2)
+        self.addCleanup(self.data_handler.close)
+        self.expenses = self.data_handler.expenses
+        self.first = self.expenses[-1]["date"]
+        self.days = (self.expenses[0]["date"] - self.first).days
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def get_random_filters(self, generator: random.Random) -> dict:
+        from_date = self.first + timedelta(days=generator.randint(-30, self.days))
+        filters = {"from_date": from_date,
+                   "to_date": from_date + timedelta(days=generator.randint(0, self.days))}
+        expense = generator.choice(self.expenses)
+        for key in ("title", "category"):
+            if generator.random() < .4:
+                filters[key] = expense[key][:generator.randint(1, 3)]
+        return filters
+
+    def filter(self, filters: dict, threshold: int) -> tuple:
+        self.data_handler.parallel_threshold = threshold
+        expenses = self.data_handler.filter_data(dict(filters))
+        return expenses, self.data_handler.get_total_price(expenses)
+
+    def check_scans(self, generator: random.Random, count: int) -> None:
+        for _ in range(count):
+            filters = self.get_random_filters(generator)
+            with self.subTest(filters=filters):
+                expected = self.filter(filters, float("inf"))
+                self.assertEqual(self.filter(filters, 1), expected)
+
+    def test_equals_the_serial_filter(self) -> None:
+        generator = random.Random(0)
+        self.check_scans(generator, 30)
+        # the columns are rebuilt after a change
+        expense = self.expenses[0]
+        self.data_handler.update_expense(
+            expense, self.data_handler.convert_cell(expense, "category", "Changed"))
+        self.data_handler.delete_expense(self.expenses[1])
+        self.check_scans(generator, 10)
+
+    def test_spawned_workers(self) -> None:
+        scanner = self.data_handler.get_scanner()
+        scanner.pool = ProcessPoolExecutor(2, mp_context=get_context("spawn"))
+        self.check_scans(random.Random(1), 10)
+
+    def test_workers_dont_track_the_blocks(self) -> None:
+        scanner = self.data_handler.get_scanner()
+        scanner.build(self.expenses)
+        with patch("multiprocessing.resource_tracker.register") as register:
+            columns = parallel_scan._attach(scanner.descriptors)
+        self.addCleanup(parallel_scan._attached.clear)
+        register.assert_not_called()
+        self.assertEqual(len(columns["date"]), len(self.expenses))
+        for block in parallel_scan._attached["blocks"]:
+            block.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+"""
+Tests of the trigram title index.
+"""
+import unittest
+from datetime import datetime
+from tempfile import TemporaryDirectory
+from lib.data_handler import DataHandler
+from lib.search_index import TitleIndex
+from lib.search_index import get_edit_distance
+from . import copy_sample_data
+
+
+class SampleSearchTest(unittest.TestCase):
+    """
+    The examples of the README on the shipped data.
+    """
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.directory = TemporaryDirectory()
+        cls.data_handler = DataHandler(copy_sample_data(cls.directory.name), None)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.data_handler.close()
+        cls.directory.cleanup()
+
+    def filter_titles(self, title: str) -> set:
+        filters = {"from_date": datetime.min, "to_date": datetime.max, "title": title}
+        return {expense["title"] for expense in self.data_handler.filter_data(filters=filters)}
+
+    def test_search_typo_of_short_title(self) -> None:
+        results = self.data_handler.search_titles("meet")
+        self.assertEqual(results[0][0], "Meat")
+
+    def test_filter_typos(self) -> None:
+        self.assertEqual(self.filter_titles("meet"), {"Meat"})
+        self.assertEqual(self.filter_titles("keybaord"), {"Keyboard"})
+        self.assertEqual(self.filter_titles("vegtabels"), {"Vegtables"})
+
+    def test_filter_substring(self) -> None:
+        self.assertEqual(self.filter_titles("shirt"), {"Shirt", "Tshirt"})
+
+    def test_unrelated_query_finds_nothing(self) -> None:
+        self.assertEqual(self.filter_titles("zzzz"), set())
+        self.assertEqual(self.data_handler.search_titles("qwerty"), [])
+
+
+class TitleIndexTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.index = TitleIndex()
+        self.index.build(["Grilled chicken", "Chicken", "Chicken", "Kitchen", "Meat"])
+
+    def test_substring_before_fuzzy(self) -> None:
+        results = self.index.search("chicken")
+        self.assertEqual([result[0] for result in results[:2]],
+                         ["Chicken", "Grilled chicken"])
+        self.assertEqual(results[0][2], 2)
+
+    def test_typos(self) -> None:
+        self.assertEqual(self.index.match("chiken"), {"Chicken", "Grilled chicken"})
+        self.assertEqual(self.index.match("chikcen"), {"Chicken", "Grilled chicken"})
+        self.assertEqual(self.index.match("meet"), {"Meat"})
+
+    def test_removed_title_isnt_found(self) -> None:
+        self.index.remove("Meat")
+        self.assertEqual(self.index.match("meet"), set())
+
+    def test_edit_distance(self) -> None:
+        self.assertEqual(get_edit_distance("meet", "meat", 2), 1)
+        self.assertEqual(get_edit_distance("chikcen", "chicken", 2), 1)
+        self.assertEqual(get_edit_distance("chiken", "chicken", 2), 1)
+        self.assertEqual(get_edit_distance("abc", "xyz", 1), 2)
+        self.assertEqual(get_edit_distance("a", "abcd", 1), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,226 @@
+"""
+Tests of the local query server on an ephemeral
+port.
+"""
+import asyncio
+import csv
+import json
+import unittest
+from datetime import datetime
+from io import StringIO
+from tempfile import TemporaryDirectory
+from lib.data_handler import DataHandler
+from lib.money import to_amount
+from lib.server import QueryServer
+from lib.server import ReadWriteLock
+from . import copy_sample_data
+
+ALL_DATES = {"from_date": datetime.min, "to_date": datetime.max}
+
+
+class QueryServerTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self) -> None:
+        self.directory = TemporaryDirectory()
+        self.data_handler = DataHandler(copy_sample_data(self.directory.name), None)
+        self.server = QueryServer(self.data_handler)
+        self.listener = await self.server.start("127.0.0.1", 0)
+        self.port = self.listener.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self) -> None:
+        self.listener.close()
+        await self.listener.wait_closed()
+        self.data_handler.close()
+        self.directory.cleanup()
+
+    async def request(self, method: str, target: str, body: object = None) -> tuple:
+        """
+        Send the request and returns the status, the
+        head and the body of the response.
+        """
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        data = b"" if body is None else json.dumps(body).encode()
+        writer.write(f"{method} {target} HTTP/1.1\r\nHost: localhost\r\n"
+                     f"Content-Length: {len(data)}\r\n\r\n".encode() + data)
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        head, _, body = response.partition(b"\r\n\r\n")
+        return int(head.split()[1]), head.decode("latin-1"), body
+
+    async def get_json(self, target: str) -> dict:
+        status, _, body = await self.request("GET", target)
+        self.assertEqual(status, 200)
+        return json.loads(body)
+
+    def get_rows(self, expenses: list) -> list:
+        return [[expense["title"], to_amount(expense["overall_price"]),
+                 expense["date"].strftime("%d-%m-%Y")] for expense in expenses]
+
+    async def test_filter(self) -> None:
+        filters = {"from_date": datetime(2023, 6, 1), "to_date": datetime(2023, 12, 31),
+                   "category": "Food"}
+        expected = self.get_rows(self.data_handler.filter_data(filters))
+        status, head, body = await self.request(
+            "GET", "/expenses?from=01-06-2023&to=31-12-2023&category=Food")
+        self.assertEqual(status, 200)
+        self.assertIn("application/x-ndjson", head)
+        expenses = [json.loads(line) for line in body.decode().splitlines()]
+        self.assertEqual([[expense["title"], expense["overall_price"], expense["date"]]
+                          for expense in expenses], expected)
+        _, _, body = await self.request("GET", "/expenses?limit=5")
+        self.assertEqual(len(body.decode().splitlines()), 5)
+
+    async def test_aggregate(self) -> None:
+        expenses = self.data_handler.filter_data(dict(ALL_DATES))
+        total = self.data_handler.get_total_price(expenses)
+        data = await self.get_json("/aggregate")
+        self.assertEqual(data, {"total": to_amount(total), "count": len(expenses)})
+        data = await self.get_json("/aggregate?by=category")
+        self.assertEqual(data["by"], "category")
+        self.assertEqual(sum(group["count"] for group in data["groups"]), len(expenses))
+        food = next(group for group in data["groups"] if group["name"] == "Food")
+        foods = [expense for expense in expenses if expense["category"] == "Food"]
+        self.assertEqual(food["total"], to_amount(self.data_handler.get_total_price(foods)))
+
+    async def test_add(self) -> None:
+        count = (await self.get_json("/aggregate"))["count"]
+        status, _, body = await self.request(
+            "POST", "/expenses",
+            {"title": "Bread", "price": "1.5", "quantity": 2, "date": "01-03-2024",
+             "category": "Food"})
+        self.assertEqual(status, 201)
+        self.assertEqual(json.loads(body), {"added": 1, "alerts": []})
+        status, _, body = await self.request(
+            "POST", "/expenses",
+            [{"title": "Milk", "price": 2, "date": "02-03-2024"},
+             {"title": "Tea", "price": 3, "date": "03-03-2024"}])
+        self.assertEqual((status, json.loads(body)["added"]), (201, 2))
+        self.assertEqual((await self.get_json("/aggregate"))["count"], count + 3)
+        _, _, body = await self.request("GET", "/expenses?from=01-03-2024&to=01-03-2024")
+        bread = json.loads(body.decode().splitlines()[0])
+        self.assertEqual((bread["title"], bread["price"], bread["overall_price"]),
+                         ("Bread", 1.5, 3.0))
+
+    async def test_export(self) -> None:
+        status, head, body = await self.request("GET", "/export")
+        self.assertEqual(status, 200)
+        self.assertIn("text/csv", head)
+        rows = list(csv.reader(StringIO(body.decode())))
+        self.assertEqual(rows[0][0], "Title")
+        self.assertEqual(len(rows) - 1, len(self.data_handler.expenses))
+        _, _, body = await self.request("GET", "/export?format=ndjson")
+        self.assertEqual(len(body.decode().splitlines()), len(self.data_handler.expenses))
+
+    async def test_error_statuses(self) -> None:
+        cases = [("GET", "/missing", None, 404),
+                 ("DELETE", "/expenses", None, 404),
+                 ("GET", "/expenses?from=2024-01-01", None, 400),
+                 ("GET", "/expenses?limit=many", None, 400),
+                 ("GET", "/aggregate?by=color", None, 400),
+                 ("GET", "/export?format=xml", None, 400),
+                 ("POST", "/expenses", [], 400),
+                 ("POST", "/expenses", {"title": "Bread"}, 400),
+                 ("POST", "/expenses", {"title": "Bread", "price": "1,5",
+                                        "date": "01-03-2024"}, 400)]
+        for method, target, body, expected in cases:
+            with self.subTest(method=method, target=target, body=body):
+                status, head, data = await self.request(method, target, body)
+                self.assertEqual(status, expected)
+                self.assertIn("application/json", head)
+                self.assertIsInstance(json.loads(data), dict)
+
+    async def test_failed_stream_isnt_answered_again(self) -> None:
+        def iter_csv(expenses: list) -> str:
+            yield "Title\n"
+            raise RuntimeError("stream failed")
+        self.server.iter_csv = iter_csv
+        status, _, body = await self.request("GET", "/export")
+        self.assertEqual(status, 200)
+        self.assertNotIn(b"HTTP/1.1", body)
+        self.assertNotIn(b"stream failed", body)
+
+    async def test_stream_after_releasing_the_lock(self) -> None:
+        free = list()
+        send_stream = self.server.send_stream
+
+        async def check_lock(*args) -> None:
+            free.append(self.server.lock.is_free())
+            await send_stream(*args)
+        self.server.send_stream = check_lock
+        await self.request("GET", "/expenses")
+        await self.request("GET", "/export")
+        self.assertEqual(free, [True, True])
+
+    async def test_file_lock_doesnt_block_the_loop(self) -> None:
+        lock = self.data_handler.store.lock
+        lock.acquire()
+        try:
+            waiting = asyncio.create_task(self.request("GET", "/aggregate"))
+            await asyncio.sleep(0.1)
+            status, _, _ = await asyncio.wait_for(self.request("GET", "/missing"), 1)
+            self.assertEqual(status, 404)
+            self.assertFalse(waiting.done())
+        finally:
+            lock.release()
+        status, _, _ = await waiting
+        self.assertEqual(status, 200)
+
+
+class ReadWriteLockTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_readers_share_the_lock(self) -> None:
+        lock = ReadWriteLock()
+        async with lock.read():
+            async with lock.read():
+                self.assertEqual(lock.readers, 2)
+                self.assertFalse(lock.is_free())
+        self.assertTrue(lock.is_free())
+
+    async def test_waiting_writer_is_first(self) -> None:
+        lock = ReadWriteLock()
+        order = list()
+        release = asyncio.Event()
+
+        async def read(name: str, hold: bool = False) -> None:
+            async with lock.read():
+                order.append(name)
+                if hold:
+                    await release.wait()
+
+        async def write() -> None:
+            async with lock.write():
+                order.append("writer")
+                await asyncio.sleep(0)
+        first = asyncio.create_task(read("first reader", hold=True))
+        await asyncio.sleep(0)
+        writer = asyncio.create_task(write())
+        await asyncio.sleep(0)
+        # a new reader waits behind the writer
+        second = asyncio.create_task(read("second reader"))
+        await asyncio.sleep(0.01)
+        self.assertEqual(order, ["first reader"])
+        release.set()
+        await asyncio.gather(first, writer, second)
+        self.assertEqual(order, ["first reader", "writer", "second reader"])
+        self.assertTrue(lock.is_free())
+
+    async def test_writers_run_one_at_a_time(self) -> None:
+        lock = ReadWriteLock()
+        active = list()
+
+        async def write() -> None:
+            async with lock.write():
+                active.append(len(active))
+                await asyncio.sleep(0.01)
+                active.pop()
+
+        async def read() -> None:
+            async with lock.read():
+                self.assertEqual(active, [])
+        await asyncio.gather(*(write() for _ in range(3)), *(read() for _ in range(3)))
+        self.assertTrue(lock.is_free())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+"""
+Tests of the cached settings and their change
+notifications.
+"""
+import os
+import unittest
+from tempfile import TemporaryDirectory
+from lib.interface.utils import load_json
+from lib.interface.utils import write_json
+from lib.settings import Settings
+
+
+class SettingsTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "configs.json")
+        write_json(self.path, {"illustration_count": 100, "theme": "dark"})
+        self.settings = Settings(self.path)
+        self.notified = list()
+        for key in ("illustration_count", "theme", "language"):
+            self.settings.subscribe(key, lambda value, key=key: self.notified.append((key, value)))
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def write(self, values: dict) -> None:
+        """
+        Change the file like another program, the
+        modification time is moved forward so the
+        change is seen on a coarse clock too.
+        """
+        mtime = os.stat(self.path).st_mtime_ns
+        write_json(self.path, values)
+        os.utime(self.path, ns=(mtime + 10 ** 9, mtime + 10 ** 9))
+
+    def test_update_round_trip(self) -> None:
+        changes = self.settings.update({"illustration_count": 200, "theme": "dark"})
+        self.assertEqual(changes, {"illustration_count": 200})
+        self.assertEqual(self.notified, [("illustration_count", 200)])
+        self.assertEqual(load_json(self.path), {"illustration_count": 200, "theme": "dark"})
+        self.assertEqual(Settings(self.path).values, self.settings.values)
+        # the own write isn't read again
+        self.assertEqual(self.settings.reload(), {})
+        self.assertEqual(self.settings.update({"theme": "dark"}), {})
+        self.assertEqual(len(self.notified), 1)
+
+    def test_reload_notifies_the_changed_keys(self) -> None:
+        self.assertEqual(self.settings.reload(), {})
+        self.write({"illustration_count": 100, "theme": "light", "language": "en"})
+        self.assertEqual(self.settings.reload(), {"theme": "light", "language": "en"})
+        self.assertCountEqual(self.notified, [("theme", "light"), ("language", "en")])
+        self.assertEqual(self.settings.get("theme"), "light")
+        self.assertEqual(self.settings.reload(), {})
+        self.assertEqual(len(self.notified), 2)
+
+    def test_invalid_file_keeps_the_values(self) -> None:
+        with open(self.path, "w") as file:
+            file.write('{"theme": ')
+        self.assertEqual(self.settings.reload(), {})
+        self.assertEqual(self.settings.get("theme"), "dark")
+        self.write({"illustration_count": 100, "theme": "light"})
+        self.assertEqual(self.settings.reload(), {"theme": "light"})
+
+    def test_missing_file(self) -> None:
+        settings = Settings(os.path.join(self.directory.name, "missing.json"))
+        self.assertEqual(settings.get("theme", "dark"), "dark")
+        self.assertEqual(settings.update({"theme": "light"}), {"theme": "light"})
+        self.assertEqual(Settings(settings.path).get("theme"), "light")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+"""
+Tests of the cached column orders against a fresh
+sort of the expenses.
+"""
+import random
+import unittest
+from tempfile import TemporaryDirectory
+from lib.constants import EXPENSE_KEYS
+from lib.data_handler import DataHandler
+from lib.sort_index import get_sort_key
+from . import copy_sample_data
+from .test_storage import change_randomly
+
+
+class ColumnOrdersTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = TemporaryDirectory()
+        self.data_handler = DataHandler(copy_sample_data(self.directory.name), None)
+        self.addCleanup(self.data_handler.close)
+        for key in EXPENSE_KEYS:
+            self.data_handler.sort_rows(self.data_handler.expenses, key)
+        self.orders = self.data_handler.column_orders
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def assertOrders(self) -> None:
+        expenses = self.data_handler.expenses
+        for key in EXPENSE_KEYS:
+            sort_key = get_sort_key(key)
+            order = self.orders.orders[key]
+            self.assertEqual(list(map(sort_key, order)), sorted(map(sort_key, expenses)))
+            self.assertCountEqual(map(id, order), map(id, expenses))
+
+    def assertSorted(self, expenses: list, key: str, descending: bool) -> None:
+        sort_key = get_sort_key(key)
+        rows = self.data_handler.sort_rows(expenses, key, descending)
+        self.assertEqual(sorted(rows), list(range(len(expenses))))
+        self.assertEqual([sort_key(expenses[row]) for row in rows],
+                         sorted(map(sort_key, expenses), reverse=descending))
+
+    def test_edits_and_undo(self) -> None:
+        generator = random.Random(0)
+        for _ in range(40):
+            change_randomly(self.data_handler, generator, 5)
+            self.assertOrders()
+            for _ in range(generator.randint(0, 3)):
+                self.data_handler.undo()
+            self.assertOrders()
+            if generator.random() < .3:
+                self.data_handler.redo()
+                self.assertOrders()
+
+    def test_sort_rows(self) -> None:
+        generator = random.Random(1)
+        change_randomly(self.data_handler, generator, 50)
+        expenses = self.data_handler.expenses
+        for size in (len(expenses), len(expenses) // 2, 10, 1, 0):
+            view = [expense for expense in expenses if generator.random() < size / len(expenses)]
+            for key in EXPENSE_KEYS:
+                for descending in (False, True):
+                    with self.subTest(size=size, key=key, descending=descending):
+                        self.assertSorted(view, key, descending)
+
+
+if __name__ == "__main__":
+    unittest.main()
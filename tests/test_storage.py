@@ -0,0 +1,201 @@
+"""
+Tests of the journal of the json files and the
+monthly partitions.
+"""
+import os
+import random
+import unittest
+from datetime import timedelta
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+from lib.compression import detect_codec
+from lib.data_handler import DataHandler
+from lib.storage import write_snapshot
+from . import copy_sample_data
+from . import get_values
+from . import load_sample_data
+
+
+def change_randomly(data_handler: DataHandler, generator: random.Random, count: int) -> None:
+    """
+    Add, edit and delete the expenses like a user
+    of the table.
+    """
+    first = data_handler.expenses[-1]["date"]
+    days = (data_handler.expenses[0]["date"] - first).days
+    for number in range(count):
+        choice = generator.random()
+        date = first + timedelta(days=generator.randint(-30, days + 30))
+        if choice < .4:
+            data_handler.add_expense({"title": f"Added {number}",
+                                      "price": 150,
+                                      "quantity": 2,
+                                      "overall_price": 300,
+                                      "category": "Food",
+                                      "date": date})
+        elif choice < .8:
+            expense = generator.choice(data_handler.expenses)
+            key, value = generator.choice([("price", "9.5"),
+                                           ("quantity", "3"),
+                                           ("title", f"Edited {number}"),
+                                           ("date", date.strftime("%d-%m-%Y"))])
+            data_handler.update_expense(expense, data_handler.convert_cell(expense, key, value))
+        else:
+            data_handler.delete_expense(generator.choice(data_handler.expenses))
+
+
+class JournalTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = TemporaryDirectory()
+        self.path = copy_sample_data(self.directory.name)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def open(self, path: str = None) -> DataHandler:
+        data_handler = DataHandler(path or self.path, None)
+        self.addCleanup(data_handler.close)
+        return data_handler
+
+    def assertReplayed(self, data_handler: DataHandler) -> None:
+        self.assertEqual(get_values(self.open(data_handler.data_path).expenses),
+                         get_values(data_handler.expenses))
+
+    def test_replay_equals_the_memory(self) -> None:
+        data_handler = self.open()
+        size = os.path.getsize(self.path)
+        change_randomly(data_handler, random.Random(0), 300)
+        # the changes are only appended to the journal
+        self.assertEqual(os.path.getsize(self.path), size)
+        self.assertTrue(os.path.exists(data_handler.store.journal_path))
+        self.assertReplayed(data_handler)
+
+    def test_compressed_snapshot(self) -> None:
+        path = os.path.join(self.directory.name, "data.json.gz")
+        write_snapshot(path, load_sample_data(), "gzip")
+        data_handler = self.open(path)
+        change_randomly(data_handler, random.Random(1), 100)
+        self.assertReplayed(data_handler)
+        with patch("lib.storage.COMPACT_THRESHOLD", 50):
+            reopened = self.open(path)
+        # the compaction keeps the codec of the file
+        self.assertEqual(detect_codec(path), "gzip")
+        self.assertFalse(os.path.exists(reopened.store.journal_path))
+        self.assertReplayed(data_handler)
+
+    def test_unfinished_line_is_ignored(self) -> None:
+        data_handler = self.open()
+        change_randomly(data_handler, random.Random(2), 20)
+        with open(data_handler.store.journal_path, "a") as file:
+            file.write('{"op": "delete", "expense": {"ti')
+        self.assertReplayed(data_handler)
+        change_randomly(data_handler, random.Random(3), 20)
+        self.assertReplayed(data_handler)
+
+    def test_journal_of_another_snapshot_is_ignored(self) -> None:
+        data_handler = self.open()
+        change_randomly(data_handler, random.Random(4), 20)
+        # the snapshot is replaced by a copy of the user
+        copy_sample_data(self.directory.name)
+        reopened = self.open()
+        self.assertEqual(get_values(reopened.expenses), get_values(load_sample_data()))
+        self.assertFalse(os.path.exists(reopened.store.journal_path))
+
+
+class PartitionTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = TemporaryDirectory()
+        copy_sample_data(self.directory.name)
+        self.path = os.path.join(self.directory.name, "data")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def open(self, count: int = None) -> DataHandler:
+        data_handler = DataHandler(self.path, count)
+        self.addCleanup(data_handler.close)
+        return data_handler
+
+    def test_edit_after_deleting_a_duplicate(self) -> None:
+        data_handler = self.open(100)
+        date = data_handler.expenses[0]["date"]
+        for _ in range(2):
+            data_handler.add_expense({"title": "Bread",
+                                      "price": 150,
+                                      "quantity": 1,
+                                      "overall_price": 150,
+                                      "category": "Food",
+                                      "date": date})
+        first, second = [expense for expense in data_handler.expenses
+                         if expense["title"] == "Bread"]
+        data_handler.delete_expense(second)
+        data_handler.update_expense(first, data_handler.convert_cell(first, "price", "2"))
+        data_handler.undo()
+        data_handler.undo()
+        data_handler.update_expense(first, data_handler.convert_cell(first, "title", "Milk"))
+        data_handler.load_all()
+        self.assertEqual(get_values(self.open().expenses), get_values(data_handler.expenses))
+
+
+class SyncTest(unittest.TestCase):
+    """
+    Two instances of the program on the same data.
+    """
+
+    def setUp(self) -> None:
+        self.directory = TemporaryDirectory()
+        copy_sample_data(self.directory.name)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def open(self, name: str, count: int = None) -> DataHandler:
+        data_handler = DataHandler(os.path.join(self.directory.name, name), count)
+        self.addCleanup(data_handler.close)
+        return data_handler
+
+    def check_sync(self, name: str, count: int = None) -> None:
+        first = self.open(name, count)
+        second = self.open(name, count)
+        generator = random.Random(0)
+        reloads = 0
+        reload = second.reload
+
+        def count_reloads() -> None:
+            nonlocal reloads
+            reloads += 1
+            reload()
+        second.reload = count_reloads
+        for _ in range(30):
+            change_randomly(first, generator, 5)
+            if generator.random() < .3:
+                first.undo()
+            self.assertTrue(second.sync())
+            self.assertFalse(second.sync())
+        # only the new changes are applied
+        self.assertEqual(reloads, 0)
+        first.load_all()
+        second.load_all()
+        self.assertEqual(get_values(second.expenses), get_values(first.expenses))
+        self.assertEqual(get_values(self.open(name).expenses), get_values(first.expenses))
+
+    def test_json_file(self) -> None:
+        self.check_sync("data.json")
+
+    def test_partitions(self) -> None:
+        self.check_sync("data", 100)
+
+    def test_changes_of_both_instances(self) -> None:
+        first = self.open("data.json")
+        second = self.open("data.json")
+        change_randomly(first, random.Random(1), 20)
+        # the changes of the other instance are read before a write
+        change_randomly(second, random.Random(2), 20)
+        first.sync()
+        self.assertEqual(get_values(first.expenses), get_values(second.expenses))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+"""
+Tests of the interning of the repeated strings.
+"""
+import unittest
+from sys import getsizeof
+from tempfile import TemporaryDirectory
+from lib.data_handler import DataHandler
+from lib.symbols import SymbolTable
+from . import copy_sample_data
+
+
+class SymbolTableTest(unittest.TestCase):
+
+    def test_intern(self) -> None:
+        symbols = SymbolTable()
+        first = "".join(["Fo", "od"])
+        second = "".join(["Foo", "d"])
+        self.assertIsNot(first, second)
+        self.assertIs(symbols.intern(first), first)
+        self.assertIs(symbols.intern(second), first)
+        self.assertEqual(symbols.saved_bytes, getsizeof(second))
+        self.assertEqual(symbols.code("Gift"), 1)
+        self.assertEqual((symbols.code(second), symbols.value(1)), (0, "Gift"))
+        self.assertEqual(len(symbols), 2)
+        self.assertIn("Gift", symbols)
+        self.assertNotIn("food", symbols)
+        self.assertEqual(symbols.match(lambda value: value.startswith("F")), {"Food"})
+
+    def test_loaded_expenses_share_the_strings(self) -> None:
+        with TemporaryDirectory() as directory:
+            data_handler = DataHandler(copy_sample_data(directory), None)
+            data_handler.close()
+        for key in ("title", "category"):
+            values = dict()
+            for expense in data_handler.expenses:
+                self.assertIs(values.setdefault(expense[key], expense[key]), expense[key])
+            self.assertEqual(len(data_handler.symbols[key]), len(values))
+
+
+if __name__ == "__main__":
+    unittest.main()
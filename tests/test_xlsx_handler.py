@@ -0,0 +1,75 @@
+"""
+Tests of the xlsx writer and reader.
+"""
+import os
+import re
+import unittest
+from tempfile import TemporaryDirectory
+from zipfile import ZipFile
+from lib.cli import read_table
+from lib.data_handler import DataHandler
+from lib.tools.xlsx_handler import XlsxReader
+from lib.tools.xlsx_handler import XlsxWriter
+from . import copy_sample_data
+
+
+class XlsxRoundTripTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = TemporaryDirectory()
+        self.data_handler = DataHandler(copy_sample_data(self.directory.name), None)
+        self.path = os.path.join(self.directory.name, "expenses.xlsx")
+
+    def tearDown(self) -> None:
+        self.data_handler.close()
+        self.directory.cleanup()
+
+    def export(self, split_by_month: bool) -> None:
+        with XlsxWriter(split_by_month=split_by_month) as handler:
+            handler.create_new()
+            handler.add_data(self.data_handler.get_all_as_table(format_date=False))
+            handler.save_as(self.path)
+
+    def test_split_by_month_imports_all_sheets(self) -> None:
+        self.export(split_by_month=True)
+        with XlsxReader() as reader:
+            reader.open_excel(self.path)
+            self.assertGreater(len(reader.get_sheet_names()), 1)
+        rows = list(read_table(self.path))
+        self.assertEqual(len(rows), len(self.data_handler.expenses))
+        # the headers of the sheets aren't imported as rows
+        self.assertNotIn("Title", {row["Title"] for row in rows})
+
+    def test_imported_expenses_match(self) -> None:
+        self.export(split_by_month=True)
+        path = os.path.join(self.directory.name, "imported.json")
+        imported = DataHandler(path, None)
+        try:
+            count = imported.import_expenses(read_table(self.path))
+            self.assertEqual(count, len(self.data_handler.expenses))
+            key = lambda expense: tuple(expense.values())
+            self.assertEqual(sorted(imported.expenses, key=key),
+                             sorted(self.data_handler.expenses, key=key))
+        finally:
+            imported.close()
+
+    def test_dimension_is_a_hint(self) -> None:
+        self.export(split_by_month=False)
+        # a dimension which is smaller than the sheet data
+        path = os.path.join(self.directory.name, "small_dimension.xlsx")
+        with ZipFile(self.path) as source, ZipFile(path, "w") as target:
+            for item in source.infolist():
+                content = source.read(item.filename)
+                if item.filename.startswith("xl/worksheets/"):
+                    content = re.sub(rb'<dimension ref="[^"]*"/>',
+                                     b'<dimension ref="A1:F2"/>', content)
+                target.writestr(item, content)
+        with XlsxReader() as reader:
+            reader.open_excel(path)
+            self.assertEqual(reader.get_rows_count(), 2)
+            rows = list(reader.fetch_all())
+        self.assertEqual(len(rows), len(self.data_handler.expenses) + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()